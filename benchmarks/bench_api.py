@@ -0,0 +1,77 @@
+"""
+Bulk scoring API benchmark: records/sec of the HTML retention form vs. the REST API.
+
+    python -m benchmarks.bench_api --sizes 1000 10000
+
+The form path posts one record per request to ``predict/retention/`` (with the
+prediction cache cleared, as for distinct employees), timed on a sample. The
+API path posts all N records in one request, as a JSON array and as NDJSON,
+and reads the whole streamed response.
+"""
+import argparse
+import json
+import time
+
+from benchmarks.common import setup_django
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--form-sample", type=int, default=200, help="Records to time the form path on.")
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from django.test import Client
+    from django.test.utils import override_settings
+    from benchmarks.bench_scoring import make_upload
+    from hr_app.ml.cache import prediction_cache
+    from hr_app.ml.scoring import RETENTION_FEATURES, build_features
+
+    user = User.objects.create_user("bench_api", password="x")
+    client = Client()
+    client.force_login(user)
+
+    def consume(response):
+        assert response.status_code == 200, (response.status_code, response.content)
+        return b"".join(response.streaming_content)
+
+    def form_post(record):
+        prediction_cache.invalidate("retention")
+        response = client.post("/hr/predict/retention/", {
+            "age": int(record["Age"]), "monthly_income": record["MonthlyIncome"],
+            "years_at_company": int(record["YearsAtCompany"]), "department": record["Department"],
+        })
+        assert response.status_code == 200, response.status_code
+
+    records = build_features(make_upload(max(args.sizes), seed=11), RETENTION_FEATURES).to_dict("records")
+    form_post(records[0])  # load the models outside the timings
+
+    sample = records[:args.form_sample]
+    t0 = time.perf_counter()
+    for record in sample:
+        form_post(record)
+    form_rate = len(sample) / (time.perf_counter() - t0)
+
+    print(f"{'records':>8} {'form rec/s':>11} {'json rec/s':>11} {'ndjson rec/s':>13} {'speed-up':>9}")
+    for size in args.sizes:
+        batch = records[:size]
+        array = json.dumps(batch)
+        lines = "\n".join(json.dumps(r) for r in batch)
+        with override_settings(API_MAX_BATCH_RECORDS=max(size, 1)):
+            t0 = time.perf_counter()
+            out = json.loads(consume(client.post("/hr/api/score/retention/", array, content_type="application/json")))
+            json_rate = size / (time.perf_counter() - t0)
+            assert len(out) == size
+
+            t0 = time.perf_counter()
+            out = consume(client.post("/hr/api/score/retention/", lines, content_type="application/x-ndjson",
+                                      HTTP_ACCEPT="application/x-ndjson"))
+            ndjson_rate = size / (time.perf_counter() - t0)
+            assert out.count(b"\n") == size
+        print(f"{size:>8} {form_rate:>11.0f} {json_rate:>11.0f} {ndjson_rate:>13.0f} {json_rate / form_rate:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
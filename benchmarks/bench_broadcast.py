@@ -0,0 +1,87 @@
+"""
+Department broadcast benchmark: one message per send_message post vs. broadcast fan-out.
+
+    python -m benchmarks.bench_broadcast --sizes 1000 10000
+
+For every size N it creates a department of N employees with logins, then
+times a single-message loop (what N form posts would do, measured on a
+sample and extrapolated), the synchronous ``broadcast`` and the same
+broadcast run as a background job. Unread counters are checked afterwards.
+"""
+import argparse
+import json
+import time
+
+from benchmarks.common import setup_django
+
+
+def make_department(name: str, count: int, start: int):
+    """
+    ``count`` users with profiles and Employee records in department ``name``.
+    """
+    from django.contrib.auth.models import User
+    from hr_app.models import Employee, Profile
+
+    users = User.objects.bulk_create(
+        [User(username=f"bcast{i:07d}", password="!") for i in range(start, start + count)], batch_size=5000,
+    )
+    if not users or users[0].pk is None:  # backends that don't return primary keys
+        users = list(User.objects.filter(username__startswith="bcast").order_by("-id")[:count])
+    Profile.objects.bulk_create([Profile(user=u) for u in users], batch_size=5000)
+    Employee.objects.bulk_create(
+        [Employee(emp_id=f"BC{start + i:07d}", name=u.username, department=name, age=30, salary=5000,
+                  years_at_company=i % 30, user=u) for i, u in enumerate(users)],
+        batch_size=5000,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--naive-sample", type=int, default=500,
+                        help="Recipients to time the one-message-per-post loop on.")
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from hr_app.jobs import enqueue, run_pending
+    from hr_app.messaging import broadcast, deliver, department_recipients
+    from hr_app.models import Message, Profile
+
+    sender = User.objects.create_user("bcast_hr", password="x", is_staff=True)
+
+    print(f"{'recipients':>10} {'per-post loop s':>16} {'broadcast s':>12} {'job s':>8} {'msgs/s':>10} {'speed-up':>9}")
+    start = 0
+    for size in args.sizes:
+        department = f"Broadcast {size}"
+        make_department(department, size, start)
+        start += size
+
+        # One deliver() per recipient, like one send_message post each
+        sample = department_recipients(department)[:args.naive_sample]
+        t0 = time.perf_counter()
+        for user_id in sample:
+            deliver([Message(sender=sender, receiver_id=user_id, subject="Hello", body="One at a time")])
+        naive = (time.perf_counter() - t0) / len(sample) * size
+
+        t0 = time.perf_counter()
+        sent = broadcast(sender, department_recipients(department), "Hello", "Everyone at once")
+        fanout = time.perf_counter() - t0
+        assert sent == size, sent
+
+        recipients = department_recipients(department)
+        t0 = time.perf_counter()
+        payload = json.dumps({"sender_id": sender.id, "recipients": recipients, "subject": "Hello", "body": "Queued"})
+        enqueue("broadcast", payload.encode(), user=sender, filename=department, total=len(recipients))
+        run_pending()
+        job = time.perf_counter() - t0
+
+        sampled = set(sample)
+        expected = {uid: 2 + (uid in sampled) for uid in recipients}
+        counters = dict(Profile.objects.filter(user_id__in=recipients).values_list("user_id", "unread_messages"))
+        assert counters == expected, "unread counters out of sync"
+        print(f"{size:>10} {naive:>16.2f} {fanout:>12.2f} {job:>8.2f} {size / fanout:>10.0f} {naive / fanout:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Concurrency benchmark: sync views behind a fixed worker pool vs. async views on one event loop.
+
+    python -m benchmarks.bench_concurrency --clients 100 --requests 5
+
+Each of ``--clients`` simulated users sends ``--requests`` requests in turn,
+cycling through the HR dashboard, the employee dashboard and the retention and
+promotion prediction forms (with distinct inputs, so nothing is served from
+the prediction cache). In sync mode the WSGI views are served by
+``--sync-workers`` request slots, like the gunicorn sync workers in the
+Procfile; in async mode every client is a coroutine on one event loop
+driving the ASGI stack with ``ASYNC_VIEWS`` on. Latency includes the time a
+request waits for a free worker.
+"""
+import argparse
+import asyncio
+import importlib
+import statistics
+import threading
+import time
+from collections import defaultdict
+
+from benchmarks.common import make_employees, setup_django
+
+ENDPOINTS = ["hr_dashboard", "employee_dashboard", "predict_retention", "predict_promotion"]
+
+
+def request_for(n: int) -> tuple:
+    """
+    (endpoint, method, url, form data) of the n-th request.
+    """
+    endpoint = ENDPOINTS[n % len(ENDPOINTS)]
+    if endpoint == "hr_dashboard":
+        return endpoint, "get", "/hr/hr/dashboard/", None
+    if endpoint == "employee_dashboard":
+        return endpoint, "get", "/hr/employee/dashboard/", None
+    if endpoint == "predict_retention":
+        return endpoint, "post", "/hr/predict/retention/", {
+            "age": 20 + n % 40, "monthly_income": 2000 + n, "years_at_company": n % 30, "department": "Sales",
+        }
+    return endpoint, "post", "/hr/predict/promotion/", {
+        "city": "city_103", "experience": n % 20, "training_hours": n, "company_size": "50-99",
+    }
+
+
+def use_async_views(enabled: bool):
+    from django.conf import settings
+    from django.urls import clear_url_caches
+    import hr_app.urls
+    import hr_project.urls
+
+    settings.ASYNC_VIEWS = enabled
+    importlib.reload(hr_app.urls)
+    importlib.reload(hr_project.urls)
+    clear_url_caches()
+
+
+def summarize(mode: str, latencies: dict, wall: float):
+    total = sum(len(v) for v in latencies.values())
+    print(f"\n{mode}: {total} requests in {wall:.2f}s ({total / wall:.0f} req/s)")
+    print(f"  {'endpoint':<20} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for endpoint in ENDPOINTS:
+        times = sorted(latencies[endpoint])
+        p95 = times[max(int(len(times) * 0.95) - 1, 0)]
+        print(f"  {endpoint:<20} {statistics.median(times) * 1000:>9.1f} {p95 * 1000:>9.1f} {times[-1] * 1000:>9.1f}")
+
+
+def run_sync(user, clients: int, requests: int, workers: int):
+    from django.test import Client
+
+    use_async_views(False)
+    slots = threading.Semaphore(workers)
+    latencies = defaultdict(list)
+    lock = threading.Lock()
+
+    def client_loop(index):
+        client = Client()
+        client.force_login(user)
+        for i in range(requests):
+            endpoint, method, url, data = request_for(index * requests + i)
+            t0 = time.perf_counter()
+            with slots:
+                response = getattr(client, method)(url, data)
+            elapsed = time.perf_counter() - t0
+            assert response.status_code == 200, (url, response.status_code)
+            with lock:
+                latencies[endpoint].append(elapsed)
+
+    warm = Client()
+    warm.force_login(user)
+    for n in range(len(ENDPOINTS)):
+        _, method, url, data = request_for(-1 - n)
+        getattr(warm, method)(url, data)
+
+    threads = [threading.Thread(target=client_loop, args=(i,)) for i in range(clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    summarize(f"sync ({workers} workers)", latencies, time.perf_counter() - t0)
+
+
+def run_async(user, clients: int, requests: int):
+    from django.test import AsyncClient
+
+    use_async_views(True)
+    latencies = defaultdict(list)
+
+    async def client_loop(index):
+        client = AsyncClient()
+        await client.aforce_login(user)
+        for i in range(requests):
+            endpoint, method, url, data = request_for(index * requests + i)
+            t0 = time.perf_counter()
+            response = await getattr(client, method)(url, data)
+            latencies[endpoint].append(time.perf_counter() - t0)
+            assert response.status_code == 200, (url, response.status_code)
+
+    async def main():
+        warm = AsyncClient()
+        await warm.aforce_login(user)
+        for n in range(len(ENDPOINTS)):
+            _, method, url, data = request_for(-1 - n)
+            await getattr(warm, method)(url, data)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(client_loop(i) for i in range(clients)))
+        return time.perf_counter() - t0
+
+    summarize("async", latencies, asyncio.run(main()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=5, help="Requests per client.")
+    parser.add_argument("--sync-workers", type=int, default=3)
+    parser.add_argument("--employees", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from hr_app.models import Employee, Profile
+
+    settings.SLOW_REQUEST_MS = None  # every request is slow when 100 are queued
+    make_employees(args.employees)
+    user = User.objects.create_user("bench_concurrency", password="x", is_staff=True)
+    Profile.objects.get_or_create(user=user, defaults={"role": "hr"})
+    Employee.objects.filter(pk=Employee.objects.order_by("pk").values("pk")[:1]).update(user=user)
+    print(f"{args.clients} clients x {args.requests} requests; CPU_WORKERS={settings.CPU_WORKERS}")
+
+    run_sync(user, args.clients, args.requests, args.sync_workers)
+    run_async(user, args.clients, args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Latency of sklearn Pipeline.predict_proba versus the compiled forest.
+
+    python -m benchmarks.bench_inference --batch-sizes 1 10 100 1000 --repeat 20
+
+Reports the best milliseconds per call for each model and batch size and the
+largest absolute probability difference between the two backends. It then
+replays ``--verify-rows`` single-row requests through the old view code path
+(one-row DataFrame, ``predict`` then ``predict_proba``) and the dict fast
+path, and reports label mismatches and per-request latency.
+"""
+import argparse
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_scoring import MODELS_DIR, make_upload
+from benchmarks.common import timeit
+from hr_app.ml.compiled import compile_pipeline
+from hr_app.ml.scoring import PROMOTION_FEATURES, RETENTION_FEATURES, build_features
+
+MODELS = {"retention": RETENTION_FEATURES, "promotion": PROMOTION_FEATURES}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--verify-rows", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    print(f"{'model':>10} {'rows':>6} {'sklearn ms':>11} {'compiled ms':>12} {'speed-up':>9} {'max diff':>9}")
+    for name, features in MODELS.items():
+        pipeline = joblib.load(MODELS_DIR / f"{name}.pkl")
+        compiled = compile_pipeline(pipeline)
+        for rows in args.batch_sizes:
+            X = build_features(make_upload(rows), features)
+            diff = np.abs(pipeline.predict_proba(X) - compiled.predict_proba(X)).max()
+            repeat = args.repeat if rows < 1000 else max(args.repeat // 5, 1)
+            sk = timeit(lambda: pipeline.predict_proba(X), repeat) * 1000
+            co = timeit(lambda: compiled.predict_proba(X), repeat) * 1000
+            print(f"{name:>10} {rows:>6} {sk:>11.2f} {co:>12.2f} {sk / co:>8.1f}x {diff:>9.1e}")
+
+    print()
+    print(f"{'model':>10} {'requests':>9} {'old ms':>8} {'fast ms':>8} {'label diffs':>12} {'max diff':>9}")
+    for name, features in MODELS.items():
+        pipeline = joblib.load(MODELS_DIR / f"{name}.pkl")
+        compiled = compile_pipeline(pipeline)
+        rows = build_features(make_upload(args.verify_rows), features).to_dict("records")
+        old, fast = verify_single_rows(pipeline, compiled, rows)
+        mismatches = sum(a[0] != b[0] for a, b in zip(old["results"], fast["results"]))
+        diff = max(abs(a[1] - b[1]) for a, b in zip(old["results"], fast["results"]))
+        print(f"{name:>10} {len(rows):>9} {old['ms']:>8.2f} {fast['ms']:>8.2f} {mismatches:>12} {diff:>9.1e}")
+
+
+def verify_single_rows(pipeline, compiled, rows):
+    """
+    Score each row the way the views used to, and through the dict fast path.
+    """
+    t0 = time.perf_counter()
+    old = []
+    for row in rows:
+        df = pd.DataFrame([row])
+        old.append((pipeline.predict(df)[0], pipeline.predict_proba(df)[0][1]))
+    old_ms = (time.perf_counter() - t0) * 1000 / len(rows)
+
+    t0 = time.perf_counter()
+    classes = list(compiled.classes_)
+    fast = []
+    for row in rows:
+        proba = compiled.predict_proba_row(row)
+        fast.append((classes[int(np.argmax(proba))], proba[classes.index(1)]))
+    fast_ms = (time.perf_counter() - t0) * 1000 / len(rows)
+    return {"results": old, "ms": old_ms}, {"results": fast, "ms": fast_ms}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Scaling benchmark for multi-process batch scoring.
+
+    python -m benchmarks.bench_parallel --rows 100000 --workers 1 2 4 8 16
+
+Reports rows/sec per worker count (pool start-up and model loading excluded)
+and checks every run against serial scoring.
+"""
+import argparse
+import os
+import time
+
+import joblib
+
+from benchmarks.bench_scoring import MODELS_DIR, make_upload
+from hr_app.ml.parallel import ParallelScorer
+from hr_app.ml.scoring import DEFAULT_CHUNK_SIZE, score_frame
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    df = make_upload(args.rows)
+    retention = joblib.load(MODELS_DIR / "retention.pkl")
+    promotion = joblib.load(MODELS_DIR / "promotion.pkl")
+
+    t0 = time.perf_counter()
+    serial = score_frame(df, retention, promotion, args.chunk_size)
+    serial_rate = args.rows / (time.perf_counter() - t0)
+
+    print(f"{os.cpu_count()} CPUs, {args.rows} rows, chunk size {args.chunk_size}")
+    print(f"{'workers':>8} {'rows/s':>10} {'vs serial':>10}  identical")
+    print(f"{'serial':>8} {serial_rate:>10.1f} {1.0:>9.2f}x  True")
+    for workers in args.workers:
+        # Smaller chunks so every worker gets work even on modest inputs
+        chunk_size = min(args.chunk_size, max(args.rows // (workers * 4), 500))
+        with ParallelScorer(workers) as scorer:
+            scorer.warm()
+            t0 = time.perf_counter()
+            parallel = scorer.score_frame(df, chunk_size)
+            rate = args.rows / (time.perf_counter() - t0)
+        print(f"{workers:>8} {rate:>10.1f} {rate / serial_rate:>9.2f}x  {parallel == serial}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Throughput benchmark: per-row CSV scoring loop vs. the batch scoring engine.
+
+    python -m benchmarks.bench_scoring --rows 1000 10000 50000
+
+Needs the trained pipelines in hr_app/ml/models/. Input rows are sampled from
+the bundled datasets in data/.
+"""
+import argparse
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from textblob import TextBlob
+
+from hr_app.ml.scoring import (
+    DEFAULT_CHUNK_SIZE, PROMOTION_FEATURES, RETENTION_FEATURES,
+    build_features, score_frame,
+)
+from hr_app.ml.sentiment import sentiment_label
+
+ROOT = Path(__file__).resolve().parent.parent
+MODELS_DIR = ROOT / "hr_app" / "ml" / "models"
+DATA_DIR = ROOT / "data"
+
+
+def make_upload(rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Build a synthetic upload combining retention, promotion and feedback columns.
+    """
+    rng = np.random.default_rng(seed)
+    retention = pd.read_csv(DATA_DIR / "retention.csv", encoding="utf-8-sig")
+    promotion = pd.read_csv(DATA_DIR / "promotion_test.csv")
+    feedback = pd.read_csv(DATA_DIR / "feedback.csv")
+
+    r = retention.iloc[rng.integers(0, len(retention), rows)].reset_index(drop=True)
+    p = promotion.iloc[rng.integers(0, len(promotion), rows)].reset_index(drop=True)
+    df = pd.concat([r, p[list(PROMOTION_FEATURES)]], axis=1)
+    df["EmployeeName"] = [f"Emp {i}" for i in range(rows)]
+    df["Feedback"] = feedback["feedback_text"].iloc[rng.integers(0, len(feedback), rows)].to_numpy()
+    return df
+
+
+def score_per_row(df: pd.DataFrame, retention_model, promotion_model) -> list:
+    """
+    The original view loop: one pipeline call per model per row.
+    """
+    predictions = []
+    for i in range(len(df)):
+        one = df.iloc[[i]]
+        row = one.iloc[0]
+        r_prob = retention_model.predict_proba(build_features(one, RETENTION_FEATURES))[0][1]
+        p_pred = promotion_model.predict(build_features(one, PROMOTION_FEATURES))[0]
+
+        feedback = row.get("Feedback", "")
+        sentiment = "Neutral"
+        if feedback:
+            sentiment = sentiment_label(TextBlob(feedback).sentiment.polarity)
+
+        predictions.append({
+            "employee": row.get("EmployeeName", "Unknown"),
+            "retention": "High Risk" if r_prob >= 0.5 else "Stable",
+            "promotion": "Eligible" if p_pred == 1 else "Not Eligible",
+            "sentiment": sentiment,
+        })
+    return predictions
+
+
+def labels(predictions):
+    return [(p["employee"], p["retention"], p["promotion"], p["sentiment"]) for p in predictions]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--per-row-limit", type=int, default=2000,
+                        help="Time the per-row loop on at most this many rows and extrapolate.")
+    args = parser.parse_args(argv)
+
+    retention_model = joblib.load(MODELS_DIR / "retention.pkl")
+    promotion_model = joblib.load(MODELS_DIR / "promotion.pkl")
+
+    print(f"{'rows':>8} {'per-row rows/s':>15} {'batch rows/s':>13} {'speedup':>8}  match")
+    for rows in args.rows:
+        df = make_upload(rows)
+
+        t0 = time.perf_counter()
+        batch = score_frame(df, retention_model, promotion_model, args.chunk_size)
+        batch_rate = rows / (time.perf_counter() - t0)
+
+        sample = df.iloc[:min(rows, args.per_row_limit)]
+        t0 = time.perf_counter()
+        per_row = score_per_row(sample, retention_model, promotion_model)
+        per_row_rate = len(sample) / (time.perf_counter() - t0)
+
+        match = labels(per_row) == labels(batch[:len(sample)])
+        print(f"{rows:>8} {per_row_rate:>15.1f} {batch_rate:>13.1f} {batch_rate / per_row_rate:>7.1f}x  {match}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Employee search benchmark: indexed full-text search vs. icontains scans.
+
+    python -m benchmarks.bench_search --sizes 10000 100000 500000
+
+Runs against a throwaway SQLite database (FTS5) unless DATABASE_URL is set.
+"""
+import argparse
+
+from benchmarks.common import make_employees, setup_django, timeit
+
+QUERIES = ["priya", "sharma 42", "research", "bangalore engineer", "E00001"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from django.db.models import Q
+    from hr_app.models import Employee
+    from hr_app.search import SEARCH_LIMIT, search_employees
+
+    def name_scan(q):
+        return list(Employee.objects.filter(name__icontains=q)[:SEARCH_LIMIT])
+
+    def all_fields_scan(q):
+        qs = Employee.objects.all()
+        for t in q.split():
+            qs = qs.filter(Q(emp_id__icontains=t) | Q(name__icontains=t) | Q(department__icontains=t)
+                           | Q(job_title__icontains=t) | Q(location__icontains=t))
+        return list(qs[:SEARCH_LIMIT])
+
+    print(f"{'rows':>8} {'query':<20} {'name icontains ms':>17} {'all-field scan ms':>18} {'search ms':>10} {'hits':>5}")
+    loaded = 0
+    for size in sorted(args.sizes):
+        make_employees(size - loaded, start=loaded)
+        loaded = size
+        for q in QUERIES:
+            t_name = timeit(lambda: name_scan(q), args.repeat)
+            t_scan = timeit(lambda: all_fields_scan(q), args.repeat)
+            t_search = timeit(lambda: search_employees(q), args.repeat)
+            hits = len(search_employees(q))
+            print(f"{size:>8} {q:<20} {t_name * 1000:>17.2f} {t_scan * 1000:>18.2f} {t_search * 1000:>10.2f} {hits:>5}")
+
+
+if __name__ == "__main__":
+    main()
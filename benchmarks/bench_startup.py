@@ -0,0 +1,139 @@
+"""
+Startup benchmark: import cost of the URLconf and wall-clock time to the first requests.
+
+    python -m benchmarks.bench_startup --top 15
+
+Everything runs in fresh interpreters, like a new gunicorn worker:
+
+* ``python -X importtime`` of ``django.setup()`` plus the URLconf (what every
+  worker and every ``manage.py`` command that runs system checks pays), with
+  the slowest top-level imports and whether any ML library was loaded;
+* wall-clock from process start to the first response of the login page, and
+  to the first single prediction (which loads the model);
+* ``manage.py check``, the floor of every management command.
+
+``benchmarks.suite`` records the same numbers as ``startup.*`` results.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import ROOT, setup_django
+
+HEAVY_MODULES = ["pandas", "numpy", "sklearn", "scipy", "joblib", "textblob", "nltk"]
+
+IMPORT_URLS = """
+import os, sys
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "hr_project.settings")
+import django
+django.setup()
+import hr_project.urls
+print(",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+FIRST_REQUESTS = """
+import time
+t_start = time.time()
+import os, json
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "hr_project.settings")
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+t_app = time.time()
+from django.contrib.auth import get_user_model
+from django.test import Client
+client = Client()
+response = client.get("/hr/login/")
+assert response.status_code == 200, response.status_code
+t_first = time.time()
+client.force_login(get_user_model().objects.get(username="bench_startup"))
+response = client.post("/hr/predict/retention/", {
+    "age": 30, "monthly_income": 5000, "years_at_company": 3, "department": "Sales",
+})
+assert response.status_code == 200, response.status_code
+t_predict = time.time()
+print(json.dumps({"start": t_start, "app": t_app, "first_request": t_first, "first_prediction": t_predict}))
+"""
+
+
+def _run(args: list, env: dict) -> subprocess.CompletedProcess:
+    return subprocess.run(args, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def importtime(env: dict) -> dict:
+    """
+    Total import time of setup + URLconf, its per-top-level-import breakdown and the heavy modules loaded.
+    """
+    proc = _run([sys.executable, "-X", "importtime", "-c", IMPORT_URLS.format(heavy=HEAVY_MODULES)], env)
+    total_us = 0
+    top_level = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        if not name.startswith("  "):  # nested imports are indented two spaces per level
+            top_level.append((int(cumulative_us) / 1e6, name.strip()))
+    heavy = [m for m in proc.stdout.strip().split(",") if m]
+    return {"seconds": total_us / 1e6, "top_level": sorted(top_level, reverse=True), "heavy_modules": heavy}
+
+
+def first_requests(env: dict) -> dict:
+    """
+    Seconds from spawning a fresh interpreter to the app being loaded, the first response and the first prediction.
+    """
+    spawned = time.time()
+    proc = _run([sys.executable, "-c", FIRST_REQUESTS], env)
+    marks = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {
+        "interpreter": marks["start"] - spawned,
+        "app_loaded": marks["app"] - spawned,
+        "first_request": marks["first_request"] - spawned,
+        "first_prediction": marks["first_prediction"] - spawned,
+    }
+
+
+def manage_check(env: dict) -> float:
+    t0 = time.perf_counter()
+    _run([sys.executable, "manage.py", "check"], env)
+    return time.perf_counter() - t0
+
+
+def prepare() -> dict:
+    """
+    Migrate the benchmark database and create the user the subprocesses log in as.
+    """
+    setup_django()
+    from django.contrib.auth import get_user_model
+
+    get_user_model().objects.get_or_create(username="bench_startup")
+    return dict(os.environ)
+
+
+def best_of(fn, repeat: int):
+    return min((fn() for _ in range(repeat)), key=lambda r: r if isinstance(r, float) else r["first_request"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level imports to list.")
+    args = parser.parse_args(argv)
+
+    env = prepare()
+    imports = min((importtime(env) for _ in range(args.repeat)), key=lambda r: r["seconds"])
+    print(f"import setup + URLconf: {imports['seconds'] * 1000:.0f} ms; "
+          f"ML libraries loaded: {', '.join(imports['heavy_modules']) or 'none'}")
+    for seconds, name in imports["top_level"][:args.top]:
+        print(f"  {seconds * 1000:>8.1f} ms  {name}")
+
+    timings = best_of(lambda: first_requests(env), args.repeat)
+    for name, seconds in timings.items():
+        print(f"{name:<18} {seconds * 1000:>8.0f} ms after spawn")
+    print(f"{'manage.py check':<18} {best_of(lambda: manage_check(env), args.repeat) * 1000:>8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Shared helpers for benchmarks that need Django and a database.
+
+Benchmarks run offline against a throwaway SQLite file unless DATABASE_URL
+is already set.
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEPARTMENTS = ["Sales", "Research & Development", "Human Resources", "Finance", "Engineering", "Support"]
+JOB_TITLES = ["Sales Executive", "Research Scientist", "Laboratory Technician", "Manager",
+              "Software Engineer", "HR Specialist", "Accountant", "Support Analyst"]
+LOCATIONS = ["Bangalore", "Chennai", "Hyderabad", "Mumbai", "Pune", "Delhi", "London", "Austin"]
+FIRST_NAMES = ["Asha", "Ravi", "Meera", "John", "Priya", "Arjun", "Sara", "Vikram", "Nisha", "Tom"]
+LAST_NAMES = ["Kumar", "Sharma", "Iyer", "Smith", "Patel", "Reddy", "Nair", "Brown", "Das", "Rao"]
+
+
+def setup_django(db_path=None):
+    """
+    Configure Django against ``db_path`` (a fresh temp file by default), migrate it and create the cache table.
+    """
+    if "DATABASE_URL" not in os.environ:
+        if db_path is None:
+            db_path = Path(tempfile.mkdtemp(prefix="talentpulse-bench-")) / "bench.sqlite3"
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "hr_project.settings")
+    sys.path.insert(0, str(ROOT))
+
+    import django
+    from django.core.management import call_command
+
+    django.setup()
+    call_command("migrate", verbosity=0)
+    call_command("createcachetable", verbosity=0)
+
+
+def make_employees(count: int, start: int = 0, batch_size: int = 5000):
+    """
+    Insert ``count`` synthetic employees with deterministic field values.
+    """
+    from hr_app.models import Employee
+
+    batch = []
+    for i in range(start, start + count):
+        batch.append(Employee(
+            emp_id=f"E{i:07d}",
+            name=f"{FIRST_NAMES[i % 10]} {LAST_NAMES[(i // 10) % 10]} {i}",
+            department=DEPARTMENTS[i % len(DEPARTMENTS)],
+            age=20 + i % 40,
+            salary=2000 + (i * 37) % 18000,
+            years_at_company=i % 30,
+            job_title=JOB_TITLES[(i // 3) % len(JOB_TITLES)],
+            location=LOCATIONS[(i // 7) % len(LOCATIONS)],
+        ))
+        if len(batch) >= batch_size:
+            Employee.objects.bulk_create(batch)
+            batch = []
+    Employee.objects.bulk_create(batch)
+
+
+def timeit(fn, repeat: int = 5) -> float:
+    """
+    Best wall-clock time of ``repeat`` calls, in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
@@ -0,0 +1,320 @@
+"""
+End-to-end benchmark suite: startup, model inference, CSV ingestion, exports and dashboard views.
+
+    python -m benchmarks.suite --sizes 1000 10000 100000 --output bench.json
+    python -m benchmarks.suite --sizes 1000 --output new.json --compare bench.json
+
+Runs offline against a throwaway SQLite database with generated data (unless
+DATABASE_URL is set), driving the real views through Django's test client.
+Startup (URLconf import time, first request, ``manage.py check``) is measured
+in fresh interpreters by ``benchmarks.bench_startup``. For every size N it
+imports N new employees, re-imports them (updates), queues and runs a CSV
+prediction job of N rows, adds N/10 feedback entries and messages, then times
+the exports, dashboards and directory at the resulting table sizes. Results
+are written as JSON; ``--compare`` prints the change against an earlier run
+and exits non-zero if anything regressed by more than ``--threshold``.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks.common import ROOT, setup_django
+
+FEEDBACK_TEXTS = ["Great teamwork this quarter", "Workload is too high", "Okay overall",
+                  "Excellent mentoring", "Poor communication from management"]
+
+
+def measure(fn, repeat: int = 5) -> dict:
+    """
+    Wall-clock statistics of ``repeat`` calls, in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return {"best": min(times), "median": statistics.median(times), "repeat": repeat}
+
+
+class Suite:
+    def __init__(self, repeat: int):
+        self.repeat = repeat
+        self.results = []
+
+    def record(self, name: str, size: int = None, **values):
+        entry = {"name": name, "size": size, **values}
+        self.results.append(entry)
+        timing = values.get("median", values.get("seconds"))
+        extra = f" ({values['rows_per_sec']:.0f} rows/s)" if "rows_per_sec" in values else ""
+        print(f"  {name:<36} {'' if size is None else size:>8} {timing * 1000:>10.2f} ms{extra}", flush=True)
+
+    def time(self, name: str, fn, size: int = None, repeat: int = None, **extra):
+        self.record(name, size, **measure(fn, repeat or self.repeat), **extra)
+
+
+# ——————————————————————————————————————
+# Fixtures
+# ——————————————————————————————————————
+def make_users():
+    from django.contrib.auth.models import User
+    from hr_app.models import Profile
+
+    hr = User.objects.create_user("bench_hr", password="x", is_staff=True)
+    staff = User.objects.create_user("bench_employee", password="x")
+    Profile.objects.get_or_create(user=hr, defaults={"role": "hr"})
+    Profile.objects.get_or_create(user=staff)
+    return hr, staff
+
+
+def employee_csv(count: int, start: int) -> bytes:
+    from benchmarks.common import DEPARTMENTS, FIRST_NAMES, LAST_NAMES
+
+    out = io.StringIO()
+    out.write("EmployeeNumber,EmployeeName,Department,Age,MonthlyIncome,YearsAtCompany\n")
+    for i in range(start, start + count):
+        out.write(f"B{i:07d},{FIRST_NAMES[i % 10]} {LAST_NAMES[(i // 10) % 10]},"
+                  f"{DEPARTMENTS[i % len(DEPARTMENTS)]},{20 + i % 40},{2000 + (i * 37) % 18000},{i % 30}\n")
+    return out.getvalue().encode()
+
+
+def prediction_csv(count: int, start: int) -> bytes:
+    from benchmarks.bench_scoring import make_upload
+
+    df = make_upload(count)
+    df["EmployeeNumber"] = [f"B{i:07d}" for i in range(start, start + count)]
+    return df.to_csv(index=False).encode()
+
+
+def add_feedback_and_messages(count: int, hr, staff):
+    from hr_app.messaging import deliver
+    from hr_app.models import Employee, Feedback, Message
+
+    employee_ids = list(Employee.objects.values_list("id", flat=True)[:max(count, 1)])
+    labels = ["Positive", "Negative", "Neutral"]
+    Feedback.objects.bulk_create(
+        [Feedback(employee_id=employee_ids[i % len(employee_ids)], text=FEEDBACK_TEXTS[i % len(FEEDBACK_TEXTS)],
+                  sentiment=labels[i % 3]) for i in range(count)],
+        batch_size=2000,
+    )
+    deliver([Message(sender=hr, receiver=staff, subject=f"Update {i}", body=FEEDBACK_TEXTS[i % len(FEEDBACK_TEXTS)])
+             for i in range(count)])
+
+
+def upload(client, url: str, data: bytes, name: str):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    response = client.post(url, {"csv_file": SimpleUploadedFile(name, data, content_type="text/csv")})
+    assert response.status_code in (200, 302), response.status_code
+    return response
+
+
+def consume(response) -> int:
+    assert response.status_code == 200, response.status_code
+    if getattr(response, "streaming", False):
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+# ——————————————————————————————————————
+# Benchmarks
+# ——————————————————————————————————————
+def bench_startup(suite: Suite, repeat: int = 3):
+    from django.contrib.auth import get_user_model
+    from benchmarks.bench_startup import first_requests, importtime, manage_check
+
+    get_user_model().objects.get_or_create(username="bench_startup")
+    env = dict(os.environ)
+    imports = min((importtime(env) for _ in range(repeat)), key=lambda r: r["seconds"])
+    suite.record("startup.import_urls", seconds=imports["seconds"], heavy_modules=imports["heavy_modules"])
+    runs = [first_requests(env) for _ in range(repeat)]
+    for name in ("app_loaded", "first_request", "first_prediction"):
+        suite.record(f"startup.{name}", seconds=min(run[name] for run in runs))
+    suite.record("startup.manage_check", seconds=min(manage_check(env) for _ in range(repeat)))
+
+
+def bench_inference(suite: Suite, samples: int):
+    from benchmarks.bench_scoring import make_upload
+    from hr_app.ml.cache import prediction_cache
+    from hr_app.ml.scoring import PROMOTION_FEATURES, RETENTION_FEATURES, build_features
+    from hr_app.views import promotion_predict, retention_predict
+
+    df = make_upload(samples, seed=7)
+    cases = {
+        "promotion": (promotion_predict, build_features(df, PROMOTION_FEATURES)),
+        "retention": (retention_predict, build_features(df, RETENTION_FEATURES)),
+    }
+    for model, (predict, features) in cases.items():
+        name = f"inference.{model}_predict"
+        rows = features.to_dict("records")
+        predict(rows[0])  # load the model outside the timings
+
+        times = []
+        for row in rows:
+            prediction_cache.invalidate(model)
+            t0 = time.perf_counter()
+            predict(row)
+            times.append(time.perf_counter() - t0)
+        suite.record(name, best=min(times), median=statistics.median(times),
+                     p95=sorted(times)[int(len(times) * 0.95) - 1], repeat=len(times))
+        suite.time(name + ".cached", lambda: predict(rows[0]), repeat=max(samples, 20))
+
+
+def bench_size(suite: Suite, client, size: int, start: int, hr, staff):
+    from hr_app.jobs import run_pending
+    from hr_app.kpis import invalidate_kpis
+    from hr_app.models import Employee, Feedback, Message
+
+    # Directory import: N new employees, then the same file again as updates
+    data = employee_csv(size, start)
+    t0 = time.perf_counter()
+    upload(client, "/hr/hr/csv/upload/", data, "employees.csv")
+    seconds = time.perf_counter() - t0
+    suite.record("csv_upload.create", size, seconds=seconds, rows_per_sec=size / seconds)
+    t0 = time.perf_counter()
+    upload(client, "/hr/hr/csv/upload/", data, "employees.csv")
+    seconds = time.perf_counter() - t0
+    suite.record("csv_upload.update", size, seconds=seconds, rows_per_sec=size / seconds)
+
+    # Bulk prediction: request only queues the file; the worker scores and persists it
+    data = prediction_csv(size, start)
+    t0 = time.perf_counter()
+    upload(client, "/hr/hr/csv/predict/", data, "predict.csv")
+    suite.record("csv_predict.enqueue", size, seconds=time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    run_pending()
+    seconds = time.perf_counter() - t0
+    suite.record("csv_predict.job", size, seconds=seconds, rows_per_sec=size / seconds)
+
+    add_feedback_and_messages(size // 10, hr, staff)
+    tables = {
+        "employees": Employee.objects.count(),
+        "feedback": Feedback.objects.count(),
+        "messages": Message.objects.count(),
+    }
+    print(f"  tables: {tables}")
+    rows = tables["employees"]
+
+    repeat = 1 if rows > 50000 else 3
+    for export in ("employees", "feedback", "messages"):
+        url = f"/hr/export/{export}/"
+        suite.time(f"export.{export}", lambda: consume(client.get(url)), tables[export], repeat=repeat)
+
+    def cold_dashboard():
+        invalidate_kpis()
+        consume(client.get("/hr/hr/dashboard/"))
+
+    suite.time("hr_dashboard.cold", cold_dashboard, rows)
+    suite.time("hr_dashboard.warm", lambda: consume(client.get("/hr/hr/dashboard/")), rows)
+    suite.time("feedback_feed", lambda: consume(client.get("/hr/feedback/feed/?sentiment=Positive")), tables["feedback"])
+    suite.time("directory.first_page", lambda: consume(client.get("/hr/employees/")), rows)
+    suite.time("directory.sorted_emp_id", lambda: consume(client.get("/hr/employees/?sort=emp_id")), rows)
+    suite.time("directory.search", lambda: consume(client.get("/hr/employees/?q=priya+sharma")), rows)
+
+
+# ——————————————————————————————————————
+# Reporting
+# ——————————————————————————————————————
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _key(entry: dict) -> tuple:
+    return entry["name"], entry["size"]
+
+
+def _timing(entry: dict) -> float:
+    return entry.get("median", entry.get("seconds"))
+
+
+def compare(results: list, baseline_path: str, threshold: float, min_delta: float) -> int:
+    """
+    Print the change of every timing against ``baseline_path``; return the number of regressions.
+    A regression is a slow-down of more than ``threshold`` (relative) and ``min_delta`` seconds.
+    """
+    with open(baseline_path) as f:
+        baseline = {_key(e): e for e in json.load(f)["results"]}
+
+    regressions = 0
+    print(f"\n{'benchmark':<36} {'size':>8} {'before ms':>10} {'after ms':>10} {'change':>8}")
+    for entry in results:
+        before = baseline.get(_key(entry))
+        if before is None:
+            continue
+        old, new = _timing(before), _timing(entry)
+        change = (new - old) / old if old else 0.0
+        flag = ""
+        if change > threshold and new - old > min_delta:
+            regressions += 1
+            flag = "  REGRESSION"
+        size = "" if entry["size"] is None else entry["size"]
+        print(f"{entry['name']:<36} {size:>8} {old * 1000:>10.2f} {new * 1000:>10.2f} {change:>+7.0%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions of each view timing.")
+    parser.add_argument("--inference-samples", type=int, default=200)
+    parser.add_argument("--output", default="bench-results.json")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slow-down counted as a regression.")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0,
+                        help="Ignore slow-downs smaller than this, which are mostly noise.")
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from django.conf import settings
+    from django.test import Client
+
+    hr, staff = make_users()
+    client = Client()
+    client.force_login(hr)
+    suite = Suite(args.repeat)
+
+    print("startup")
+    bench_startup(suite)
+    print("inference")
+    bench_inference(suite, args.inference_samples)
+    start = 0
+    for size in args.sizes:
+        print(f"size {size}")
+        bench_size(suite, client, size, start, hr, staff)
+        start += size
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "database": settings.DATABASES["default"]["ENGINE"],
+            "ml_backend": getattr(settings, "ML_INFERENCE_BACKEND", None),
+            "sizes": args.sizes,
+            "repeat": args.repeat,
+        },
+        "results": suite.results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {len(suite.results)} results to {args.output}")
+
+    if args.compare and compare(suite.results, args.compare, args.threshold, args.min_delta_ms / 1000):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
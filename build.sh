@@ -7,6 +7,12 @@ pip install -r requirements.txt
 # Run database migrations
 python manage.py migrate --noinput
 
+# Create the shared cache table (no-op if it exists)
+python manage.py createcachetable
+
+# Create the default admin account if missing (needs ADMIN_PASSWORD the first time)
+python manage.py create_admin
+
 # Collect static files for whitenoise
 python manage.py collectstatic --noinput
 
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Profile, Employee, Prediction, Feedback, Message, LeaveRequest
+from .messaging import recount_unread
+from .models import Profile, Employee, Prediction, LatestPrediction, Feedback, Message, LeaveRequest, Job
 
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
@@ -19,6 +20,12 @@ class PredictionAdmin(admin.ModelAdmin):
     list_filter = ("kind",)
     search_fields = ("employee__emp_id", "employee__name")
 
+@admin.register(LatestPrediction)
+class LatestPredictionAdmin(admin.ModelAdmin):
+    list_display = ("employee", "kind", "result", "probability", "updated_at")
+    list_filter = ("kind", "result")
+    search_fields = ("employee__emp_id", "employee__name")
+
 @admin.register(Feedback)
 class FeedbackAdmin(admin.ModelAdmin):
     list_display = ("employee", "sentiment", "created_at")
@@ -31,8 +38,30 @@ class MessageAdmin(admin.ModelAdmin):
     list_filter = ("is_read",)
     search_fields = ("sender__username", "receiver__username", "subject", "body")
 
+    # Admin edits bypass hr_app.messaging, so recount the affected inboxes
+    def save_model(self, request, obj, form, change):
+        previous = Message.objects.filter(pk=obj.pk).values_list("receiver_id", flat=True).first() if change else None
+        super().save_model(request, obj, form, change)
+        recount_unread({obj.receiver_id, previous} - {None})
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        recount_unread([obj.receiver_id])
+
+    def delete_queryset(self, request, queryset):
+        receivers = set(queryset.values_list("receiver_id", flat=True))
+        super().delete_queryset(request, queryset)
+        recount_unread(receivers)
+
 @admin.register(LeaveRequest)
 class LeaveRequestAdmin(admin.ModelAdmin):
     list_display = ("employee", "start_date", "end_date", "status", "created_at")
     list_filter = ("status",)
     search_fields = ("employee__emp_id", "employee__name", "reason")
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "processed", "total", "created_by", "created_at", "finished_at")
+    list_filter = ("kind", "status")
+    exclude = ("payload", "result")
+    readonly_fields = ("error",)
@@ -0,0 +1,219 @@
+"""
+REST API for bulk scoring.
+
+``POST /hr/api/score/<model>/`` takes a JSON array (``application/json``) or
+newline-delimited JSON (``application/x-ndjson``) of feature records and
+streams one result per record back, in order: a JSON array, or NDJSON when
+the client sends ``Accept: application/x-ndjson``. Records are scored
+``settings.API_SCORE_CHUNK_SIZE`` at a time with one ``predict_proba`` call
+per chunk, through the same feature frames as the CSV prediction job.
+Requests with more than ``settings.API_MAX_BATCH_RECORDS`` records are
+rejected with 413, and records with a value the models cannot take with 400
+naming the record and field, before anything is scored or streamed.
+
+``GET`` on the same URL describes the expected features and the limits.
+"""
+import json
+import math
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound, ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .ml.features import PROMOTION_FEATURES, RETENTION_FEATURES
+from .profiling import phase
+from .streaming import streaming_response
+
+NDJSON = "application/x-ndjson"
+
+# model -> (features, labeller); thresholds match the CSV prediction job
+SCORERS = {
+    "promotion": (PROMOTION_FEATURES, lambda p: "Eligible" if p > 0.5 else "Not Eligible"),
+    "retention": (RETENTION_FEATURES, lambda p: "High Risk" if p >= 0.5 else "Stable"),
+}
+
+
+class BatchTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Too many records in one request."
+    default_code = "batch_too_large"
+
+
+class InvalidRecord(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_detail = "Invalid record."
+    default_code = "invalid_record"
+
+
+def max_records() -> int:
+    return settings.API_MAX_BATCH_RECORDS
+
+
+def _too_large() -> BatchTooLarge:
+    return BatchTooLarge(f"At most {max_records()} records can be scored per request.")
+
+
+class NDJSONParser(BaseParser):
+    """
+    One JSON value per line; blank lines are ignored. Stops reading once the batch limit is exceeded.
+    """
+    media_type = NDJSON
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if stream is None:
+            return []
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        limit = max_records()
+        records = []
+        for lineno, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if len(records) >= limit:
+                raise _too_large()
+            try:
+                records.append(json.loads(line.decode(encoding)))
+            except (UnicodeDecodeError, ValueError) as exc:
+                raise ParseError(f"Line {lineno}: {exc}")
+        return records
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renders error bodies as a single line; results are streamed by the view.
+    """
+    media_type = NDJSON
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return json.dumps(data).encode() + b"\n"
+
+
+def _number(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError
+    x = float(value)
+    if not math.isfinite(x):
+        raise ValueError
+    return x
+
+
+def _category(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value)
+    raise ValueError
+
+
+def clean_records(records: list, features: dict) -> list:
+    """
+    Coerce every record to the model's feature types, or raise a 400 naming the first bad record and field.
+
+    Missing and null values take the feature default. Numeric features accept
+    numbers and numeric strings; categorical ones accept strings and integers.
+    Only ``id`` and the model features are kept.
+    """
+    cleaned = []
+    for i, record in enumerate(records):
+        if not isinstance(record, dict):
+            raise ParseError(f"Record {i} is not a JSON object.")
+        row = {"id": record.get("id")}
+        for col, default in features.items():
+            value = record.get(col)
+            if value is None:
+                row[col] = default
+                continue
+            numeric = isinstance(default, (int, float))
+            try:
+                row[col] = _number(value) if numeric else _category(value)
+            except ValueError:
+                expected = "a number" if numeric else "a string"
+                raise InvalidRecord(f"Record {i}, field {col!r}: expected {expected}, got {value!r}.")
+        cleaned.append(row)
+    return cleaned
+
+
+def score_records(name: str, records: list, chunk_size: int):
+    """
+    Yield ``{"id", "label", "probability"}`` for every record, one chunk of results at a time.
+    ``records`` must have been through ``clean_records``.
+    """
+    import pandas as pd
+    from .ml.compiled import get_inference_model
+    from .ml.scoring import build_features, positive_proba
+
+    features, label = SCORERS[name]
+    for start in range(0, len(records), chunk_size):
+        chunk = records[start:start + chunk_size]
+        X = build_features(pd.DataFrame.from_records(chunk), features)
+        with phase("inference"):
+            probs = positive_proba(get_inference_model(name, rows=len(chunk)), X)
+        yield [
+            {"id": record.get("id"), "label": label(p), "probability": float(p)}
+            for record, p in zip(chunk, probs)
+        ]
+
+
+def _ndjson_body(chunks):
+    for results in chunks:
+        yield "".join(json.dumps(r) + "\n" for r in results)
+
+
+def _json_array_body(chunks):
+    yield "["
+    first = True
+    for results in chunks:
+        if results:
+            yield ("" if first else ",") + ",".join(json.dumps(r) for r in results)
+            first = False
+    yield "]"
+
+
+class ScoreView(APIView):
+    permission_classes = [IsAuthenticated]
+    parser_classes = [JSONParser, NDJSONParser]
+    renderer_classes = [JSONRenderer, NDJSONRenderer]
+
+    def _scorer(self, model):
+        if model not in SCORERS:
+            raise NotFound(f"Unknown model {model!r}; expected one of {', '.join(SCORERS)}.")
+        return SCORERS[model]
+
+    def get(self, request, model):
+        features, _ = self._scorer(model)
+        return Response({
+            "model": model,
+            "features": features,
+            "max_records": max_records(),
+            "chunk_size": settings.API_SCORE_CHUNK_SIZE,
+        })
+
+    def post(self, request, model):
+        features, _ = self._scorer(model)
+        records = request.data
+        if isinstance(records, dict):
+            records = [records]
+        if not isinstance(records, list):
+            raise ParseError("Expected a JSON array of records.")
+        if len(records) > max_records():
+            raise _too_large()
+        records = clean_records(records, features)
+
+        chunk_size = settings.API_SCORE_CHUNK_SIZE
+        if records:
+            # Load the model now, so a missing model is an error response rather than a cut-off stream
+            from .ml.compiled import get_inference_model
+            get_inference_model(model, rows=min(len(records), chunk_size))
+        chunks = score_records(model, records, chunk_size)
+        if request.accepted_renderer.format == "ndjson":
+            return streaming_response(request, _ndjson_body(chunks), content_type=NDJSON)
+        return streaming_response(request, _json_array_body(chunks), content_type="application/json")
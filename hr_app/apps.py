@@ -5,9 +5,6 @@ class HrAppConfig(AppConfig):
     name = "hr_app"
 
     def ready(self):
-        # Import and call create_admin only once when server starts
-        try:
-            from .views import create_admin
-            create_admin()
-        except Exception as e:
-            print("⚠️ Could not create admin:", e)
+        # No database access here: ready() runs for every worker and every manage.py
+        # command. The default admin is created by `manage.py create_admin` (build.sh).
+        from . import signals  # noqa: F401  (registers receivers)
@@ -0,0 +1,114 @@
+"""
+Async versions of the dashboard and single-prediction views, for ASGI.
+
+urls.py routes to these instead of the ones in views.py when
+``settings.ASYNC_VIEWS`` is set (the uvicorn web process). Database reads use
+the async ORM and model inference runs on the bounded pool in ``offload``, so
+a slow prediction no longer holds a worker that other requests are queued
+behind. Templates are rendered in a worker thread once every queryset they
+use has been evaluated.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import redirect, render
+
+from .auth import is_hr_user
+from .kpis import aget_kpis
+from .models import Employee, Feedback, LeaveRequest
+from .offload import run_cpu
+from .predictions import alatest_prediction
+from .views import promotion_predict, retention_predict
+
+
+async def _render(request, template_name: str, context: dict):
+    # The sync request.user would query the database again from the template
+    request.user = await request.auser()
+    return await sync_to_async(render)(request, template_name, context)
+
+
+def hr_required(view_func):
+    @functools.wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        if not is_hr_user(await request.auser()):
+            messages.error(request, "❌ Access denied: HR only.")
+            return redirect("role_redirect")
+        return await view_func(request, *args, **kwargs)
+    return wrapper
+
+
+@login_required
+@hr_required
+async def hr_dashboard(request):
+    return await _render(request, "hr_app/hr_dashboard.html", await aget_kpis())
+
+
+@login_required
+async def employee_dashboard(request):
+    user = await request.auser()
+    employee = await Employee.objects.filter(user=user).afirst()
+    leaves, feedbacks = [], []
+    if employee is not None:
+        leaves = [leave async for leave in LeaveRequest.objects.filter(employee=employee)]
+        feedbacks = [feedback async for feedback in Feedback.objects.filter(employee=employee)]
+
+    return await _render(request, "hr_app/employee_dashboard.html", {
+        "employee": employee,
+        "leaves": leaves,
+        "feedbacks": feedbacks,
+        "my_retention": await alatest_prediction(employee, "retention"),
+        "my_promotion": await alatest_prediction(employee, "promotion"),
+    })
+
+
+@login_required
+async def predict_promotion(request):
+    result, prob = None, None
+
+    if request.method == "POST":
+        try:
+            data = {
+                "city": request.POST.get("city") or "",
+                "gender": request.POST.get("gender") or "",
+                "relevent_experience": request.POST.get("experience_type") or "",
+                "experience": int(request.POST.get("experience") or 0),
+                "company_size": request.POST.get("company_size") or "",
+                "company_type": request.POST.get("company_type") or "",
+                "training_hours": int(request.POST.get("training_hours") or 0),
+                "last_new_job": request.POST.get("last_new_job") or "",
+                "enrolled_university": request.POST.get("enrolled_university") or "",
+                "education_level": request.POST.get("education_level") or "",
+                "city_development_index": float(request.POST.get("city_development_index") or 0),
+                "major_discipline": request.POST.get("major_discipline") or "",
+            }
+            result, prob = await run_cpu(promotion_predict, data)
+        except Exception as e:
+            result = f"Error: {str(e)}"
+
+    return await _render(request, "hr_app/predict_promotion.html", {
+        "result": result,
+        "prob": prob
+    })
+
+
+@login_required
+async def predict_retention_single(request):
+    result, prob = None, None
+
+    if request.method == "POST":
+        data = {
+            "Age": int(request.POST.get("age")),
+            "MonthlyIncome": float(request.POST.get("monthly_income")),
+            "YearsAtCompany": int(request.POST.get("years_at_company")),
+            "Department": request.POST.get("department"),
+        }
+        yhat, p = await run_cpu(retention_predict, data)
+        result = "🚨 At Risk of Leaving" if yhat == 1 else "✅ Likely to Stay"
+        prob = round(p * 100, 2)
+
+    return await _render(request, "hr_app/predict_retention.html", {
+        "prediction": result,
+        "prob": prob
+    })
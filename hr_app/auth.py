@@ -0,0 +1,34 @@
+"""
+Authentication helpers.
+
+ProfileBackend loads the session user together with its Profile in a single
+query, so role checks (``is_hr_user``, ``user.profile.is_hr`` in templates)
+cost nothing extra per request.
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+
+class ProfileBackend(ModelBackend):
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related("profile").get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = await UserModel._default_manager.select_related("profile").aget(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+
+def is_hr_user(user) -> bool:
+    """
+    Whether ``user`` has an HR profile (explicit role or staff). Users without a profile are not HR.
+    """
+    return hasattr(user, "profile") and user.profile.is_hr
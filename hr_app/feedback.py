@@ -0,0 +1,60 @@
+"""
+Off-request sentiment scoring for Feedback rows.
+
+New feedback is saved as "Pending" and a ``score_feedback`` job is queued for
+``manage.py run_worker`` once the transaction commits. ``manage.py
+score_feedback`` scores anything left pending, re-scores in bulk, or
+backfills feedback from a CSV.
+"""
+import json
+
+from django.db import transaction
+
+from .jobs import enqueue
+from .ml.sentiment import label_texts
+from .kpis import invalidate_kpis
+from .models import Feedback
+
+SCORE_BATCH_SIZE = 1000
+
+
+def score_feedback(feedbacks) -> int:
+    """
+    Label ``feedbacks`` in one batch and write them back with a single bulk_update.
+    """
+    feedbacks = list(feedbacks)
+    for feedback, label in zip(feedbacks, label_texts([f.text for f in feedbacks])):
+        feedback.sentiment = label
+    Feedback.objects.bulk_update(feedbacks, ["sentiment"], batch_size=SCORE_BATCH_SIZE)
+    invalidate_kpis()
+    return len(feedbacks)
+
+
+def score_ids(ids) -> int:
+    return score_feedback(Feedback.objects.filter(pk__in=ids).only("id", "text"))
+
+
+def rescore(queryset, batch_size: int = SCORE_BATCH_SIZE) -> int:
+    """
+    Score every row of ``queryset`` in batches of ``batch_size``.
+    """
+    scored = 0
+    last_pk = 0
+    queryset = queryset.only("id", "text").order_by("pk")
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return scored
+        with transaction.atomic():
+            scored += score_feedback(batch)
+        last_pk = batch[-1].pk
+
+
+def enqueue_scoring(ids):
+    """
+    Queue a ``score_feedback`` job for the given feedback ids once the current transaction
+    commits. Rows whose job fails stay "Pending" for ``manage.py score_feedback``.
+    """
+    ids = list(ids)
+    payload = json.dumps(ids).encode("utf-8")
+    transaction.on_commit(lambda: enqueue("score_feedback", payload, total=len(ids)))
@@ -167,6 +167,21 @@ class MessageForm(forms.ModelForm):
         }
 
 
+class BroadcastForm(forms.Form):
+    department = forms.ChoiceField(widget=forms.Select(attrs={"class": "form-control"}))
+    subject = forms.CharField(max_length=Message._meta.get_field("subject").max_length,
+                              widget=forms.TextInput(attrs={"class": "form-control"}))
+    body = forms.CharField(widget=forms.Textarea(attrs={"class": "form-control", "rows": 4}))
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        departments = (
+            Employee.objects.filter(user__isnull=False).order_by("department")
+            .values_list("department", flat=True).distinct()
+        )
+        self.fields["department"].choices = [(d, d) for d in departments]
+
+
 # ——————————————————————————————————————
 # Bulk CSV Upload
 # ——————————————————————————————————————
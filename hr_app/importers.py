@@ -0,0 +1,124 @@
+"""
+Streaming bulk import of employee CSVs.
+
+The file is read in fixed-size chunks. Each chunk costs one query to look up
+the existing rows, one ``bulk_create`` and one ``executemany`` UPDATE for
+the rows whose values changed, all inside a single transaction, so memory
+and queries per chunk stay constant whatever the size of the file.
+
+Updates skip ``bulk_update``: it builds a CASE WHEN expression per field and
+row, and compiling those costs about a millisecond per updated row whatever
+the batch size.
+"""
+from typing import TYPE_CHECKING
+
+from django.db import connection, transaction
+
+from .kpis import invalidate_kpis
+from .models import Employee
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+IMPORT_CHUNK_SIZE = 2000
+
+# CSV column -> (Employee field, default)
+EMPLOYEE_COLUMNS = {
+    "EmployeeName": ("name", None),
+    "Department": ("department", "Unknown"),
+    "Age": ("age", 0),
+    "MonthlyIncome": ("salary", 0),
+    "YearsAtCompany": ("years_at_company", 0),
+}
+UPDATE_FIELDS = [field for field, _ in EMPLOYEE_COLUMNS.values()]
+
+
+def _chunk_rows(chunk: "pd.DataFrame") -> dict:
+    """
+    Map emp_id -> field values for one chunk; later rows win, like repeated update_or_create.
+    """
+    import pandas as pd
+
+    chunk = chunk[chunk["EmployeeNumber"].notna()]
+    rows = {}
+    for rec in chunk.to_dict("records"):
+        emp_id = str(rec["EmployeeNumber"]).strip()
+        values = {}
+        for col, (field, default) in EMPLOYEE_COLUMNS.items():
+            value = rec.get(col)
+            if value is None or pd.isna(value):
+                value = f"Emp {emp_id}" if field == "name" else default
+            values[field] = value
+        rows[emp_id] = values
+    return rows
+
+
+def _update_rows(updates: list):
+    """
+    Write ``[(pk, values), ...]`` with one parameterised UPDATE sent through executemany.
+    """
+    quote = connection.ops.quote_name
+    fields = [Employee._meta.get_field(name) for name in UPDATE_FIELDS]
+    sql = "UPDATE {} SET {} WHERE {} = %s".format(
+        quote(Employee._meta.db_table),
+        ", ".join(f"{quote(field.column)} = %s" for field in fields),
+        quote(Employee._meta.pk.column),
+    )
+    params = [
+        [field.get_db_prep_save(values[field.name], connection) for field in fields] + [pk]
+        for pk, values in updates
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+
+def import_chunk(chunk: "pd.DataFrame") -> tuple:
+    """
+    Upsert one chunk of rows. Returns ``(created, updated)``; rows that already
+    exist count as updated even when none of their values changed.
+    """
+    rows = _chunk_rows(chunk)
+    if not rows:
+        return 0, 0
+
+    fields = [Employee._meta.get_field(name) for name in UPDATE_FIELDS]
+    with transaction.atomic():
+        existing = {
+            emp_id: (pk, current)
+            for emp_id, pk, *current in Employee.objects.filter(emp_id__in=list(rows)).values_list(
+                "emp_id", "id", *UPDATE_FIELDS
+            )
+        }
+        to_create = [
+            Employee(emp_id=emp_id, **values)
+            for emp_id, values in rows.items() if emp_id not in existing
+        ]
+        to_update = []
+        for emp_id, values in rows.items():
+            if emp_id in existing:
+                pk, current = existing[emp_id]
+                if [field.get_prep_value(values[field.name]) for field in fields] != current:
+                    to_update.append((pk, values))
+        Employee.objects.bulk_create(to_create, batch_size=IMPORT_CHUNK_SIZE)
+        if to_update:
+            _update_rows(to_update)
+    # bulk writes bypass the post_save signals
+    invalidate_kpis()
+    return len(to_create), len(rows) - len(to_create)
+
+
+def import_employees_csv(csv_file, chunk_size: int = IMPORT_CHUNK_SIZE) -> tuple:
+    """
+    Stream ``csv_file`` into the Employee table. Returns ``(created, updated)``.
+    """
+    import pandas as pd
+
+    created = updated = 0
+    reader = pd.read_csv(csv_file, chunksize=chunk_size, dtype={"EmployeeNumber": str}, encoding="utf-8-sig")
+    for chunk in reader:
+        if "EmployeeNumber" not in chunk.columns:
+            raise ValueError("CSV is missing the EmployeeNumber column.")
+        c, u = import_chunk(chunk)
+        created += c
+        updated += u
+    return created, updated
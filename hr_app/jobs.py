@@ -0,0 +1,183 @@
+"""
+Database-backed background jobs.
+
+Web requests only insert a Job row and return. ``manage.py run_worker``
+claims queued jobs with a conditional UPDATE (safe with several workers and
+on any database, no Redis needed), runs them in chunks and records progress
+so the UI can poll it. Progress is committed together with each chunk's
+writes, so a job re-queued after a worker died resumes after the last
+committed chunk instead of writing it again.
+"""
+import csv
+import io
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .messaging import broadcast
+from .models import Job
+from .predictions import save_predictions
+
+logger = logging.getLogger(__name__)
+
+JOB_CHUNK_SIZE = 2000
+# Running jobs not updated for this long are assumed to belong to a dead worker
+STALE_AFTER = timedelta(minutes=10)
+
+HANDLERS = {}
+
+
+def handler(kind: str):
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+def enqueue(kind: str, payload: bytes, user=None, filename: str = "", total: int = 0) -> Job:
+    return Job.objects.create(kind=kind, payload=payload, created_by=user, filename=filename, total=total)
+
+
+def claim_next():
+    """
+    Atomically move the oldest queued job to "running" and return it, or None.
+    """
+    candidates = Job.objects.filter(status="queued").order_by("created_at").values_list("id", flat=True)[:10]
+    for pk in candidates:
+        now = timezone.now()
+        if Job.objects.filter(pk=pk, status="queued").update(status="running", started_at=now, updated_at=now):
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def requeue_stale() -> int:
+    """
+    Put jobs of dead workers back in the queue. ``processed`` is kept so handlers can resume.
+    """
+    cutoff = timezone.now() - STALE_AFTER
+    return Job.objects.filter(status="running", updated_at__lt=cutoff).update(
+        status="queued", updated_at=timezone.now()
+    )
+
+
+def report_progress(job: Job, processed: int):
+    job.processed = processed
+    Job.objects.filter(pk=job.pk).update(processed=processed, updated_at=timezone.now())
+
+
+def run_job(job: Job):
+    try:
+        HANDLERS[job.kind](job)
+    except Exception as e:
+        logger.exception("Job %s failed", job.pk)
+        Job.objects.filter(pk=job.pk).update(
+            status="failed", error=str(e)[:2000], finished_at=timezone.now(), updated_at=timezone.now()
+        )
+        return
+    job.status = "done"
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "result", "processed", "total", "finished_at", "updated_at"])
+
+
+def run_pending(limit: int = None) -> int:
+    """
+    Run queued jobs until the queue is empty (or ``limit`` jobs ran). Returns the number run.
+    """
+    ran = 0
+    while limit is None or ran < limit:
+        job = claim_next()
+        if job is None:
+            break
+        run_job(job)
+        ran += 1
+        close_old_connections()
+    return ran
+
+
+# ——————————————————————————————————————
+# Handlers
+# ——————————————————————————————————————
+RESULT_HEADER = ["EmployeeNumber", "EmployeeName", "Retention", "RetentionProbability",
+                 "Promotion", "PromotionProbability", "Sentiment"]
+
+
+@handler("csv_predict")
+def run_csv_predict(job: Job):
+    # The ML stack is only imported by processes that actually score files
+    import pandas as pd
+    from .ml.compiled import get_inference_model
+    from .ml.parallel import ParallelScorer
+    from .ml.scoring import score_chunk
+
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(RESULT_HEADER)
+
+    reader = pd.read_csv(
+        io.BytesIO(bytes(job.payload)), chunksize=JOB_CHUNK_SIZE,
+        dtype={"EmployeeNumber": str}, encoding="utf-8-sig",
+    )
+    workers = getattr(settings, "SCORING_WORKERS", 1)
+    if workers > 1:
+        with ParallelScorer(workers) as scorer:
+            processed = _write_scored(job, scorer.iter_score(reader), writer)
+    else:
+        retention = get_inference_model("retention", rows=JOB_CHUNK_SIZE)
+        promotion = get_inference_model("promotion", rows=JOB_CHUNK_SIZE)
+        processed = _write_scored(job, (score_chunk(c, retention, promotion) for c in reader), writer)
+
+    job.total = max(job.total, processed)
+    job.result = out.getvalue().encode("utf-8")
+
+
+def _write_scored(job: Job, scored_chunks, writer) -> int:
+    """
+    Persist and write out every chunk. Rows a previous run already persisted (the
+    first ``job.processed``) are only written to the result file, not saved again.
+    """
+    resume_from = job.processed
+    processed = 0
+    for rows in scored_chunks:
+        skip = max(resume_from - processed, 0)
+        with transaction.atomic():
+            if skip < len(rows):
+                save_predictions(rows[skip:])
+            report_progress(job, processed + len(rows))
+        writer.writerows(
+            [r["emp_id"] or "", r["employee"], r["retention"], round(r["retention_prob"], 4),
+             r["promotion"], round(r["promotion_prob"], 4), r["sentiment"]]
+            for r in rows
+        )
+        processed += len(rows)
+    return processed
+
+
+@handler("broadcast")
+def run_broadcast(job: Job):
+    """
+    Fan a department broadcast out to its recipients. A broadcast re-queued after
+    a worker crash skips the recipients whose batches were already committed.
+    """
+    spec = json.loads(bytes(job.payload))
+    sender = get_user_model().objects.get(pk=spec["sender_id"])
+    recipients = spec["recipients"]
+    done = job.processed
+    sent = broadcast(sender, recipients[done:], spec["subject"], spec["body"],
+                     on_progress=lambda n: report_progress(job, done + n))
+    job.total = len(recipients)
+    job.processed = done + sent
+
+
+@handler("score_feedback")
+def run_score_feedback(job: Job):
+    # Imported here so the worker only loads the sentiment model when it has feedback to score
+    from .feedback import score_ids
+
+    ids = json.loads(bytes(job.payload))
+    job.total = len(ids)
+    job.processed = score_ids(ids)
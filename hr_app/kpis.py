@@ -0,0 +1,101 @@
+"""
+Dashboard KPI snapshot.
+
+All dashboard numbers come from four aggregate queries using conditional
+``Count(filter=Q(...))``. The result is kept in the shared database cache and
+dropped by the signals in ``signals.py`` whenever an Employee, Feedback,
+LeaveRequest or prediction row changes, and explicitly by the bulk
+import/persist paths (which bypass signals), so a write in any web or job
+worker process is visible to all of them. Inside a transaction the snapshot
+is dropped once, when it commits, however many rows changed.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .models import Employee, Feedback, LatestPrediction, LeaveRequest
+
+KPI_CACHE_KEY = "hr_app:kpi_snapshot"
+# Backstop for writes that bypass both signals and invalidate_kpis (e.g. queryset.update)
+KPI_CACHE_TIMEOUT = 60
+
+SENTIMENT_LABELS = ["Positive", "Neutral", "Negative"]
+
+
+def _kpi_queries() -> tuple:
+    dept_distribution = Employee.objects.order_by().values("department").annotate(count=Count("id"))
+    leave_stats = LeaveRequest.objects.order_by().values("status").annotate(count=Count("id"))
+    sentiments = {label: Count("id", filter=Q(sentiment=label)) for label in SENTIMENT_LABELS}
+    predictions = {
+        "retention_risks": Count("id", filter=Q(kind="retention", result="1")),
+        "promotions": Count("id", filter=Q(kind="promotion", result="1")),
+    }
+    return dept_distribution, leave_stats, sentiments, predictions
+
+
+def _snapshot(dept_distribution, leave_stats, sentiments, predictions) -> dict:
+    return {
+        "total_employees": sum(d["count"] for d in dept_distribution),
+        "retention_risks": predictions["retention_risks"],
+        "promotions": predictions["promotions"],
+        "dept_labels": [d["department"] for d in dept_distribution],
+        "dept_counts": [d["count"] for d in dept_distribution],
+        "leave_labels": [l["status"] for l in leave_stats],
+        "leave_counts": [l["count"] for l in leave_stats],
+        "sentiment_labels": SENTIMENT_LABELS,
+        "sentiment_counts": [sentiments[label] for label in SENTIMENT_LABELS],
+    }
+
+
+def compute_kpis() -> dict:
+    depts, leaves, sentiments, predictions = _kpi_queries()
+    return _snapshot(
+        list(depts),
+        list(leaves),
+        Feedback.objects.aggregate(**sentiments),
+        LatestPrediction.objects.aggregate(**predictions),
+    )
+
+
+async def acompute_kpis() -> dict:
+    depts, leaves, sentiments, predictions = _kpi_queries()
+    return _snapshot(
+        [d async for d in depts],
+        [l async for l in leaves],
+        await Feedback.objects.aaggregate(**sentiments),
+        await LatestPrediction.objects.aaggregate(**predictions),
+    )
+
+
+def get_kpis() -> dict:
+    snapshot = cache.get(KPI_CACHE_KEY)
+    if snapshot is None:
+        snapshot = compute_kpis()
+        cache.set(KPI_CACHE_KEY, snapshot, KPI_CACHE_TIMEOUT)
+    return snapshot
+
+
+async def aget_kpis() -> dict:
+    """
+    ``get_kpis`` for async views, through the async cache and ORM APIs.
+    """
+    snapshot = await cache.aget(KPI_CACHE_KEY)
+    if snapshot is None:
+        snapshot = await acompute_kpis()
+        await cache.aset(KPI_CACHE_KEY, snapshot, KPI_CACHE_TIMEOUT)
+    return snapshot
+
+
+def _drop_snapshot():
+    cache.delete(KPI_CACHE_KEY)
+
+
+def invalidate_kpis():
+    """
+    Drop the snapshot now, or when the current transaction commits. Calls made
+    while a drop is already scheduled (e.g. one per saved row) add nothing.
+    """
+    connection = transaction.get_connection()
+    if connection.in_atomic_block and any(func is _drop_snapshot for _, func, _ in connection.run_on_commit):
+        return
+    transaction.on_commit(_drop_snapshot)
@@ -0,0 +1,65 @@
+"""
+Leave request decisions.
+
+``decide`` approves or rejects any number of requests with one conditional
+``UPDATE ... WHERE status = 'Pending'``, so concurrent HR users can never
+overwrite each other's decisions, and reports what happened to every ID.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .kpis import invalidate_kpis
+from .models import LeaveRequest
+
+DECISIONS = ("Approved", "Rejected")
+MAX_BULK_DECISIONS = 1000
+
+
+def parse_ids(values) -> list:
+    """
+    Distinct integer IDs from request values, in first-seen order; raises ValueError on junk.
+    """
+    return list(dict.fromkeys(int(value) for value in values))
+
+
+def decide(ids, decision: str, comment: str = "") -> list:
+    """
+    Apply ``decision`` to the pending requests among ``ids``.
+
+    Returns one ``{"id", "outcome", "status"}`` dict per ID, where outcome is
+    "updated", "skipped" (already decided; status is the existing decision)
+    or "not_found".
+    """
+    if decision not in DECISIONS:
+        raise ValueError(f"Unknown decision: {decision!r}")
+    if len(ids) > MAX_BULK_DECISIONS:
+        raise ValueError(f"At most {MAX_BULK_DECISIONS} requests can be decided at once.")
+
+    with transaction.atomic():
+        # Lock the pending rows (a no-op on SQLite, where writers are serialized anyway)
+        pending = list(
+            LeaveRequest.objects.select_for_update()
+            .filter(pk__in=ids, status="Pending").values_list("id", flat=True)
+        )
+        updated = 0
+        if pending:
+            updated = LeaveRequest.objects.filter(pk__in=pending, status="Pending").update(
+                status=decision, hr_comment=comment, updated_at=timezone.now(),
+            )
+        others = dict(
+            LeaveRequest.objects.filter(pk__in=set(ids) - set(pending)).values_list("id", "status")
+        )
+    if updated:
+        # Queryset updates bypass the post_save signal that drops the KPI snapshot
+        invalidate_kpis()
+
+    pending = set(pending)
+    results = []
+    for pk in ids:
+        if pk in pending:
+            results.append({"id": pk, "outcome": "updated", "status": decision})
+        elif pk in others:
+            results.append({"id": pk, "outcome": "skipped", "status": others[pk]})
+        else:
+            results.append({"id": pk, "outcome": "not_found", "status": None})
+    return results
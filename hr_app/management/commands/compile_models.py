@@ -0,0 +1,29 @@
+import joblib
+from django.core.management.base import BaseCommand, CommandError
+
+from hr_app.ml.compiled import COMPILED_SUFFIX, compile_pipeline
+from hr_app.ml.registry import registry
+from hr_app.ml.training import atomic_write
+
+
+class Command(BaseCommand):
+    help = "Export the trained pipelines as compiled, memory-mappable array artifacts (<name>.compiled.pkl)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("names", nargs="*", default=["retention", "promotion"])
+
+    def handle(self, *args, **opts):
+        for name in opts["names"]:
+            if not registry.path(name).exists():
+                raise CommandError(f"No model artifact at {registry.path(name)}")
+            try:
+                compiled = compile_pipeline(registry.get(name), registry.version(name))
+            except ValueError as e:
+                raise CommandError(f"{name}: {e}")
+
+            target = registry.path(name + COMPILED_SUFFIX)
+            # Uncompressed so the registry can memory-map the arrays
+            atomic_write(target, lambda tmp: joblib.dump(compiled, tmp))
+            self.stdout.write(self.style.SUCCESS(
+                f"{name}: {len(compiled.roots)} trees, {len(compiled.threshold)} nodes -> {target}"
+            ))
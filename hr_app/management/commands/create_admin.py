@@ -0,0 +1,24 @@
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Create the default admin superuser if it does not exist (run once per deploy, see build.sh)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", default="admin")
+        parser.add_argument("--email", default="admin@example.com")
+        parser.add_argument("--password", default=os.environ.get("ADMIN_PASSWORD"),
+                            help="Defaults to $ADMIN_PASSWORD; one of the two is required to create the user.")
+
+    def handle(self, *args, **opts):
+        User = get_user_model()
+        if User.objects.filter(username=opts["username"]).exists():
+            self.stdout.write(f"Superuser {opts['username']} already exists.")
+            return
+        if not opts["password"]:
+            raise CommandError(f"Set ADMIN_PASSWORD or pass --password to create superuser {opts['username']}.")
+        User.objects.create_superuser(username=opts["username"], email=opts["email"], password=opts["password"])
+        self.stdout.write(self.style.SUCCESS(f"Superuser created: {opts['username']}"))
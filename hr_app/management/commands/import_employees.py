@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from hr_app.importers import IMPORT_CHUNK_SIZE, import_employees_csv
+
+
+class Command(BaseCommand):
+    help = "Stream an employee CSV into the directory with chunked bulk upserts."
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path")
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **opts):
+        try:
+            created, updated = import_employees_csv(opts["csv_path"], chunk_size=opts["chunk_size"])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"{created} employees added, {updated} updated."))
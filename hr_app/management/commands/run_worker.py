@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from hr_app.jobs import requeue_stale, run_pending
+
+
+class Command(BaseCommand):
+    help = "Process queued background jobs (CSV predictions, ...) from the Job table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Drain the queue once and exit.")
+        parser.add_argument("--sleep", type=float, default=2.0, help="Seconds to wait when the queue is empty.")
+
+    def handle(self, *args, **opts):
+        self.stdout.write("Worker started.")
+        while True:
+            requeued = requeue_stale()
+            if requeued:
+                self.stdout.write(f"Re-queued {requeued} stale job(s).")
+            ran = run_pending()
+            if ran:
+                self.stdout.write(f"Processed {ran} job(s).")
+            if opts["once"]:
+                return
+            if not ran:
+                time.sleep(opts["sleep"])
@@ -0,0 +1,52 @@
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from hr_app.feedback import SCORE_BATCH_SIZE, rescore
+from hr_app.kpis import invalidate_kpis
+from hr_app.ml.sentiment import label_texts
+from hr_app.models import Employee, Feedback
+
+
+class Command(BaseCommand):
+    help = (
+        "Score pending feedback sentiment in bulk. Use --all to re-score every row, "
+        "or --from-csv to backfill feedback (employee_id, feedback_text) from a CSV."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Re-score every feedback row.")
+        parser.add_argument("--from-csv", metavar="PATH", help="Backfill feedback rows from a CSV file.")
+        parser.add_argument("--batch-size", type=int, default=SCORE_BATCH_SIZE)
+
+    def handle(self, *args, **opts):
+        batch_size = opts["batch_size"]
+        if opts["from_csv"]:
+            created = self.backfill(opts["from_csv"], batch_size)
+            self.stdout.write(self.style.SUCCESS(f"{created} feedback rows created from {opts['from_csv']}."))
+            return
+
+        queryset = Feedback.objects.all() if opts["all"] else Feedback.objects.filter(sentiment="Pending")
+        scored = rescore(queryset, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"{scored} feedback rows scored."))
+
+    def backfill(self, path, batch_size):
+        created = 0
+        try:
+            reader = pd.read_csv(path, chunksize=batch_size, dtype={"employee_id": str})
+            for chunk in reader:
+                chunk = chunk.dropna(subset=["employee_id", "feedback_text"])
+                employees = dict(
+                    Employee.objects.filter(emp_id__in=chunk["employee_id"].unique().tolist()).values_list("emp_id", "id")
+                )
+                texts = chunk["feedback_text"].tolist()
+                rows = [
+                    Feedback(employee_id=employees[emp_id], text=text, sentiment=label)
+                    for emp_id, text, label in zip(chunk["employee_id"], texts, label_texts(texts))
+                    if emp_id in employees
+                ]
+                Feedback.objects.bulk_create(rows, batch_size=batch_size)
+                created += len(rows)
+        except (OSError, KeyError, ValueError) as e:
+            raise CommandError(f"Could not read {path}: {e}")
+        invalidate_kpis()
+        return created
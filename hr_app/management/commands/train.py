@@ -0,0 +1,40 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from hr_app.ml.training import SPECS, train_model_isolated
+
+
+class Command(BaseCommand):
+    help = "Train the promotion and/or retention models and write versioned artifacts with metadata."
+
+    def add_arguments(self, parser):
+        parser.add_argument("names", nargs="*", help=f"Models to train: {', '.join(sorted(SPECS))} (default: all).")
+        parser.add_argument("--data", help="CSV to train on instead of the default under data/ (one model only).")
+        parser.add_argument("--n-jobs", type=int, default=-1, help="Threads used to fit the forests (-1 = all cores).")
+        parser.add_argument("--test-size", type=float, default=0.2)
+        parser.add_argument("--compile", action="store_true", help="Also export compiled inference artifacts.")
+
+    def handle(self, *args, **opts):
+        names = opts["names"] or sorted(SPECS)
+        unknown = set(names) - set(SPECS)
+        if unknown:
+            raise CommandError(f"Unknown model(s): {', '.join(sorted(unknown))}")
+        if opts["data"] and len(names) != 1:
+            raise CommandError("--data needs exactly one model name.")
+
+        for name in names:
+            self.stdout.write(f"Training {name}...")
+            try:
+                # One process per model, so each reports its own peak memory
+                meta = train_model_isolated(name, data_path=opts["data"], n_jobs=opts["n_jobs"], test_size=opts["test_size"])
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f"{name}: {e}")
+            peak = meta["peak_memory_bytes"]
+            self.stdout.write(self.style.SUCCESS(
+                f"{name} {meta['version']}: {meta['data']['rows']} rows, fit in {meta['train_seconds']}s, "
+                f"train accuracy {meta['train_accuracy']}, test accuracy {meta['test_accuracy']}, "
+                f"peak memory {peak / 2**20:.0f} MiB" if peak else f"{name} {meta['version']} trained."
+            ))
+
+        if opts["compile"]:
+            call_command("compile_models", *names, stdout=self.stdout)
@@ -0,0 +1,132 @@
+"""
+Message delivery and read tracking.
+
+Every user's unread count is stored on ``Profile.unread_messages`` and changed
+in the same transaction as the messages themselves, so the navbar badge is
+read from the already-loaded profile instead of counting the mailbox. All
+writes that change unread state should go through ``deliver`` and
+``mark_read``. Code that deletes messages calls ``discount_unread`` on them
+first; a ``pre_delete`` receiver in ``signals`` does so for the sent
+messages a deleted user takes with it. ``recount_unread`` repairs counters
+after out-of-band edits.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Value
+from django.db.models.functions import Greatest
+
+from .models import Employee, Message, Profile
+
+DELIVERY_BATCH_SIZE = 2000
+# Broadcasts to more recipients than this run as a background job
+BROADCAST_SYNC_LIMIT = 2000
+
+
+def deliver(messages: list) -> list:
+    """
+    Insert unsaved Message objects and bump their receivers' unread counters.
+    """
+    by_receiver = defaultdict(int)
+    for msg in messages:
+        if not msg.is_read:
+            by_receiver[msg.receiver_id] += 1
+    # One UPDATE per distinct increment: a broadcast is a single statement
+    by_count = defaultdict(list)
+    for user_id, n in by_receiver.items():
+        by_count[n].append(user_id)
+
+    with transaction.atomic():
+        created = Message.objects.bulk_create(messages, batch_size=DELIVERY_BATCH_SIZE)
+        for n, user_ids in by_count.items():
+            Profile.objects.filter(user_id__in=user_ids).update(unread_messages=F("unread_messages") + n)
+    return created
+
+
+def mark_read(user, ids=None) -> int:
+    """
+    Mark ``user``'s unread messages (all, or only ``ids``) as read with one UPDATE.
+    Returns the number of messages that changed.
+    """
+    unread = Message.objects.filter(receiver=user, is_read=False)
+    if ids is not None:
+        unread = unread.filter(pk__in=ids)
+    with transaction.atomic():
+        changed = unread.update(is_read=True)
+        if changed:
+            Profile.objects.filter(user=user).update(
+                unread_messages=Greatest(F("unread_messages") - changed, Value(0))
+            )
+    if changed and hasattr(user, "profile"):
+        user.profile.unread_messages = max(user.profile.unread_messages - changed, 0)
+    return changed
+
+
+def discount_unread(messages) -> None:
+    """
+    Take the unread messages among ``messages`` (a queryset about to be deleted) off
+    their receivers' counters, with one UPDATE per distinct count.
+    """
+    by_count = defaultdict(list)
+    per_receiver = (
+        messages.filter(is_read=False).order_by().values("receiver_id")
+        .annotate(n=Count("id")).values_list("receiver_id", "n")
+    )
+    for user_id, n in per_receiver:
+        by_count[n].append(user_id)
+    for n, user_ids in by_count.items():
+        Profile.objects.filter(user_id__in=user_ids).update(
+            unread_messages=Greatest(F("unread_messages") - n, Value(0))
+        )
+
+
+def department_recipients(department: str, exclude_user=None) -> list:
+    """
+    User ids of every employee in ``department`` with a login, in one query.
+    """
+    employees = Employee.objects.filter(department=department, user__isnull=False)
+    if exclude_user is not None:
+        employees = employees.exclude(user_id=exclude_user.pk)
+    return list(employees.order_by("user_id").values_list("user_id", flat=True).distinct())
+
+
+def broadcast(sender, recipient_ids: list, subject: str, body: str, on_progress=None) -> int:
+    """
+    Send the same message to every user in ``recipient_ids``, one ``deliver`` batch at a time.
+    ``on_progress(sent)`` runs in the same transaction as each batch, so progress it
+    records never disagrees with what was delivered.
+    """
+    sent = 0
+    for start in range(0, len(recipient_ids), DELIVERY_BATCH_SIZE):
+        batch = recipient_ids[start:start + DELIVERY_BATCH_SIZE]
+        with transaction.atomic():
+            deliver([Message(sender=sender, receiver_id=user_id, subject=subject, body=body) for user_id in batch])
+            sent += len(batch)
+            if on_progress is not None:
+                on_progress(sent)
+    return sent
+
+
+def recount_unread(user_ids=None) -> int:
+    """
+    Recompute unread counters from the Message table; returns the number of profiles updated.
+    """
+    profiles = Profile.objects.all()
+    if user_ids is not None:
+        profiles = profiles.filter(user_id__in=user_ids)
+    counts = dict(
+        Message.objects.filter(is_read=False, receiver_id__in=profiles.values("user_id")).order_by()
+        .values("receiver_id").annotate(n=Count("id")).values_list("receiver_id", "n")
+    )
+    updated = 0
+    with transaction.atomic():
+        for profile in profiles.only("id", "user_id", "unread_messages"):
+            n = counts.get(profile.user_id, 0)
+            if profile.unread_messages != n:
+                Profile.objects.filter(pk=profile.pk).update(unread_messages=n)
+                updated += 1
+    return updated
+
+
+def unread_count(user) -> int:
+    return user.profile.unread_messages if hasattr(user, "profile") else 0
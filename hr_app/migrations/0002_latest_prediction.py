@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LatestPrediction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('retention', 'Retention'), ('promotion', 'Promotion'), ('engagement', 'Engagement')], max_length=20)),
+                ('result', models.CharField(max_length=20)),
+                ('probability', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='latest_predictions', to='hr_app.employee')),
+                ('prediction', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='hr_app.prediction')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'result'], name='hr_app_late_kind_b62f61_idx')],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'kind'), name='uniq_latest_prediction')],
+            },
+        ),
+    ]
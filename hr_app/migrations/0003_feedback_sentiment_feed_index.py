@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr_app', '0002_latest_prediction'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['sentiment', '-created_at', '-id'], name='hr_app_feed_sentime_ea37ea_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+from django.db import migrations
+
+FIELDS = "emp_id, name, department, job_title, location"
+NEW = "new.id, new.emp_id, new.name, new.department, new.job_title, new.location"
+OLD = "old.id, old.emp_id, old.name, old.department, old.job_title, old.location"
+
+SQLITE_FORWARD = [
+    f"""CREATE VIRTUAL TABLE hr_app_employee_fts USING fts5(
+        {FIELDS},
+        content='hr_app_employee', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER hr_app_employee_fts_ai AFTER INSERT ON hr_app_employee BEGIN
+        INSERT INTO hr_app_employee_fts(rowid, {FIELDS}) VALUES ({NEW});
+    END""",
+    f"""CREATE TRIGGER hr_app_employee_fts_ad AFTER DELETE ON hr_app_employee BEGIN
+        INSERT INTO hr_app_employee_fts(hr_app_employee_fts, rowid, {FIELDS}) VALUES ('delete', {OLD});
+    END""",
+    f"""CREATE TRIGGER hr_app_employee_fts_au AFTER UPDATE ON hr_app_employee BEGIN
+        INSERT INTO hr_app_employee_fts(hr_app_employee_fts, rowid, {FIELDS}) VALUES ('delete', {OLD});
+        INSERT INTO hr_app_employee_fts(rowid, {FIELDS}) VALUES ({NEW});
+    END""",
+    "INSERT INTO hr_app_employee_fts(hr_app_employee_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS hr_app_employee_fts_ai",
+    "DROP TRIGGER IF EXISTS hr_app_employee_fts_ad",
+    "DROP TRIGGER IF EXISTS hr_app_employee_fts_au",
+    "DROP TABLE IF EXISTS hr_app_employee_fts",
+]
+
+# Keep in sync with hr_app/search.py
+PG_DOCUMENT = "(emp_id || ' ' || name || ' ' || department || ' ' || job_title || ' ' || location)"
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX hr_app_employee_search_tsv ON hr_app_employee USING gin (to_tsvector('simple', {PG_DOCUMENT}))",
+    f"CREATE INDEX hr_app_employee_search_trgm ON hr_app_employee USING gin ({PG_DOCUMENT} gin_trgm_ops)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS hr_app_employee_search_tsv",
+    "DROP INDEX IF EXISTS hr_app_employee_search_trgm",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hr_app", "0003_feedback_sentiment_feed_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}),
+            _run({"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRES_BACKWARD}),
+        ),
+    ]
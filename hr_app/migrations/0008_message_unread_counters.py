@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:04
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_unread_counts(apps, schema_editor):
+    Message = apps.get_model("hr_app", "Message")
+    Profile = apps.get_model("hr_app", "Profile")
+    counts = (
+        Message.objects.filter(is_read=False).order_by()
+        .values("receiver_id").annotate(n=Count("id")).values_list("receiver_id", "n")
+    )
+    for user_id, n in counts:
+        Profile.objects.filter(user_id=user_id).update(unread_messages=n)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr_app', '0007_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='unread_messages',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['receiver', '-created_at', '-id'], name='hr_app_mess_receive_81387c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['receiver', 'is_read', '-created_at'], name='hr_app_mess_receive_ce1514_idx'),
+        ),
+        migrations.RunPython(backfill_unread_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr_app', '0008_message_unread_counters'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='kind',
+            field=models.CharField(choices=[('csv_predict', 'CSV Prediction'), ('broadcast', 'Department Broadcast')], max_length=30),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr_app', '0009_job_broadcast_kind'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='kind',
+            field=models.CharField(choices=[('csv_predict', 'CSV Prediction'), ('broadcast', 'Department Broadcast'), ('score_feedback', 'Feedback Sentiment')], max_length=30),
+        ),
+    ]
@@ -0,0 +1,76 @@
+"""
+Bounded LRU + TTL cache for single-row predictions.
+
+Keys are a canonical hash of the feature dict combined with the version of the
+model that produced the result, so a reloaded artifact never serves stale
+answers. Entries for a model are also dropped as soon as the registry
+reloads it.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from .registry import registry
+
+CACHE_MAXSIZE = 4096
+CACHE_TTL_SECONDS = 15 * 60
+
+
+def feature_hash(features: dict) -> str:
+    canonical = json.dumps(features, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+class PredictionCache:
+    def __init__(self, maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, name: str, features: dict, compute):
+        """
+        Return the cached result for ``features`` under model ``name``, or call ``compute()``.
+        """
+        key = (name, registry.version(name), feature_hash(features))
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] > now:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return item[1]
+            self.misses += 1
+
+        value = compute()
+        with self._lock:
+            self._data[key] = (now + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def invalidate(self, name: str = None):
+        with self._lock:
+            if name is None:
+                self._data.clear()
+            else:
+                for key in [k for k in self._data if k[0] == name]:
+                    del self._data[key]
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+prediction_cache = PredictionCache()
+registry.on_reload(prediction_cache.invalidate)
@@ -0,0 +1,286 @@
+"""
+Compiled, array-based inference for the trained RandomForest pipelines.
+
+``compile_pipeline`` flattens a fitted ``Pipeline(ColumnTransformer, RandomForestClassifier)``
+into plain NumPy arrays:
+
+* per-column imputer values, scaler mean/scale and category -> one-hot column maps;
+* the node arrays of every tree stacked end to end (feature, threshold,
+  children with global indices, and normalized leaf probabilities).
+
+``CompiledForest.predict_proba`` walks all trees for all rows at once,
+advancing only the paths that have not reached a leaf yet. It reproduces
+sklearn's arithmetic (float32 features, float64 thresholds, tree-by-tree
+accumulation) so probabilities are identical to ``Pipeline.predict_proba``.
+Compiled artifacts are written next to the ``.pkl`` as ``<name>.compiled.pkl``
+by ``manage.py compile_models`` and contain only NumPy arrays, so they load
+memory-mapped through the registry, and serving them never imports sklearn.
+"""
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from .registry import registry
+
+COMPILED_SUFFIX = ".compiled"
+# Above this many rows sklearn's own predict_proba is faster than the compiled forest
+COMPILED_MAX_ROWS = 200
+
+
+class CompiledColumn:
+    """
+    How one input column becomes model features: a numeric feature (impute, scale)
+    or a block of one-hot features.
+    """
+
+    def __init__(self, name, offset, impute=None, mean=0.0, scale=1.0, categories=None):
+        self.name = name
+        self.offset = offset
+        self.impute = impute
+        self.mean = mean
+        self.scale = scale
+        # category value -> absolute feature index; None for numeric columns
+        self.categories = categories
+
+    def index(self, value) -> int:
+        """
+        One-hot feature index for ``value``, or -1 for unknown categories.
+        SimpleImputer only treats float NaN as missing in object columns, so None stays unknown.
+        """
+        if value != value and self.impute is not None:
+            value = self.impute
+        try:
+            return self.categories.get(value, -1)
+        except TypeError:
+            # Unhashable input can never match a fitted category
+            return -1
+
+
+def _steps(transformer):
+    from sklearn.pipeline import Pipeline
+
+    if isinstance(transformer, Pipeline):
+        return [step for _, step in transformer.steps]
+    return [transformer]
+
+
+def _compile_columns(preprocessor) -> tuple:
+    from sklearn.impute import SimpleImputer
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    columns = []
+    offset = 0
+    for _, transformer, cols in preprocessor.transformers_:
+        if transformer == "drop" or len(cols) == 0:
+            continue
+        if transformer == "passthrough":
+            steps = []
+        else:
+            steps = _steps(transformer)
+        cols = list(cols)
+        impute = [None] * len(cols)
+        mean, scale = [0.0] * len(cols), [1.0] * len(cols)
+        encoder = None
+        for step in steps:
+            if isinstance(step, SimpleImputer):
+                impute = list(step.statistics_)
+            elif isinstance(step, StandardScaler):
+                mean = list(step.mean_) if step.with_mean else mean
+                scale = list(step.scale_) if step.with_std else scale
+            elif isinstance(step, OneHotEncoder):
+                if step.drop_idx_ is not None or getattr(step, "_infrequent_enabled", False):
+                    raise ValueError("One-hot encoders with drop/infrequent categories are not supported.")
+                encoder = step
+            else:
+                raise ValueError(f"Unsupported transformer: {type(step).__name__}")
+
+        for i, col in enumerate(cols):
+            if encoder is not None:
+                cats = encoder.categories_[i]
+                columns.append(CompiledColumn(
+                    col, offset, impute=impute[i],
+                    categories={c: offset + j for j, c in enumerate(cats)},
+                ))
+                offset += len(cats)
+            else:
+                columns.append(CompiledColumn(col, offset, impute=impute[i], mean=mean[i], scale=scale[i]))
+                offset += 1
+    return columns, offset
+
+
+class CompiledForest:
+    def __init__(self, pipeline, source_version: str = None):
+        preprocessor, forest = pipeline.steps[0][1], pipeline.steps[-1][1]
+        self.source_version = source_version
+        self.feature_names_in_ = list(pipeline.feature_names_in_)
+        self.classes_ = forest.classes_
+        self.columns, self.n_features = _compile_columns(preprocessor)
+        # sklearn routes NaNs by missing_go_to_left only for dense input
+        self.dense_missing = not getattr(preprocessor, "sparse_output_", False)
+
+        trees = [e.tree_ for e in forest.estimators_]
+        offsets = np.cumsum([0] + [t.node_count for t in trees])
+        self.roots = offsets[:-1].astype(np.int64)
+        self.is_leaf = np.concatenate([t.children_left == -1 for t in trees])
+        # Leaves get feature 0 so lookups stay in bounds; they are never advanced
+        self.feature = np.where(self.is_leaf, 0, np.concatenate([t.feature for t in trees])).astype(np.int64)
+        self.threshold = np.concatenate([t.threshold for t in trees])
+        # children[2 * node] is the left child, children[2 * node + 1] the right one (global indices)
+        self.children = np.stack([
+            np.concatenate([t.children_left + off for t, off in zip(trees, offsets)]),
+            np.concatenate([t.children_right + off for t, off in zip(trees, offsets)]),
+        ], axis=1).ravel().astype(np.int64)
+        self.missing_left = np.concatenate([
+            np.asarray(getattr(t, "missing_go_to_left", np.zeros(t.node_count)), dtype=bool) for t in trees
+        ])
+        # Leaf class probabilities, normalized exactly as DecisionTreeClassifier.predict_proba does
+        value = np.concatenate([t.value[:, 0, :] for t in trees])
+        normalizer = value.sum(axis=1)[:, None]
+        normalizer[normalizer == 0.0] = 1.0
+        self.proba = value / normalizer
+
+    # ——————————————————————————————————————
+    # Encoding
+    # ——————————————————————————————————————
+    def encode_frame(self, df: pd.DataFrame) -> np.ndarray:
+        X = np.zeros((len(df), self.n_features), dtype=np.float64)
+        rows = np.arange(len(df))
+        for col in self.columns:
+            values = df[col.name]
+            if col.categories is None:
+                x = np.asarray(values, dtype=np.float64)
+                if col.impute is not None:
+                    x = np.where(np.isnan(x), col.impute, x)
+                elif not self.dense_missing and np.isnan(x).any():
+                    raise ValueError(f"Input contains NaN in column {col.name!r}.")
+                X[:, col.offset] = (x - col.mean) / col.scale
+            else:
+                idx = values.map(col.index, na_action=None).to_numpy(dtype=np.int64)
+                hit = idx >= 0
+                X[rows[hit], idx[hit]] = 1.0
+        return X.astype(np.float32)
+
+    def encode_row(self, row: dict) -> np.ndarray:
+        """
+        Encode one feature dict into a (1, n_features) vector without building a DataFrame.
+        """
+        missing = [col.name for col in self.columns if col.name not in row]
+        if missing:
+            raise ValueError(f"columns are missing: {missing}")
+
+        X = np.zeros((1, self.n_features), dtype=np.float64)
+        for col in self.columns:
+            value = row[col.name]
+            if col.categories is None:
+                x = np.nan if value is None else float(value)
+                if x != x and col.impute is not None:
+                    x = col.impute
+                elif x != x and not self.dense_missing:
+                    raise ValueError(f"Input contains NaN in column {col.name!r}.")
+                X[0, col.offset] = (x - col.mean) / col.scale
+            else:
+                idx = col.index(value)
+                if idx >= 0:
+                    X[0, idx] = 1.0
+        return X.astype(np.float32)
+
+    # ——————————————————————————————————————
+    # Evaluation
+    # ——————————————————————————————————————
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        n_rows, n_trees = X.shape[0], len(self.roots)
+        flat = np.ascontiguousarray(X).ravel()
+        row_base = np.repeat(np.arange(n_rows, dtype=np.int64) * X.shape[1], n_trees)
+        node = np.tile(self.roots, n_rows)
+        active = np.flatnonzero(~self.is_leaf[node])
+        while active.size:
+            nd = node.take(active)
+            x = flat.take(row_base.take(active) + self.feature.take(nd))
+            go_right = ~(x <= self.threshold.take(nd))
+            if self.dense_missing:
+                missing = np.isnan(x)
+                if missing.any():
+                    go_right[missing] = ~self.missing_left.take(nd[missing])
+            nxt = self.children.take(2 * nd + go_right)
+            node[active] = nxt
+            active = active[~self.is_leaf.take(nxt)]
+        return node.reshape(n_rows, n_trees)
+
+    def predict_proba_encoded(self, X: np.ndarray) -> np.ndarray:
+        leaves = self._leaves(X)
+        proba = np.zeros((X.shape[0], self.proba.shape[1]), dtype=np.float64)
+        # Accumulate tree by tree, in the same order as RandomForestClassifier
+        for t in range(leaves.shape[1]):
+            proba += self.proba[leaves[:, t]]
+        proba /= leaves.shape[1]
+        return proba
+
+    def predict_proba(self, df: pd.DataFrame) -> np.ndarray:
+        return self.predict_proba_encoded(self.encode_frame(df))
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        return self.classes_.take(np.argmax(self.predict_proba(df), axis=1))
+
+    def predict_proba_row(self, row: dict) -> np.ndarray:
+        return self.predict_proba_encoded(self.encode_row(row))[0]
+
+
+def compile_pipeline(pipeline, source_version: str = None) -> CompiledForest:
+    return CompiledForest(pipeline, source_version)
+
+
+_compiled = {}
+
+
+def get_compiled(name: str) -> CompiledForest:
+    """
+    Compiled form of model ``name``: the exported artifact if it was compiled from the
+    current ``.pkl`` contents, otherwise compiled in-process once per model version.
+    """
+    version = registry.version(name)
+    cached = _compiled.get(name)
+    if cached is not None and cached.source_version == version:
+        return cached
+
+    compiled = None
+    if registry.path(name + COMPILED_SUFFIX).exists():
+        exported = registry.get(name + COMPILED_SUFFIX)
+        if exported.source_version == version:
+            compiled = exported
+    if compiled is None:
+        compiled = compile_pipeline(registry.get(name), version)
+    _compiled[name] = compiled
+    return compiled
+
+
+def get_inference_model(name: str, rows: int = 1, backend: str = None):
+    """
+    The object to call ``predict_proba`` on for a batch of ``rows`` rows.
+
+    ``backend`` (default ``settings.ML_INFERENCE_BACKEND``) is "sklearn", "compiled" or
+    "auto". "auto" uses the compiled forest for small batches, where it avoids
+    sklearn's per-call overhead, and the sklearn pipeline for large ones, where its
+    C tree traversal is faster.
+    """
+    if backend is None:
+        backend = getattr(settings, "ML_INFERENCE_BACKEND", "auto")
+    if backend == "compiled" or (backend == "auto" and rows <= COMPILED_MAX_ROWS):
+        return get_compiled(name)
+    return registry.get(name)
+
+
+def predict_one(name: str, row: dict, backend: str = None) -> tuple:
+    """
+    ``(label, positive-class probability)`` for a single feature dict, from one forest pass.
+
+    With the compiled backend the dict is encoded straight into a feature vector;
+    the sklearn backend still goes through a one-row DataFrame. The label is the
+    argmax class, exactly what ``predict`` would return.
+    """
+    model = get_inference_model(name, rows=1, backend=backend)
+    if isinstance(model, CompiledForest):
+        proba = model.predict_proba_row(row)
+    else:
+        proba = model.predict_proba(pd.DataFrame([row]))[0]
+    classes = list(model.classes_)
+    return classes[int(np.argmax(proba))], float(proba[classes.index(1)])
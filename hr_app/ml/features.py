@@ -0,0 +1,33 @@
+"""
+Feature columns of the trained pipelines.
+
+Plain data with no heavy imports, so request code can describe or validate
+records without loading pandas or the models.
+"""
+
+# Feature columns expected by each pipeline, with the value used when the
+# uploaded file does not provide one.
+RETENTION_FEATURES = {
+    "Age": 0,
+    "MonthlyIncome": 0,
+    "YearsAtCompany": 0,
+    "JobRole": "",
+    "Department": "",
+    "EducationField": "",
+    "MaritalStatus": "",
+}
+
+PROMOTION_FEATURES = {
+    "city": "",
+    "city_development_index": 0.0,
+    "gender": "",
+    "relevent_experience": "",
+    "enrolled_university": "",
+    "education_level": "",
+    "major_discipline": "",
+    "experience": "",
+    "company_size": "",
+    "company_type": "",
+    "last_new_job": "",
+    "training_hours": 0,
+}
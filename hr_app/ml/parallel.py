@@ -0,0 +1,84 @@
+"""
+Multi-core batch scoring.
+
+The RandomForest pipelines are fitted without ``n_jobs``, so a single
+``predict_proba`` call uses one core. ParallelScorer fans chunks of a frame
+out to a pool of worker processes, each of which loads the models once
+through its own registry, and yields the results back in input order.
+Output is identical to serial ``score_chunk`` calls.
+"""
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from .registry import MODELS_DIR, get_model, registry
+from .scoring import DEFAULT_CHUNK_SIZE, score_chunk
+
+
+def _warm_up():
+    get_model("retention")
+    get_model("promotion")
+
+
+def _init_worker(models_dir):
+    registry.models_dir = Path(models_dir)
+    _warm_up()
+
+
+def _score_in_worker(chunk: pd.DataFrame) -> list:
+    return score_chunk(chunk, get_model("retention"), get_model("promotion"))
+
+
+class ParallelScorer:
+    """
+    ``with ParallelScorer(workers=8) as scorer: rows = scorer.score_frame(df)``
+    """
+
+    def __init__(self, workers: int, models_dir=MODELS_DIR):
+        self.workers = workers
+        self.models_dir = models_dir
+        self._pool = None
+
+    def __enter__(self):
+        # "spawn" keeps the children free of the parent's threads and DB connections
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(str(self.models_dir),),
+        )
+        return self
+
+    def __exit__(self, *exc):
+        self._pool.shutdown()
+        self._pool = None
+
+    def iter_score(self, chunks):
+        """
+        Score an iterable of DataFrame chunks, yielding each chunk's rows in order.
+        At most two chunks per worker are in flight, so memory stays bounded.
+        """
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(self._pool.submit(_score_in_worker, chunk))
+            if len(in_flight) >= 2 * self.workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+    def score_frame(self, df: pd.DataFrame, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list:
+        chunks = (df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size))
+        predictions = []
+        for rows in self.iter_score(chunks):
+            predictions.extend(rows)
+        return predictions
+
+    def warm(self):
+        """
+        Block until every worker has started and loaded the models.
+        """
+        for future in [self._pool.submit(_warm_up) for _ in range(self.workers)]:
+            future.result()
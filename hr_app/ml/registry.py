@@ -0,0 +1,146 @@
+"""
+Process-wide registry for the trained ML pipelines.
+
+Every artifact in ``hr_app/ml/models/`` is loaded at most once per process, on
+first use, and reloaded automatically when its ``.pkl`` file changes on disk.
+Arrays are memory-mapped read-only where joblib allows it so that workers can
+share the page cache instead of each holding a private copy. Model versions
+are content hashes, so copying, checking out or touching an artifact does not
+change its version.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MODELS_DIR = Path(__file__).resolve().parent / "models"
+
+
+def _rss_bytes():
+    """
+    Current resident set size of this process, or None where /proc is unavailable.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    def __init__(self, models_dir=MODELS_DIR):
+        self.models_dir = Path(models_dir)
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._versions = {}
+
+    def path(self, name: str) -> Path:
+        return self.models_dir / f"{name}.pkl"
+
+    def on_reload(self, callback):
+        """
+        Register ``callback(name)``, called whenever a model is (re)loaded.
+        """
+        self._listeners.append(callback)
+        return callback
+
+    def get(self, name: str):
+        """
+        Return the loaded model, loading or reloading it if the file changed.
+        """
+        path = self.path(name)
+        mtime = path.stat().st_mtime_ns
+        entry = self._entries.get(name)
+        if entry is not None and entry["mtime"] == mtime:
+            return entry["model"]
+
+        reloaded = False
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry["mtime"] != mtime:
+                entry = self._load(name, path, mtime)
+                self._entries[name] = entry
+                reloaded = True
+        if reloaded:
+            for callback in self._listeners:
+                callback(name)
+        return entry["model"]
+
+    def version(self, name: str) -> str:
+        """
+        Content identity of the artifact on disk. The file is hashed once per process
+        and again only when its stat changes; the model itself is never loaded.
+        """
+        path = self.path(name)
+        st = path.stat()
+        signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+        cached = self._versions.get(name)
+        if cached is None or cached[0] != signature:
+            cached = (signature, f"{name}@{file_sha256(path)[:16]}")
+            self._versions[name] = cached
+        return cached[1]
+
+    def _load(self, name, path, mtime):
+        import joblib
+
+        rss_before = _rss_bytes()
+        t0 = time.perf_counter()
+        try:
+            model = joblib.load(path, mmap_mode="r")
+            mmapped = True
+        except (ValueError, TypeError):
+            # Compressed or otherwise non-mappable pickle
+            model = joblib.load(path)
+            mmapped = False
+        load_seconds = time.perf_counter() - t0
+        rss_after = _rss_bytes()
+
+        entry = {
+            "model": model,
+            "mtime": mtime,
+            "path": str(path),
+            "file_bytes": path.stat().st_size,
+            "load_seconds": load_seconds,
+            "resident_bytes": rss_after - rss_before if rss_before is not None else None,
+            "mmapped": mmapped,
+            "loads": self._entries[name]["loads"] + 1 if name in self._entries else 1,
+        }
+        logger.info(
+            "Loaded model %s from %s in %.3fs (resident +%s bytes, mmap=%s)",
+            name, path, load_seconds, entry["resident_bytes"], mmapped,
+        )
+        return entry
+
+    def stats(self) -> dict:
+        """
+        Load time and memory footprint of every loaded model.
+        """
+        return {
+            name: {k: v for k, v in entry.items() if k != "model"}
+            for name, entry in self._entries.items()
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+registry = ModelRegistry()
+
+
+def get_model(name: str):
+    return registry.get(name)
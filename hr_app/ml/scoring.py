@@ -0,0 +1,83 @@
+"""
+Batch scoring for uploaded employee CSVs.
+
+Builds the retention and promotion feature frames for a whole chunk of rows
+at once and runs each pipeline a single time per chunk, instead of one
+``predict_proba`` call per row.
+"""
+import pandas as pd
+
+from .features import PROMOTION_FEATURES, RETENTION_FEATURES
+from .sentiment import label_texts
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def build_features(df: pd.DataFrame, features: dict) -> pd.DataFrame:
+    """
+    Select the model columns from ``df``, adding any missing ones with their default.
+    """
+    out = pd.DataFrame(index=df.index)
+    for col, default in features.items():
+        if col in df.columns:
+            out[col] = df[col].fillna(default)
+        else:
+            out[col] = default
+    return out
+
+
+def positive_proba(model, X: pd.DataFrame):
+    proba = model.predict_proba(X)
+    classes = list(model.classes_)
+    return proba[:, classes.index(1)]
+
+
+def score_chunk(df: pd.DataFrame, retention_model, promotion_model) -> list:
+    """
+    Score one chunk of rows with a single call per pipeline.
+    """
+    r_prob = positive_proba(retention_model, build_features(df, RETENTION_FEATURES))
+    p_prob = positive_proba(promotion_model, build_features(df, PROMOTION_FEATURES))
+
+    if "Feedback" in df.columns:
+        sentiments = label_texts(df["Feedback"].tolist())
+    else:
+        sentiments = ["Neutral"] * len(df)
+
+    if "EmployeeName" in df.columns:
+        names = df["EmployeeName"].fillna("Unknown").tolist()
+    else:
+        names = ["Unknown"] * len(df)
+
+    if "EmployeeNumber" in df.columns:
+        emp_ids = [None if pd.isna(v) else str(v).strip() for v in df["EmployeeNumber"]]
+    else:
+        emp_ids = [None] * len(df)
+
+    return [
+        {
+            "emp_id": emp_id,
+            "employee": name,
+            "retention": "High Risk" if rp >= 0.5 else "Stable",
+            "retention_prob": float(rp),
+            "promotion": "Eligible" if pp > 0.5 else "Not Eligible",
+            "promotion_prob": float(pp),
+            "sentiment": sentiment,
+        }
+        for emp_id, name, rp, pp, sentiment in zip(emp_ids, names, r_prob, p_prob, sentiments)
+    ]
+
+
+def iter_score_chunks(df: pd.DataFrame, retention_model, promotion_model, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Yield the scored rows of ``df`` one chunk at a time.
+    """
+    for start in range(0, len(df), chunk_size):
+        yield score_chunk(df.iloc[start:start + chunk_size], retention_model, promotion_model)
+
+
+def score_frame(df: pd.DataFrame, retention_model, promotion_model, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list:
+    predictions = []
+    for chunk in iter_score_chunks(df, retention_model, promotion_model, chunk_size):
+        predictions.extend(chunk)
+    return predictions
@@ -0,0 +1,66 @@
+"""
+Sentiment labelling for feedback text.
+
+TextBlob's pattern analyzer is slow, so polarities are memoized by a hash of
+the text and batches analyse each distinct text only once.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+from ..profiling import phase
+
+MEMO_MAXSIZE = 50000
+
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def sentiment_label(polarity: float) -> str:
+    if polarity > 0.1:
+        return "Positive"
+    if polarity < -0.1:
+        return "Negative"
+    return "Neutral"
+
+
+def text_hash(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def polarity(text: str) -> float:
+    key = text_hash(text)
+    with _memo_lock:
+        if key in _memo:
+            _memo.move_to_end(key)
+            return _memo[key]
+
+    from textblob import TextBlob  # imports NLTK; deferred until the first analysis
+
+    with phase("sentiment"):
+        value = TextBlob(text).sentiment.polarity
+    with _memo_lock:
+        _memo[key] = value
+        while len(_memo) > MEMO_MAXSIZE:
+            _memo.popitem(last=False)
+    return value
+
+
+def label_text(text) -> str:
+    if not isinstance(text, str) or not text:
+        return "Neutral"
+    return sentiment_label(polarity(text))
+
+
+def label_texts(texts) -> list:
+    """
+    Label a batch of texts, analysing every distinct text only once.
+    """
+    labels = {}
+    out = []
+    for text in texts:
+        key = text if isinstance(text, str) else ""
+        if key not in labels:
+            labels[key] = label_text(key)
+        out.append(labels[key])
+    return out
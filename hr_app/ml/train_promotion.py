@@ -1,55 +0,0 @@
-import pandas as pd
-import joblib
-from sklearn.model_selection import train_test_split
-from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder
-from sklearn.compose import ColumnTransformer
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.impute import SimpleImputer
-
-# Load data
-df = pd.read_csv("data/promotion_train.csv")
-
-# Features & target
-X = df.drop(columns=["target", "enrollee_id"])
-y = df["target"]
-
-# Identify numeric and categorical columns
-num_cols = X.select_dtypes(include=["int64", "float64"]).columns
-cat_cols = X.select_dtypes(include=["object"]).columns
-
-# Transformers with imputers
-numeric_transformer = Pipeline(steps=[
-    ("imputer", SimpleImputer(strategy="median"))
-])
-
-categorical_transformer = Pipeline(steps=[
-    ("imputer", SimpleImputer(strategy="most_frequent")),
-    ("onehot", OneHotEncoder(handle_unknown="ignore"))
-])
-
-preprocessor = ColumnTransformer(
-    transformers=[
-        ("num", numeric_transformer, num_cols),
-        ("cat", categorical_transformer, cat_cols)
-    ]
-)
-
-# Final pipeline
-pipe = Pipeline(steps=[
-    ("preprocessor", preprocessor),
-    ("clf", RandomForestClassifier(n_estimators=200, random_state=42))
-])
-
-# Train/test split
-X_tr, X_te, y_tr, y_te = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
-
-# Train
-pipe.fit(X_tr, y_tr)
-
-# Save model
-joblib.dump(pipe, "hr_app/ml/models/promotion.pkl")
-
-print("✅ Promotion model trained and saved successfully!")
-print("Train accuracy:", pipe.score(X_tr, y_tr))
-print("Test accuracy:", pipe.score(X_te, y_te))
@@ -0,0 +1,210 @@
+"""
+Training for the promotion and retention pipelines.
+
+Each model is described by a TrainingSpec: which CSV columns to read and with
+which dtypes (categoricals as ``category``, numerics as compact ints/floats),
+how to derive the target, and how to build the pipeline. ``train_model`` fits
+with ``n_jobs`` worker threads, writes ``<name>.pkl`` atomically (the registry
+never sees a half-written file) and records a ``<name>.meta.json`` next to it.
+``train_model_isolated`` runs it in a fresh process, so the recorded peak
+memory belongs to that model alone.
+sklearn and pandas are only imported to train, so reading metadata stays cheap.
+"""
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from .registry import MODELS_DIR, file_sha256
+
+DATA_DIR = Path(__file__).resolve().parent.parent.parent / "data"
+METADATA_SUFFIX = ".meta.json"
+
+
+@dataclass
+class TrainingSpec:
+    data_file: str
+    numeric: dict          # column -> compact dtype
+    categorical: list
+    target: str
+    build: Callable         # build(numeric_cols, categorical_cols, n_jobs) -> Pipeline
+    target_map: dict = None
+    column_order: list = None  # feature order the pipeline expects, if not numeric + categorical
+
+    @property
+    def features(self) -> list:
+        return self.column_order or list(self.numeric) + self.categorical
+
+    def load(self, path: Path) -> tuple:
+        import pandas as pd
+
+        dtypes = {**self.numeric, **{col: "category" for col in self.categorical}}
+        df = pd.read_csv(
+            path, usecols=self.features + [self.target], dtype=dtypes, encoding="utf-8-sig",
+        )
+        y = df.pop(self.target)
+        if self.target_map is not None:
+            y = y.map(self.target_map)
+        # Category columns go through the imputers/encoders as plain strings
+        X = df[self.features].astype({col: object for col in self.categorical})
+        return X, y.astype("int8")
+
+
+def _promotion_pipeline(numeric, categorical, n_jobs):
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.impute import SimpleImputer
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder
+
+    preprocessor = ColumnTransformer(transformers=[
+        ("num", Pipeline(steps=[("imputer", SimpleImputer(strategy="median"))]), numeric),
+        ("cat", Pipeline(steps=[
+            ("imputer", SimpleImputer(strategy="most_frequent")),
+            ("onehot", OneHotEncoder(handle_unknown="ignore")),
+        ]), categorical),
+    ])
+    return Pipeline(steps=[
+        ("preprocessor", preprocessor),
+        ("clf", RandomForestClassifier(n_estimators=200, random_state=42, n_jobs=n_jobs)),
+    ])
+
+
+def _retention_pipeline(numeric, categorical, n_jobs):
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    preprocess = ColumnTransformer(transformers=[
+        ("num", StandardScaler(), numeric),
+        ("cat", OneHotEncoder(handle_unknown="ignore"), categorical),
+    ])
+    model = RandomForestClassifier(n_estimators=300, random_state=42, class_weight="balanced", n_jobs=n_jobs)
+    return Pipeline(steps=[("prep", preprocess), ("clf", model)])
+
+
+SPECS = {
+    "promotion": TrainingSpec(
+        data_file="promotion_train.csv",
+        numeric={"city_development_index": "float32", "training_hours": "float32"},
+        categorical=["city", "gender", "relevent_experience", "enrolled_university", "education_level",
+                     "major_discipline", "experience", "company_size", "company_type", "last_new_job"],
+        target="target",
+        build=_promotion_pipeline,
+        column_order=["city", "city_development_index", "gender", "relevent_experience",
+                      "enrolled_university", "education_level", "major_discipline", "experience",
+                      "company_size", "company_type", "last_new_job", "training_hours"],
+    ),
+    "retention": TrainingSpec(
+        data_file="retention.csv",
+        numeric={"Age": "int16", "MonthlyIncome": "int32", "YearsAtCompany": "int16"},
+        categorical=["JobRole", "Department", "EducationField", "MaritalStatus"],
+        target="Attrition",
+        build=_retention_pipeline,
+        target_map={"Yes": 1, "No": 0},
+    ),
+}
+
+
+def _peak_rss_bytes():
+    """
+    Peak resident set size of this process so far, or None where unavailable.
+    A process-wide high-water mark: it only describes one model when that model
+    is the only thing the process trained (see ``train_model_isolated``).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def atomic_write(target: Path, write):
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, target)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def metadata_path(name: str, models_dir=MODELS_DIR) -> Path:
+    return Path(models_dir) / f"{name}{METADATA_SUFFIX}"
+
+
+def train_model(name: str, data_path=None, n_jobs: int = -1, test_size: float = 0.2,
+                models_dir=MODELS_DIR) -> dict:
+    """
+    Train model ``name``, replace its artifact atomically and return the metadata written.
+    """
+    import joblib
+    import sklearn
+    from sklearn.model_selection import train_test_split
+
+    spec = SPECS[name]
+    data_path = Path(data_path) if data_path else DATA_DIR / spec.data_file
+    models_dir = Path(models_dir)
+    models_dir.mkdir(parents=True, exist_ok=True)
+
+    t0 = time.perf_counter()
+    X, y = spec.load(data_path)
+    load_seconds = time.perf_counter() - t0
+
+    X_tr, X_te, y_tr, y_te = train_test_split(X, y, test_size=test_size, random_state=42, stratify=y)
+    pipe = spec.build(list(spec.numeric), spec.categorical, n_jobs)
+    t0 = time.perf_counter()
+    pipe.fit(X_tr, y_tr)
+    train_seconds = time.perf_counter() - t0
+    # Inference in web workers is single-threaded; don't ship a pipeline that spawns threads
+    pipe.set_params(**{f"{pipe.steps[-1][0]}__n_jobs": None})
+
+    trained_at = datetime.now(timezone.utc)
+    metadata = {
+        "model": name,
+        "version": trained_at.strftime("%Y%m%dT%H%M%SZ"),
+        "trained_at": trained_at.isoformat(),
+        "data": {"path": str(data_path), "sha256": file_sha256(data_path), "rows": len(X)},
+        "n_jobs": n_jobs,
+        "load_seconds": round(load_seconds, 3),
+        "train_seconds": round(train_seconds, 3),
+        "peak_memory_bytes": _peak_rss_bytes(),
+        "train_accuracy": round(float(pipe.score(X_tr, y_tr)), 4),
+        "test_accuracy": round(float(pipe.score(X_te, y_te)), 4),
+        "test_rows": len(X_te),
+        "sklearn_version": sklearn.__version__,
+    }
+
+    artifact = models_dir / f"{name}.pkl"
+    atomic_write(artifact, lambda tmp: joblib.dump(pipe, tmp))
+    metadata["artifact_bytes"] = artifact.stat().st_size
+    atomic_write(
+        metadata_path(name, models_dir),
+        lambda tmp: tmp.write_text(json.dumps(metadata, indent=2)),
+    )
+    return metadata
+
+
+def train_model_isolated(name: str, **kwargs) -> dict:
+    """
+    ``train_model`` in a freshly spawned process, so ``peak_memory_bytes`` is not
+    inflated by models trained earlier in the caller's process.
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(train_model, name, **kwargs).result()
+
+
+def read_metadata(name: str, models_dir=MODELS_DIR) -> dict:
+    try:
+        return json.loads(metadata_path(name, models_dir).read_text())
+    except (OSError, ValueError):
+        return {}
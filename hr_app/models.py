@@ -12,6 +12,8 @@ class Profile(models.Model):
     )
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="profile")
     role = models.CharField(max_length=16, choices=ROLE_CHOICES, default="employee")
+    # Denormalized count of unread received messages, maintained by hr_app.messaging
+    unread_messages = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return f"{self.user.username} ({self.get_role_display()})"
@@ -77,6 +79,30 @@ class Prediction(models.Model):
         return f"{self.employee.emp_id} {self.kind}={self.result} ({self.probability})"
 
 
+class LatestPrediction(models.Model):
+    """
+    Most recent prediction per (employee, kind), maintained alongside the
+    Prediction history so dashboards never scan the history table.
+    """
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name="latest_predictions")
+    kind = models.CharField(max_length=20, choices=Prediction.PREDICTION_KIND)
+    prediction = models.ForeignKey(Prediction, on_delete=models.CASCADE, related_name="+")
+    result = models.CharField(max_length=20)
+    probability = models.FloatField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["employee", "kind"], name="uniq_latest_prediction"),
+        ]
+        indexes = [
+            models.Index(fields=["kind", "result"]),
+        ]
+
+    def __str__(self):
+        return f"{self.employee.emp_id} latest {self.kind}={self.result} ({self.probability})"
+
+
 # ——————————————————————————————————————————
 # Feedback + Sentiment
 # ——————————————————————————————————————————
@@ -85,6 +111,7 @@ class Feedback(models.Model):
         ("Positive", "Positive"),
         ("Neutral", "Neutral"),
         ("Negative", "Negative"),
+        ("Pending", "Pending"),  # saved, not yet scored (see feedback.py)
     )
     employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name="feedbacks")
     text = models.TextField()
@@ -93,6 +120,10 @@ class Feedback(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["sentiment", "-created_at", "-id"]),
+            models.Index(fields=["employee", "-created_at", "-id"]),
+        ]
 
     def __str__(self):
         return f"Feedback({self.employee.emp_id}, {self.sentiment})"
@@ -111,6 +142,11 @@ class Message(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Inbox pages (keyset on created_at, id) and unread-only listings
+            models.Index(fields=["receiver", "-created_at", "-id"]),
+            models.Index(fields=["receiver", "is_read", "-created_at"]),
+        ]
 
     def __str__(self):
         return f"Msg {self.id} {self.sender}→{self.receiver}: {self.subject[:25]}"
@@ -138,6 +174,7 @@ class LeaveRequest(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["status"]),
+            models.Index(fields=["-created_at", "-id"]),
         ]
 
     def __str__(self):
@@ -155,3 +192,50 @@ class LeaveRequest(models.Model):
         if self.start_date < timezone.now().date() and self.status == "Pending":
             # Allow backdated requests if you want; this just warns in admin
             pass
+
+
+# ——————————————————————————————————————————
+# Background Jobs (processed by `manage.py run_worker`)
+# ——————————————————————————————————————————
+class Job(models.Model):
+    KIND = (
+        ("csv_predict", "CSV Prediction"),
+        ("broadcast", "Department Broadcast"),
+        ("score_feedback", "Feedback Sentiment"),
+    )
+    STATUS = (
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    )
+    kind = models.CharField(max_length=30, choices=KIND)
+    status = models.CharField(max_length=10, choices=STATUS, default="queued")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name="jobs"
+    )
+    filename = models.CharField(max_length=255, blank=True, default="")
+    payload = models.BinaryField()
+    result = models.BinaryField(null=True, blank=True)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"Job {self.id} {self.kind} ({self.status} {self.processed}/{self.total})"
+
+    @property
+    def percent(self) -> int:
+        if self.status == "done":
+            return 100
+        return int(self.processed * 100 / self.total) if self.total else 0
@@ -0,0 +1,33 @@
+"""
+Bounded thread pool for CPU-bound work called from async views.
+
+``await run_cpu(fn, ...)`` runs model inference or TextBlob analysis on at
+most ``settings.CPU_WORKERS`` threads, so the event loop keeps serving other
+requests meanwhile and a burst of predictions queues up instead of starting
+one thread each. The caller's context variables (the request profile) are
+carried into the worker thread.
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.CPU_WORKERS, thread_name_prefix="hr-cpu")
+        return _executor
+
+
+async def run_cpu(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(), call)
@@ -0,0 +1,172 @@
+"""
+Cursor (keyset) pagination.
+
+Cursors are opaque, URL-safe encodings of the ordering values of the first or
+last row on a page. Fetching the next (or previous) page is then an indexed
+range scan (``WHERE (a, b) > (x, y) ORDER BY a, b LIMIT n``) instead of
+``COUNT(*)`` plus ``OFFSET``, so page N costs the same as page 1.
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def page_size(value, default=DEFAULT_PAGE_SIZE) -> int:
+    try:
+        return max(1, min(int(value), MAX_PAGE_SIZE))
+    except (TypeError, ValueError):
+        return default
+
+
+def carried_query(request) -> str:
+    """
+    The request's query string without cursor parameters, for building page links.
+    """
+    params = request.GET.copy()
+    params.pop("after", None)
+    params.pop("before", None)
+    return params.urlencode()
+
+
+def _encode(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _decode(cursor: str):
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """
+    Paginate ``queryset`` by the unique ``ordering`` (e.g. ``("-created_at", "-id")``).
+    The last ordering field must be unique so every row has a distinct position.
+    """
+
+    def __init__(self, queryset, ordering=("-created_at", "-id"), per_page=DEFAULT_PAGE_SIZE):
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.per_page = per_page
+        self.fields = [o.lstrip("-") for o in self.ordering]
+        self.descending = [o.startswith("-") for o in self.ordering]
+        opts = queryset.model._meta
+        self._model_fields = [opts.pk if f in ("id", "pk") else opts.get_field(f) for f in self.fields]
+
+    def _cursor(self, obj) -> str:
+        return _encode([
+            field.value_to_string(obj) for field in self._model_fields
+        ])
+
+    def _position(self, cursor: str):
+        values = _decode(cursor)
+        if values is None or len(values) != len(self.fields):
+            return None
+        try:
+            return [field.to_python(v) for field, v in zip(self._model_fields, values)]
+        except (ValidationError, TypeError, ValueError):
+            return None
+
+    def _after(self, values, reverse=False) -> Q:
+        """
+        Rows strictly after ``values`` in the ordering (or before, if ``reverse``).
+        """
+        condition = Q()
+        for i, field in enumerate(self.fields):
+            desc = self.descending[i] != reverse
+            step = Q(**{f"{field}__{'lt' if desc else 'gt'}": values[i]})
+            for prev_field, prev_value in zip(self.fields[:i], values[:i]):
+                step &= Q(**{prev_field: prev_value})
+            condition |= step
+        return condition
+
+    def page(self, after: str = None, before: str = None) -> KeysetPage:
+        n = self.per_page
+        after_pos = self._position(after)
+        before_pos = self._position(before) if after_pos is None else None
+
+        if before_pos is not None:
+            reversed_ordering = [o[1:] if o.startswith("-") else f"-{o}" for o in self.ordering]
+            rows = list(self.queryset.filter(self._after(before_pos, reverse=True)).order_by(*reversed_ordering)[:n + 1])
+            has_more = len(rows) > n
+            rows = rows[:n][::-1]
+            return KeysetPage(
+                rows,
+                next_cursor=self._cursor(rows[-1]) if rows else None,
+                previous_cursor=self._cursor(rows[0]) if rows and has_more else None,
+            )
+
+        queryset = self.queryset.order_by(*self.ordering)
+        if after_pos is not None:
+            queryset = queryset.filter(self._after(after_pos))
+        rows = list(queryset[:n + 1])
+        has_more = len(rows) > n
+        rows = rows[:n]
+        return KeysetPage(
+            rows,
+            next_cursor=self._cursor(rows[-1]) if rows and has_more else None,
+            previous_cursor=self._cursor(rows[0]) if rows and after_pos is not None else None,
+        )
+
+
+class ListPaginator:
+    """
+    Same interface as KeysetPaginator for short, already-ordered lists (e.g. ranked search hits).
+    """
+
+    def __init__(self, items, per_page=DEFAULT_PAGE_SIZE):
+        self.items = list(items)
+        self.per_page = per_page
+
+    @staticmethod
+    def _offset(cursor: str):
+        values = _decode(cursor)
+        if not values or not isinstance(values[0], int) or values[0] < 0:
+            return None
+        return values[0]
+
+    def page(self, after: str = None, before: str = None) -> KeysetPage:
+        n = self.per_page
+        after_pos, before_pos = self._offset(after), self._offset(before)
+        if after_pos is not None:
+            start = after_pos + 1
+        elif before_pos is not None:
+            start = max(before_pos - n, 0)
+        else:
+            start = 0
+        end = min(start + n, len(self.items))
+        return KeysetPage(
+            self.items[start:end],
+            next_cursor=_encode([end - 1]) if end < len(self.items) else None,
+            previous_cursor=_encode([start]) if start > 0 else None,
+        )
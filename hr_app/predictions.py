@@ -0,0 +1,80 @@
+"""
+Persistence of batch predictions.
+
+Every scored row is appended to the Prediction history with ``bulk_create``
+and the matching LatestPrediction row is upserted, so "current" lookups are a
+single indexed read on ``(employee, kind)``.
+"""
+from django.db import transaction
+
+from .kpis import invalidate_kpis
+from .models import Employee, LatestPrediction, Prediction
+
+PERSIST_BATCH_SIZE = 1000
+
+# Prediction kind -> (label key, probability key, label counted as positive)
+SCORED_KINDS = {
+    "retention": ("retention", "retention_prob", "High Risk"),
+    "promotion": ("promotion", "promotion_prob", "Eligible"),
+}
+
+
+def save_predictions(results) -> int:
+    """
+    Persist scored rows (as returned by ``ml.scoring.score_frame``) for known employees.
+    Returns the number of Prediction rows written.
+    """
+    emp_ids = {r["emp_id"] for r in results if r.get("emp_id")}
+    if not emp_ids:
+        return 0
+
+    written = 0
+    with transaction.atomic():
+        employees = dict(Employee.objects.filter(emp_id__in=emp_ids).values_list("emp_id", "id"))
+        history = []
+        for r in results:
+            employee_id = employees.get(r.get("emp_id"))
+            if employee_id is None:
+                continue
+            for kind, (label_key, prob_key, positive) in SCORED_KINDS.items():
+                history.append(Prediction(
+                    employee_id=employee_id,
+                    kind=kind,
+                    result="1" if r[label_key] == positive else "0",
+                    probability=r[prob_key],
+                ))
+        Prediction.objects.bulk_create(history, batch_size=PERSIST_BATCH_SIZE)
+        written = len(history)
+
+        # Later rows for the same employee win, matching the history order.
+        latest = {}
+        for p in history:
+            latest[(p.employee_id, p.kind)] = LatestPrediction(
+                employee_id=p.employee_id,
+                kind=p.kind,
+                prediction_id=p.pk,
+                result=p.result,
+                probability=p.probability,
+            )
+        LatestPrediction.objects.bulk_create(
+            list(latest.values()),
+            batch_size=PERSIST_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["employee", "kind"],
+            update_fields=["prediction", "result", "probability", "updated_at"],
+        )
+    # bulk writes bypass the post_save signals
+    invalidate_kpis()
+    return written
+
+
+def latest_prediction(employee, kind: str):
+    if employee is None:
+        return None
+    return LatestPrediction.objects.filter(employee=employee, kind=kind).first()
+
+
+async def alatest_prediction(employee, kind: str):
+    if employee is None:
+        return None
+    return await LatestPrediction.objects.filter(employee=employee, kind=kind).afirst()
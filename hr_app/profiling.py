@@ -0,0 +1,180 @@
+"""
+Per-request profiling.
+
+ProfilingMiddleware times each request and splits it into phases:
+
+* ``db`` – every SQL query, counted and timed by an execute wrapper installed on
+  the connection of the thread handling the request (``install_query_recorder``);
+* ``template`` – template rendering (ProfiledDjangoTemplates backend), which
+  includes any queries that lazy querysets run while rendering;
+* any phase that code marks with ``with phase("inference"):`` or ``@phase("sentiment")``.
+
+With ``settings.SERVER_TIMING`` on (the default only under DEBUG) the
+breakdown is sent back in a ``Server-Timing`` header, visible in the
+browser's network panel. Requests slower than ``settings.SLOW_REQUEST_MS``
+are logged with it. Streaming bodies (CSV exports) are produced after the
+middleware returns, so only their set-up is measured. The middleware runs
+natively in both the WSGI and the ASGI stack. Outside a request
+(management commands, worker threads) ``phase`` does nothing.
+"""
+import contextvars
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connection
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar("hr_app_request_profile", default=None)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = defaultdict(float)  # name -> seconds
+        self.queries = 0
+        self.total = None
+
+    def record_query(self, execute, sql, params, many, context):
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.phases["db"] += time.perf_counter() - t0
+            self.queries += 1
+
+    def finish(self):
+        self.total = time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        metrics = []
+        for name, seconds in self.phases.items():
+            desc = f';desc="{self.queries} queries"' if name == "db" else ""
+            metrics.append(f"{name};dur={seconds * 1000:.1f}{desc}")
+        metrics.append(f"total;dur={self.total * 1000:.1f}")
+        return ", ".join(metrics)
+
+    def summary(self) -> str:
+        parts = [f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases.items()]
+        return f"{self.queries} queries; " + ", ".join(parts) if parts else f"{self.queries} queries"
+
+
+def _record_query(execute, sql, params, many, context):
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    return profile.record_query(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection):
+    """
+    Make ``connection`` report its queries to the current request's profile.
+    """
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _on_request_started(**kwargs):
+    # Connections are per thread. Under ASGI this receiver runs in the thread that
+    # will also run the request's async ORM queries, which the middleware never sees.
+    install_query_recorder(connection)
+
+
+def current_profile():
+    """
+    The RequestProfile of the request being handled, or None.
+    """
+    return _current.get()
+
+
+@contextmanager
+def phase(name: str):
+    """
+    Attribute the time spent in the block (or decorated function) to ``name``.
+    """
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.phases[name] += time.perf_counter() - t0
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        request_started.connect(_on_request_started, dispatch_uid="hr_app.profiling")
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        install_query_recorder(connection)
+        profile = RequestProfile()
+        token = _current.set(profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.report(request, response, profile)
+
+    async def __acall__(self, request):
+        profile = RequestProfile()
+        token = _current.set(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.report(request, response, profile)
+
+    def report(self, request, response, profile: RequestProfile):
+        profile.finish()
+        if getattr(settings, "SERVER_TIMING", False):
+            response["Server-Timing"] = profile.server_timing()
+        budget_ms = getattr(settings, "SLOW_REQUEST_MS", 500)
+        if budget_ms is not None and profile.total * 1000 > budget_ms:
+            logger.warning(
+                "Slow request: %s %s took %.0fms (budget %sms; %s)",
+                request.method, request.get_full_path(), profile.total * 1000, budget_ms, profile.summary(),
+            )
+        return response
+
+
+# ——————————————————————————————————————
+# Template rendering
+# ——————————————————————————————————————
+class ProfiledTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        with phase("template"):
+            return self.template.render(context, request)
+
+
+class ProfiledDjangoTemplates(DjangoTemplates):
+    """
+    The Django template engine, with rendering time reported as the "template" phase.
+    """
+
+    def from_string(self, template_code):
+        return ProfiledTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return ProfiledTemplate(super().get_template(template_name))
@@ -0,0 +1,137 @@
+"""
+Ranked employee search over emp_id, name, department, job title and location.
+
+The search representation is maintained by the database itself (see migration
+0004_employee_search):
+
+* SQLite: an external-content FTS5 table kept in sync by triggers, ranked by bm25.
+  SQLite migrations that remake ``hr_app_employee`` silently drop these
+  triggers, so ``ensure_sqlite_triggers`` recreates any missing ones (and
+  rebuilds the index) after every ``migrate``.
+* PostgreSQL: GIN indexes on a ``to_tsvector`` expression and on the same
+  document with ``gin_trgm_ops``, ranked by ``ts_rank`` then trigram similarity.
+
+Other backends fall back to an (unindexed) ``icontains`` scan.
+"""
+import re
+
+from django.db import OperationalError, connection, connections
+from django.db.models import Q
+
+from .models import Employee
+
+SEARCH_LIMIT = 200
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_SQLITE_SQL = """
+    SELECT rowid FROM hr_app_employee_fts
+    WHERE hr_app_employee_fts MATCH %s
+    ORDER BY rank
+    LIMIT %s
+"""
+
+# Must match the indexed expressions in migration 0004 exactly.
+_PG_DOCUMENT = (
+    "(emp_id || ' ' || name || ' ' || department || ' ' || job_title || ' ' || location)"
+)
+_PG_SQL = f"""
+    SELECT id FROM hr_app_employee
+    WHERE to_tsvector('simple', {_PG_DOCUMENT}) @@ to_tsquery('simple', %s)
+       OR {_PG_DOCUMENT} %% %s
+    ORDER BY ts_rank(to_tsvector('simple', {_PG_DOCUMENT}), to_tsquery('simple', %s)) DESC,
+             similarity({_PG_DOCUMENT}, %s) DESC
+    LIMIT %s
+"""
+
+# Same triggers as migration 0004_employee_search
+_FTS_FIELDS = "emp_id, name, department, job_title, location"
+_FTS_NEW = "new.id, new.emp_id, new.name, new.department, new.job_title, new.location"
+_FTS_OLD = "old.id, old.emp_id, old.name, old.department, old.job_title, old.location"
+SQLITE_TRIGGERS = {
+    "hr_app_employee_fts_ai": f"""
+        CREATE TRIGGER IF NOT EXISTS hr_app_employee_fts_ai AFTER INSERT ON hr_app_employee BEGIN
+            INSERT INTO hr_app_employee_fts(rowid, {_FTS_FIELDS}) VALUES ({_FTS_NEW});
+        END""",
+    "hr_app_employee_fts_ad": f"""
+        CREATE TRIGGER IF NOT EXISTS hr_app_employee_fts_ad AFTER DELETE ON hr_app_employee BEGIN
+            INSERT INTO hr_app_employee_fts(hr_app_employee_fts, rowid, {_FTS_FIELDS}) VALUES ('delete', {_FTS_OLD});
+        END""",
+    "hr_app_employee_fts_au": f"""
+        CREATE TRIGGER IF NOT EXISTS hr_app_employee_fts_au AFTER UPDATE ON hr_app_employee BEGIN
+            INSERT INTO hr_app_employee_fts(hr_app_employee_fts, rowid, {_FTS_FIELDS}) VALUES ('delete', {_FTS_OLD});
+            INSERT INTO hr_app_employee_fts(rowid, {_FTS_FIELDS}) VALUES ({_FTS_NEW});
+        END""",
+}
+
+
+def ensure_sqlite_triggers(using: str = "default") -> list:
+    """
+    Recreate the FTS sync triggers a table rebuild dropped, then rebuild the index from
+    ``hr_app_employee``. Returns the names of the recreated triggers.
+    """
+    conn = connections[using]
+    if conn.vendor != "sqlite":
+        return []
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE name = 'hr_app_employee_fts' OR type = 'trigger'")
+        existing = {name for (name,) in cursor.fetchall()}
+        if "hr_app_employee_fts" not in existing:
+            # Not migrated yet (or an SQLite build without FTS5): nothing to keep in sync
+            return []
+        missing = [name for name in SQLITE_TRIGGERS if name not in existing]
+        for name in missing:
+            cursor.execute(SQLITE_TRIGGERS[name])
+        if missing:
+            cursor.execute("INSERT INTO hr_app_employee_fts(hr_app_employee_fts) VALUES ('rebuild')")
+    return missing
+
+
+def _tokens(query: str) -> list:
+    return _TOKEN_RE.findall(query.lower())
+
+
+def _ranked_ids(tokens: list, query: str, limit: int):
+    """
+    Matching employee ids in rank order, or None if no index is available.
+    """
+    if connection.vendor == "sqlite":
+        # Every token must match, as a prefix, in any column
+        match = " ".join(f'"{t}"*' for t in tokens)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(_SQLITE_SQL, [match, limit])
+                return [row[0] for row in cursor.fetchall()]
+        except OperationalError:
+            # SQLite build without FTS5, or the index has not been migrated
+            return None
+    if connection.vendor == "postgresql":
+        tsquery = " & ".join(f"{t}:*" for t in tokens)
+        with connection.cursor() as cursor:
+            cursor.execute(_PG_SQL, [tsquery, query, tsquery, query, limit])
+            return [row[0] for row in cursor.fetchall()]
+    return None
+
+
+def _scan(tokens: list, limit: int) -> list:
+    queryset = Employee.objects.all()
+    for t in tokens:
+        queryset = queryset.filter(
+            Q(emp_id__icontains=t) | Q(name__icontains=t) | Q(department__icontains=t)
+            | Q(job_title__icontains=t) | Q(location__icontains=t)
+        )
+    return list(queryset[:limit])
+
+
+def search_employees(query: str, limit: int = SEARCH_LIMIT) -> list:
+    """
+    Employees matching every word of ``query`` in any directory field, best match first.
+    """
+    tokens = _tokens(query)
+    if not tokens:
+        return []
+    ids = _ranked_ids(tokens, query, limit)
+    if ids is None:
+        return _scan(tokens, limit)
+    by_id = Employee.objects.in_bulk(ids)
+    return [by_id[pk] for pk in ids if pk in by_id]
@@ -1,14 +1,40 @@
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models.signals import post_migrate, post_save, post_delete, pre_delete
 from django.dispatch import receiver
-from .models import Profile
+from .kpis import invalidate_kpis
+from .messaging import discount_unread
+from .search import ensure_sqlite_triggers
+from .models import Profile, Employee, Feedback, LeaveRequest, Message, Prediction, LatestPrediction
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
-def create_profile_for_user(sender, instance, created, **kwargs):
-    if created:
+def create_profile_for_user(sender, instance, created, raw=False, **kwargs):
+    # Only new users need a profile; later saves (e.g. last_login on every login) touch nothing
+    if created and not raw:
         Profile.objects.get_or_create(user=instance)
 
-@receiver(post_save, sender=settings.AUTH_USER_MODEL)
-def save_profile_for_user(sender, instance, **kwargs):
-    Profile.objects.get_or_create(user=instance)
-    instance.profile.save()
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def discount_unread_of_deleted_sender(sender, instance, **kwargs):
+    # The cascade fast-deletes this user's sent messages; take the unread ones off their receivers' counters first
+    discount_unread(Message.objects.filter(sender=instance))
+
+
+# Drop the cached dashboard KPI snapshot whenever a counted table changes.
+# Deletes are only watched on Employee: a delete receiver on the child tables
+# would stop Django from fast-deleting them when an employee is removed.
+# Direct deletes of child rows fall back to the snapshot TTL.
+KPI_MODELS = (Employee, Feedback, LeaveRequest, Prediction, LatestPrediction)
+
+def invalidate_kpi_snapshot(sender, **kwargs):
+    invalidate_kpis()
+
+for model in KPI_MODELS:
+    post_save.connect(invalidate_kpi_snapshot, sender=model, dispatch_uid=f"kpi_save_{model.__name__}")
+post_delete.connect(invalidate_kpi_snapshot, sender=Employee, dispatch_uid="kpi_delete_Employee")
+
+
+@receiver(post_migrate, dispatch_uid="hr_app_employee_fts_triggers")
+def restore_search_triggers(sender, using="default", **kwargs):
+    # A migration that rebuilds hr_app_employee on SQLite drops the FTS sync triggers
+    if sender.name == "hr_app":
+        ensure_sqlite_triggers(using)
@@ -0,0 +1,47 @@
+"""
+Streaming responses that stay streamed under both WSGI and ASGI.
+
+Under ASGI Django cannot iterate a synchronous body from the event loop, so
+it collects the whole iterator into a list first (with a "must consume
+synchronous iterators" warning), and large exports and scoring batches would
+be built in memory again. ``streaming_response`` keeps the plain iterator for
+WSGI requests and, for ASGI requests, wraps it in an async generator that
+advances it in blocks of about ``BLOCK_SIZE`` characters through
+``sync_to_async``. The calls are thread-sensitive, so a queryset
+``.iterator()`` keeps its cursor on one connection.
+"""
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+BLOCK_SIZE = 64 * 1024
+
+
+def _next_block(iterator, size: int) -> list:
+    parts, length = [], 0
+    for part in iterator:
+        parts.append(part)
+        length += len(part)
+        if length >= size:
+            break
+    return parts
+
+
+async def _async_body(chunks, size: int):
+    iterator = iter(chunks)
+    next_block = sync_to_async(_next_block, thread_sensitive=True)
+    while True:
+        parts = await next_block(iterator, size)
+        if not parts:
+            return
+        yield parts[0][:0].join(parts)
+
+
+def streaming_response(request, chunks, **kwargs) -> StreamingHttpResponse:
+    """
+    ``StreamingHttpResponse(chunks, **kwargs)``, with an async body when ``request``
+    (a Django or DRF request) came through ASGI.
+    """
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        return StreamingHttpResponse(_async_body(chunks, BLOCK_SIZE), **kwargs)
+    return StreamingHttpResponse(chunks, **kwargs)
@@ -1,3 +1,883 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import date, datetime, timezone as dt_timezone
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import joblib
+import numpy as np
+import pandas as pd
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import AsyncClient, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import api, importers, jobs, kpis, leave, messaging, search, signals
+from .ml import cache as ml_cache, training
+from .ml.compiled import compile_pipeline, predict_one
+from .ml.parallel import ParallelScorer
+from .ml.registry import ModelRegistry
+from .ml.scoring import score_chunk
+from .models import Employee, Feedback, Job, LatestPrediction, LeaveRequest, Message, Prediction, Profile
+from .pagination import KeysetPaginator
+
+
+def make_employee(emp_id="E1", **fields):
+    defaults = dict(name=f"Name {emp_id}", department="Sales", age=30, salary=1000, years_at_company=3)
+    defaults.update(fields)
+    return Employee.objects.create(emp_id=emp_id, **defaults)
+
+
+class RegistrationTests(TestCase):
+    def test_register_creates_profile_and_logs_in(self):
+        response = self.client.post(reverse("register"), {
+            "username": "newhire", "email": "new@example.com",
+            "password1": "correct-horse-42", "password2": "correct-horse-42",
+        })
+        self.assertRedirects(response, reverse("role_redirect"), fetch_redirect_response=False)
+        user = User.objects.get(username="newhire")
+        self.assertEqual(int(self.client.session["_auth_user_id"]), user.pk)
+        self.assertEqual(self.client.session["_auth_user_backend"], "hr_app.auth.ProfileBackend")
+        self.assertEqual(user.profile.role, "employee")
+
+    def test_login_with_password(self):
+        User.objects.create_user("existing", password="correct-horse-42")
+        response = self.client.post(reverse("login"), {"username": "existing", "password": "correct-horse-42"})
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("_auth_user_id", self.client.session)
+
+
+class EmployeeImportTests(TestCase):
+    HEADER = "EmployeeNumber,EmployeeName,Department,Age,MonthlyIncome,YearsAtCompany\n"
+
+    def import_csv(self, body, chunk_size=2):
+        return importers.import_employees_csv(io.StringIO(self.HEADER + body), chunk_size=chunk_size)
+
+    def test_creates_then_updates_across_chunks(self):
+        make_employee("E1", name="Old", age=50)
+        created, updated = self.import_csv("E1,Ann,R&D,31,5000,2.5\nE2,,Sales,40,4000,8\nE3,Cy,Sales,,3000,1\n")
+        self.assertEqual((created, updated), (2, 1))
+        rows = Employee.objects.order_by("emp_id").values_list("emp_id", "name", "department", "age", "salary")
+        self.assertEqual(list(rows), [
+            ("E1", "Ann", "R&D", 31, 5000.0), ("E2", "Emp E2", "Sales", 40, 4000.0), ("E3", "Cy", "Sales", 0, 3000.0),
+        ])
+
+        created, updated = self.import_csv("E2,Bo,Sales,41,4000,8\nE3,Cy,Sales,,3000,1\nE3,Cy,HR,,3000,1\n")
+        self.assertEqual((created, updated), (0, 3))  # E3 repeats in the second chunk
+        self.assertEqual(Employee.objects.get(emp_id="E2").name, "Bo")
+        self.assertEqual(Employee.objects.get(emp_id="E2").age, 41)
+        self.assertEqual(Employee.objects.get(emp_id="E3").department, "HR")  # the last repeat wins
+        self.assertEqual(Employee.objects.get(emp_id="E1").name, "Ann")
+
+    def test_unchanged_rows_are_not_written(self):
+        self.import_csv("E1,Ann,R&D,31,5000,2.5\n")
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.import_csv("E1,Ann,R&D,31,5000,2.5\n"), (0, 1))
+        self.assertFalse([q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")])
+
+    def test_rejects_a_file_without_employee_numbers(self):
+        with self.assertRaises(ValueError):
+            importers.import_employees_csv(io.StringIO("Name\nAnn\n"))
+
+class KeysetPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employee = make_employee()
+        Feedback.objects.bulk_create([Feedback(employee=employee, text=f"f{i}", sentiment="Neutral") for i in range(23)])
+        # Three runs of identical timestamps, so most rows are only ordered by id
+        for i, pk in enumerate(Feedback.objects.order_by("id").values_list("id", flat=True)):
+            Feedback.objects.filter(pk=pk).update(created_at=datetime(2024, 1, 1 + i % 3, tzinfo=dt_timezone.utc))
+        cls.expected = list(Feedback.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+
+    def paginator(self, per_page=5):
+        return KeysetPaginator(Feedback.objects.all(), ordering=("-created_at", "-id"), per_page=per_page)
+
+    def test_forward_pages_cover_every_row_once(self):
+        seen, page = [], self.paginator().page()
+        self.assertFalse(page.has_previous)
+        while True:
+            seen.extend(f.id for f in page)
+            if not page.has_next:
+                break
+            page = self.paginator().page(after=page.next_cursor)
+        self.assertEqual(seen, self.expected)
+
+    def test_backward_pages_mirror_forward_pages(self):
+        forward = [self.paginator().page()]
+        while forward[-1].has_next:
+            forward.append(self.paginator().page(after=forward[-1].next_cursor))
+
+        backward = [forward[-1]]
+        while backward[-1].has_previous:
+            backward.append(self.paginator().page(before=backward[-1].previous_cursor))
+
+        self.assertEqual(
+            [[f.id for f in page] for page in backward[::-1]],
+            [[f.id for f in page] for page in forward],
+        )
+
+    def test_page_boundary_inside_a_tie(self):
+        # 23 rows in runs of 8/8/7: with 3 per page, boundaries fall inside each run
+        page = self.paginator(per_page=3).page()
+        second = self.paginator(per_page=3).page(after=page.next_cursor)
+        self.assertEqual([f.id for f in second], self.expected[3:6])
+        back = self.paginator(per_page=3).page(before=second.previous_cursor)
+        self.assertEqual([f.id for f in back], self.expected[:3])
+        self.assertFalse(back.has_previous)
+
+    def test_invalid_cursor_starts_from_the_first_page(self):
+        for cursor in ["not-base64!", "WzFd", ""]:
+            page = self.paginator().page(after=cursor)
+            self.assertEqual([f.id for f in page], self.expected[:5])
+
+
+class EmployeeSearchTests(TestCase):
+    def setUp(self):
+        self.ann = make_employee("E1", name="Ann Example", department="R&D", job_title="Data Engineer")
+        self.bob = make_employee("E2", name="Bob Builder", location="Anneville")
+        make_employee("E3", name="Cy Other")
+
+    def names(self, query):
+        return [e.name for e in search.search_employees(query)]
+
+    def test_every_word_matches_a_prefix_in_any_field(self):
+        self.assertCountEqual(self.names("ann"), ["Ann Example", "Bob Builder"])
+        self.assertEqual(self.names("data eng"), ["Ann Example"])
+        self.assertEqual(self.names("ann sales"), ["Bob Builder"])
+        self.assertEqual(self.names("e3"), ["Cy Other"])
+        self.assertEqual(self.names("  !! "), [])
+
+    def test_index_follows_inserts_updates_and_deletes(self):
+        self.bob.name = "Robert Builder"
+        self.bob.save()
+        self.ann.delete()
+        make_employee("E4", name="Dee Newcomer")
+        self.assertEqual(self.names("robert"), ["Robert Builder"])
+        self.assertEqual(self.names("bob"), [])
+        self.assertEqual(self.names("ann"), ["Robert Builder"])  # location only
+        self.assertEqual(self.names("newcomer"), ["Dee Newcomer"])
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite FTS5 triggers")
+    def test_dropped_triggers_are_recreated_after_migrate(self):
+        self.assertEqual(search.ensure_sqlite_triggers(), [])
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER hr_app_employee_fts_au")
+        self.bob.name = "Robert Builder"
+        self.bob.save()  # not indexed while the trigger is missing
+        self.assertEqual(self.names("robert"), [])
+
+        signals.restore_search_triggers(sender=apps.get_app_config("hr_app"), using="default")
+        self.assertEqual(self.names("robert"), ["Robert Builder"])
+        self.assertEqual(search.ensure_sqlite_triggers(), [])
+
+class FeedbackFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employee = make_employee()
+        Feedback.objects.bulk_create(
+            [Feedback(employee=employee, text=f"p{i}", sentiment="Positive") for i in range(7)]
+            + [Feedback(employee=employee, text=f"n{i}", sentiment="Negative") for i in range(3)]
+        )
+        cls.user = User.objects.create_user("viewer")
+
+    def test_pages_through_one_sentiment_newest_first(self):
+        self.client.force_login(self.user)
+        texts, cursor = [], None
+        while True:
+            params = {"sentiment": "Positive", "limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            data = self.client.get(reverse("feedback_feed"), params).json()
+            self.assertLessEqual(len(data["results"]), 3)
+            texts.extend(r["text"] for r in data["results"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        expected = Feedback.objects.filter(sentiment="Positive").order_by("-created_at", "-id")
+        self.assertEqual(texts, [f.text for f in expected])
+
+    def test_hr_dashboard_loads_messages_from_the_feed(self):
+        Profile.objects.filter(user=self.user).update(role="hr")
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("hr_dashboard"))
+        self.assertContains(response, 'id="sentimentModal"')
+        self.assertContains(response, reverse("feedback_feed"))
+        self.assertNotContains(response, "p0")  # no feedback text is embedded
+
+    def test_rejects_unknown_sentiment_and_anonymous_users(self):
+        response = self.client.get(reverse("feedback_feed"), {"sentiment": "Positive"})
+        self.assertEqual(response.status_code, 302)
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("feedback_feed"), {"sentiment": "Pending"})
+        self.assertEqual(response.status_code, 400)
+
+
+class FeedbackScoringTests(TestCase):
+    def test_submitted_feedback_is_scored_by_a_job(self):
+        employee = make_employee()
+        self.client.force_login(User.objects.create_user("viewer"))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("feedback_submit", args=[employee.pk]), {"text": "An excellent, wonderful colleague"})
+        feedback = Feedback.objects.get()
+        self.assertEqual(feedback.sentiment, "Pending")
+        job = Job.objects.get()
+        self.assertEqual((job.kind, job.status, json.loads(bytes(job.payload))), ("score_feedback", "queued", [feedback.pk]))
+
+        self.assertEqual(jobs.run_pending(), 1)
+        feedback.refresh_from_db()
+        self.assertEqual(feedback.sentiment, "Positive")
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, job.total), ("done", 1, 1))
+
+class LeaveDecideTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employee = make_employee()
+
+        def request(status="Pending"):
+            return LeaveRequest.objects.create(
+                employee=employee, start_date=date(2024, 5, 1), end_date=date(2024, 5, 3), reason="x", status=status,
+            )
+
+        cls.pending = [request(), request()]
+        cls.rejected = request("Rejected")
+        cls.hr = User.objects.create_user("hr", is_staff=True)
+
+    def test_outcomes_per_id_in_request_order(self):
+        a, b = self.pending
+        missing = self.rejected.pk + 100
+        results = leave.decide([b.pk, missing, self.rejected.pk, a.pk], "Approved", "ok")
+        self.assertEqual(results, [
+            {"id": b.pk, "outcome": "updated", "status": "Approved"},
+            {"id": missing, "outcome": "not_found", "status": None},
+            {"id": self.rejected.pk, "outcome": "skipped", "status": "Rejected"},
+            {"id": a.pk, "outcome": "updated", "status": "Approved"},
+        ])
+        self.assertEqual(
+            set(LeaveRequest.objects.filter(hr_comment="ok").values_list("id", flat=True)), {a.pk, b.pk}
+        )
+
+    def test_decided_requests_are_not_overwritten(self):
+        a, _ = self.pending
+        leave.decide([a.pk], "Rejected")
+        [result] = leave.decide([a.pk], "Approved")
+        self.assertEqual(result, {"id": a.pk, "outcome": "skipped", "status": "Rejected"})
+        a.refresh_from_db()
+        self.assertEqual(a.status, "Rejected")
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            leave.decide([self.pending[0].pk], "Maybe")
+        with self.assertRaises(ValueError):
+            leave.decide(list(range(leave.MAX_BULK_DECISIONS + 1)), "Approved")
+        self.assertEqual(leave.parse_ids(["3", 1, "3"]), [3, 1])
+        for junk in (["x"], [None], ["1.5"]):
+            with self.assertRaises((TypeError, ValueError)):
+                leave.parse_ids(junk)
+
+    def test_view_rejects_invalid_ids(self):
+        self.client.force_login(self.hr)
+        for body in ({"ids": "12", "action": "Approved"}, {"ids": ["x"], "action": "Approved"},
+                     {"ids": [self.pending[0].pk], "action": "Maybe"}, [1]):
+            response = self.client.post(reverse("leave_decide"), json.dumps(body), content_type="application/json")
+            self.assertEqual(response.status_code, 400, body)
+        self.assertEqual(LeaveRequest.objects.filter(status="Pending").count(), 2)
+
+
+class CompiledForestTests(SimpleTestCase):
+    """
+    The compiled forest must reproduce Pipeline.predict_proba exactly, for both pipeline shapes.
+    """
+
+    @staticmethod
+    def fit(name, n_rows=300, seed=0):
+        spec = training.SPECS[name]
+        rng = np.random.default_rng(seed)
+        X = pd.DataFrame({
+            **{col: rng.integers(0, 50, n_rows).astype(float) for col in spec.numeric},
+            **{col: rng.choice(["a", "b", "c"], n_rows).astype(object) for col in spec.categorical},
+        })[spec.features]
+        y = (X[list(spec.numeric)[0]] + rng.normal(0, 10, n_rows) > 25).astype(int)
+        pipe = spec.build(list(spec.numeric), spec.categorical, None)
+        pipe.set_params(**{f"{pipe.steps[-1][0]}__n_estimators": 25})
+        return pipe.fit(X, y), X
+
+    @staticmethod
+    def probe_frame(X):
+        probe = X.head(40).copy()
+        categorical = probe.select_dtypes(object).columns
+        probe.loc[probe.index[:5], categorical[0]] = "never-seen"
+        probe.loc[probe.index[5:10], categorical[-1]] = np.nan
+        return probe
+
+    def test_predict_proba_matches_sklearn(self):
+        for name in ("retention", "promotion"):
+            with self.subTest(name):
+                pipe, X = self.fit(name)
+                probe = self.probe_frame(X)
+                compiled = compile_pipeline(pipe)
+                np.testing.assert_array_equal(compiled.predict_proba(probe), pipe.predict_proba(probe))
+                np.testing.assert_array_equal(compiled.predict(probe), pipe.predict(probe))
+
+    def test_single_row_matches_sklearn(self):
+        pipe, X = self.fit("promotion")
+        probe = self.probe_frame(X)
+        compiled = compile_pipeline(pipe)
+        expected = pipe.predict_proba(probe)
+        for i, row in enumerate(probe.to_dict("records")):
+            np.testing.assert_array_equal(compiled.predict_proba_row(row), expected[i])
+        # Missing numerics go through the pipeline's imputer
+        row = dict(probe.iloc[0], training_hours=None)
+        np.testing.assert_array_equal(
+            compiled.predict_proba_row(row), pipe.predict_proba(probe.head(1).assign(training_hours=np.nan))[0]
+        )
+
+
+    def test_predict_one_fast_path_matches_predict_and_predict_proba(self):
+        pipe, X = self.fit("retention")
+        probe = self.probe_frame(X).dropna()  # a lone NaN makes a one-row frame's column float for sklearn
+        compiled = compile_pipeline(pipe)
+        labels, probs = pipe.predict(probe), pipe.predict_proba(probe)[:, list(pipe.classes_).index(1)]
+        for backend, model in (("compiled", compiled), ("sklearn", pipe)):
+            with self.subTest(backend), mock.patch("hr_app.ml.compiled.get_inference_model", return_value=model):
+                results = [predict_one("retention", row, backend=backend) for row in probe.to_dict("records")]
+                self.assertEqual([label for label, _ in results], list(labels))
+                np.testing.assert_array_equal([p for _, p in results], probs)
+        with self.assertRaisesMessage(ValueError, "columns are missing"):
+            compiled.encode_row({"Age": 30})
+
+class TrainingTests(SimpleTestCase):
+    def write_retention_csv(self, path, n_rows=80):
+        rng = np.random.default_rng(0)
+        pd.DataFrame({
+            "Age": rng.integers(20, 60, n_rows),
+            "MonthlyIncome": rng.integers(1000, 20000, n_rows),
+            "YearsAtCompany": rng.integers(0, 30, n_rows),
+            "JobRole": rng.choice(["Engineer", "Manager"], n_rows),
+            "Department": rng.choice(["Sales", "R&D"], n_rows),
+            "EducationField": rng.choice(["Science", "Arts"], n_rows),
+            "MaritalStatus": rng.choice(["Single", "Married"], n_rows),
+            "Attrition": ["Yes", "No"] * (n_rows // 2),
+            "Unused": "x",
+        }).to_csv(path, index=False)
+
+    def test_spec_loads_compact_dtypes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "retention.csv")
+            self.write_retention_csv(path)
+            X, y = training.SPECS["retention"].load(path)
+        self.assertEqual(list(X.columns), training.SPECS["retention"].features)
+        self.assertEqual(str(X["Age"].dtype), "int16")
+        self.assertEqual(X["Department"].dtype, object)
+        self.assertEqual((str(y.dtype), sorted(y.unique())), ("int8", [0, 1]))
+
+    def test_train_model_writes_artifact_and_metadata(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "retention.csv")
+            self.write_retention_csv(path)
+            metadata = training.train_model("retention", data_path=path, n_jobs=1, models_dir=tmp)
+            pipe = joblib.load(os.path.join(tmp, "retention.pkl"))
+            X, _ = training.SPECS["retention"].load(path)
+            self.assertEqual(training.read_metadata("retention", tmp), metadata)
+            self.assertEqual(sorted(os.listdir(tmp)), ["retention.csv", "retention.meta.json", "retention.pkl"])
+        self.assertEqual((metadata["model"], metadata["data"]["rows"], metadata["n_jobs"]), ("retention", 80, 1))
+        self.assertIsNone(pipe.named_steps["clf"].n_jobs)
+        self.assertEqual(pipe.predict_proba(X.head(3)).shape, (3, 2))
+
+    def test_atomic_write_keeps_the_old_file_on_failure(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / "model.pkl"
+            target.write_text("old")
+
+            def fail(tmp_path):
+                tmp_path.write_text("half")
+                raise OSError("disk full")
+
+            with self.assertRaises(OSError):
+                training.atomic_write(target, fail)
+            self.assertEqual(target.read_text(), "old")
+            self.assertEqual(os.listdir(tmp), ["model.pkl"])
+
+            training.atomic_write(target, lambda tmp_path: tmp_path.write_text("new"))
+            self.assertEqual(target.read_text(), "new")
+            self.assertEqual(os.listdir(tmp), ["model.pkl"])
+
+class ParallelScorerTests(SimpleTestCase):
+    def test_matches_serial_scoring_in_order(self):
+        retention, X_retention = CompiledForestTests.fit("retention", n_rows=120, seed=1)
+        promotion, X_promotion = CompiledForestTests.fit("promotion", n_rows=120, seed=2)
+        df = pd.concat([X_retention, X_promotion], axis=1).assign(EmployeeNumber=[f"E{i}" for i in range(120)])
+        serial = []
+        for start in range(0, len(df), 25):
+            serial.extend(score_chunk(df.iloc[start:start + 25], retention, promotion))
+
+        with tempfile.TemporaryDirectory() as models_dir:
+            joblib.dump(retention, os.path.join(models_dir, "retention.pkl"))
+            joblib.dump(promotion, os.path.join(models_dir, "promotion.pkl"))
+            with ParallelScorer(2, models_dir=models_dir) as scorer:
+                parallel = scorer.score_frame(df, chunk_size=25)
+        self.assertEqual(parallel, serial)
+        self.assertEqual([r["emp_id"] for r in parallel], list(df["EmployeeNumber"]))
+
+class PredictionCacheTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.registry = ModelRegistry(tmp.name)
+        patcher = mock.patch.object(ml_cache, "registry", self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = ml_cache.PredictionCache(maxsize=4, ttl=60)
+        self.write_model(b"v1")
+
+    def write_model(self, content: bytes):
+        self.registry.path("m").write_bytes(content)
+        self.bump_mtime()
+
+    def bump_mtime(self):
+        # Force a distinct mtime even on coarse-grained filesystems
+        path = self.registry.path("m")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def lookup(self, features, value):
+        return self.cache.get_or_compute("m", features, lambda: value)
+
+    def test_hit_until_the_model_changes(self):
+        self.assertEqual(self.lookup({"Age": 30}, "first"), "first")
+        self.assertEqual(self.lookup({"Age": 30}, "second"), "first")
+        self.write_model(b"v2")
+        self.assertEqual(self.lookup({"Age": 30}, "third"), "third")
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_touching_the_artifact_keeps_entries(self):
+        self.lookup({"Age": 30}, "first")
+        self.write_model(b"v1")
+        self.assertEqual(self.lookup({"Age": 30}, "second"), "first")
+
+    def test_registry_reload_drops_only_that_models_entries(self):
+        self.registry.on_reload(self.cache.invalidate)
+        joblib.dump({"weights": [1]}, self.registry.path("m"))
+        self.registry.get("m")
+        self.lookup({"Age": 30}, "m")
+        self.registry.path("other").write_bytes(b"o")
+        self.cache.get_or_compute("other", {"Age": 30}, lambda: "o")
+        self.assertEqual(self.cache.stats()["size"], 2)
+
+        joblib.dump({"weights": [2]}, self.registry.path("m"))
+        self.bump_mtime()
+        self.registry.get("m")
+        self.assertEqual(self.cache.stats()["size"], 1)
+        self.assertEqual(self.cache.get_or_compute("other", {"Age": 30}, lambda: "x"), "o")
+
+    def test_key_ignores_feature_order(self):
+        self.lookup({"Age": 30, "Department": "Sales"}, "first")
+        self.assertEqual(self.lookup({"Department": "Sales", "Age": 30}, "second"), "first")
+
+    def test_bounded_and_expiring(self):
+        for age in range(6):
+            self.lookup({"Age": age}, age)
+        self.assertEqual(self.cache.stats()["size"], 4)
+        self.assertEqual(self.lookup({"Age": 0}, "evicted"), "evicted")
+        with mock.patch.object(ml_cache.time, "monotonic", return_value=ml_cache.time.monotonic() + 61):
+            self.assertEqual(self.lookup({"Age": 5}, "expired"), "expired")
+
+
+class UnreadCounterTests(TestCase):
+    def setUp(self):
+        self.sender = User.objects.create_user("sender")
+        self.receiver = User.objects.create_user("receiver")
+
+    def send(self, n, sender=None):
+        return messaging.deliver([
+            Message(sender=sender or self.sender, receiver=self.receiver, subject=f"s{i}", body="b") for i in range(n)
+        ])
+
+    def assertCounterMatches(self, expected):
+        actual = Message.objects.filter(receiver=self.receiver, is_read=False).count()
+        self.assertEqual(actual, expected)
+        self.assertEqual(Profile.objects.get(user=self.receiver).unread_messages, expected)
+
+    def test_deliver_and_mark_read(self):
+        sent = self.send(4)
+        self.assertCounterMatches(4)
+        self.assertEqual(messaging.mark_read(self.receiver, [sent[0].pk, sent[1].pk]), 2)
+        self.assertCounterMatches(2)
+        # Already-read and other users' messages change nothing
+        self.assertEqual(messaging.mark_read(self.receiver, [sent[0].pk]), 0)
+        self.assertEqual(messaging.mark_read(self.sender), 0)
+        self.assertEqual(messaging.mark_read(self.receiver), 2)
+        self.assertCounterMatches(0)
+
+    def test_broadcast_counts_every_recipient(self):
+        others = [User.objects.create_user(f"u{i}") for i in range(3)]
+        messaging.broadcast(self.sender, [self.receiver.pk] + [u.pk for u in others], "s", "b")
+        self.assertCounterMatches(1)
+        self.assertEqual(
+            list(Profile.objects.filter(user__in=others).values_list("unread_messages", flat=True)), [1, 1, 1]
+        )
+
+    def test_deleting_the_sender_cascades_to_the_counter(self):
+        other = User.objects.create_user("other")
+        self.send(3)
+        self.send(2, sender=other)
+        self.sender.delete()
+        self.assertCounterMatches(2)
+
+    def test_deleting_the_sender_is_a_bulk_operation(self):
+        def queries_to_delete_sender(n):
+            sender = User.objects.create_user(f"bulk{n}")
+            self.send(n, sender=sender)
+            with CaptureQueriesContext(connection) as ctx:
+                sender.delete()
+            return len(ctx.captured_queries)
+
+        self.assertEqual(queries_to_delete_sender(3), queries_to_delete_sender(30))
+        self.assertCounterMatches(0)
+
+    def test_discount_unread_before_deleting_messages(self):
+        sent = self.send(3)
+        messaging.mark_read(self.receiver, [sent[0].pk])
+        doomed = Message.objects.filter(pk__in=[sent[0].pk, sent[1].pk])
+        messaging.discount_unread(doomed)
+        doomed.delete()
+        self.assertCounterMatches(1)
+
+    def test_recount_repairs_drift(self):
+        self.send(3)
+        Profile.objects.filter(user=self.receiver).update(unread_messages=10)
+        self.assertEqual(messaging.recount_unread([self.receiver.pk]), 1)
+        self.assertCounterMatches(3)
+        self.assertEqual(messaging.recount_unread(), 0)
+
+    def test_mark_read_view_rejects_non_list_ids(self):
+        sent = self.send(2)
+        self.client.force_login(self.receiver)
+        url = reverse("inbox_mark_read")
+        for body in ({"ids": "12"}, {"ids": sent[0].pk}, {"ids": ["x"]}, {}, [sent[0].pk]):
+            response = self.client.post(url, json.dumps(body), content_type="application/json")
+            self.assertEqual(response.status_code, 400, body)
+        self.assertCounterMatches(2)
+
+        response = self.client.post(url, json.dumps({"ids": [sent[0].pk]}), content_type="application/json")
+        self.assertEqual(response.json(), {"marked": 1, "unread": 1})
+        self.assertCounterMatches(1)
+
+
+class CsvExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("exporter")
+        cls.other = User.objects.create_user("other")
+        cls.employee = make_employee("E1", name="Doe, Jane", job_title='"Lead"')
+        make_employee("E2", department="R&D", salary=1234.5)
+
+    def export(self, name):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse(name))
+        self.assertEqual(response["Content-Type"], "text/csv")
+        return list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+
+    def test_employees(self):
+        self.assertEqual(self.export("export_employees_csv"), [
+            ["Emp ID", "Name", "Department", "Age", "Salary", "Years at Company", "Job Title", "Location"],
+            ["E1", "Doe, Jane", "Sales", "30", "1000.0", "3.0", '"Lead"', ""],
+            ["E2", "Name E2", "R&D", "30", "1234.5", "3.0", "", ""],
+        ])
+
+    def test_feedback_and_messages_with_related_names(self):
+        feedback = Feedback.objects.create(employee=self.employee, text="line one\nline two", sentiment="Positive")
+        message = Message.objects.create(sender=self.user, receiver=self.other, subject="Hi", body="Body, with comma")
+        self.assertEqual(self.export("export_feedback_csv"), [
+            ["Employee", "Feedback Text", "Sentiment", "Created At"],
+            ["Doe, Jane", "line one\nline two", "Positive", str(feedback.created_at)],
+        ])
+        self.assertEqual(self.export("export_messages_csv"), [
+            ["Sender", "Receiver", "Subject", "Body", "Is Read", "Created At"],
+            ["exporter", "other", "Hi", "Body, with comma", "False", str(message.created_at)],
+        ])
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.client.force_login(self.user)
+
+        def queries():
+            with CaptureQueriesContext(connection) as ctx:
+                b"".join(self.client.get(reverse("export_feedback_csv")).streaming_content)
+            return len(ctx.captured_queries)
+
+        Feedback.objects.create(employee=self.employee, text="x", sentiment="Neutral")
+        few = queries()
+        Feedback.objects.bulk_create([Feedback(employee=self.employee, text="x", sentiment="Neutral")] * 50)
+        self.assertEqual(queries(), few)
+
+class StreamingResponseTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(3):
+            make_employee(f"E{i}")
+        cls.user = User.objects.create_user("exporter")
+
+    async def test_asgi_exports_stream_from_an_async_body(self):
+        client = AsyncClient()
+        await client.aforce_login(self.user)
+        response = await client.get(reverse("export_employees_csv"))
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertEqual(body.splitlines()[0].split(",")[0], "Emp ID")
+        self.assertEqual(len(body.splitlines()), 4)
+
+    def test_wsgi_exports_keep_the_sync_iterator(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("export_employees_csv"))
+        self.assertTrue(response.streaming)
+        self.assertFalse(response.is_async)
+
+
+class KpiSnapshotTests(TransactionTestCase):
+    # Real commits: invalidation runs in on_commit callbacks
+    def setUp(self):
+        cache.delete(kpis.KPI_CACHE_KEY)
+        self.employee = make_employee("E1", department="Sales")
+        make_employee("E2", department="R&D")
+        Feedback.objects.create(employee=self.employee, text="great", sentiment="Positive")
+        LeaveRequest.objects.create(employee=self.employee, start_date=date(2024, 5, 1), end_date=date(2024, 5, 2), reason="x")
+
+    def test_snapshot_counts(self):
+        snapshot = kpis.get_kpis()
+        self.assertEqual(snapshot["total_employees"], 2)
+        self.assertEqual(dict(zip(snapshot["dept_labels"], snapshot["dept_counts"])), {"Sales": 1, "R&D": 1})
+        self.assertEqual(dict(zip(snapshot["leave_labels"], snapshot["leave_counts"])), {"Pending": 1})
+        self.assertEqual(snapshot["sentiment_counts"], [1, 0, 0])
+        self.assertEqual(snapshot, kpis.compute_kpis())
+
+    def test_served_from_cache_until_a_write_commits(self):
+        kpis.get_kpis()
+        with self.assertNumQueries(1):  # the cache lookup
+            kpis.get_kpis()
+        make_employee("E3")
+        self.assertEqual(kpis.get_kpis()["total_employees"], 3)
+
+    def test_one_invalidation_per_transaction(self):
+        kpis.get_kpis()
+        with mock.patch.object(kpis, "_drop_snapshot", wraps=kpis._drop_snapshot) as drop:
+            with transaction.atomic():
+                for i in range(5):
+                    make_employee(f"N{i}")
+                kpis.invalidate_kpis()
+                self.assertEqual(drop.call_count, 0)
+        self.assertEqual(drop.call_count, 1)
+        self.assertEqual(kpis.get_kpis()["total_employees"], 7)
+
+    def test_deleting_an_employee_fast_deletes_its_rows(self):
+        def queries_to_delete(n):
+            employee = make_employee(f"D{n}")
+            Feedback.objects.bulk_create([Feedback(employee=employee, text="x", sentiment="Neutral")] * n)
+            with CaptureQueriesContext(connection) as ctx:
+                employee.delete()
+            return len(ctx.captured_queries)
+
+        self.assertEqual(queries_to_delete(3), queries_to_delete(30))
+        self.assertEqual(kpis.get_kpis()["total_employees"], 2)
+
+
+class ConstantModel:
+    """Stands in for a pipeline: every row gets the same positive-class probability."""
+    classes_ = [0, 1]
+
+    def __init__(self, p):
+        self.p = p
+
+    def predict_proba(self, X):
+        return np.tile([1 - self.p, self.p], (len(X), 1))
+
+
+@override_settings(SCORING_WORKERS=1)
+class JobQueueTests(TestCase):
+    def enqueue_csv(self, emp_ids):
+        rows = "".join(f"{emp_id},Name {emp_id},30,4000\n" for emp_id in emp_ids)
+        payload = ("EmployeeNumber,EmployeeName,Age,MonthlyIncome\n" + rows).encode("utf-8")
+        return jobs.enqueue("csv_predict", payload, total=len(emp_ids))
+
+    def make_stale(self, job):
+        Job.objects.filter(pk=job.pk).update(updated_at=timezone.now() - jobs.STALE_AFTER * 2)
+
+    def test_each_queued_job_is_claimed_once_oldest_first(self):
+        first, second = self.enqueue_csv(["E1"]), self.enqueue_csv(["E2"])
+        claimed = [jobs.claim_next(), jobs.claim_next(), jobs.claim_next()]
+        self.assertEqual([j and j.pk for j in claimed], [first.pk, second.pk, None])
+        self.assertEqual(set(Job.objects.values_list("status", flat=True)), {"running"})
+
+    def test_only_stale_running_jobs_are_requeued(self):
+        stale, fresh = self.enqueue_csv(["E1"]), self.enqueue_csv(["E2"])
+        jobs.claim_next()
+        jobs.claim_next()
+        Job.objects.filter(pk=stale.pk).update(processed=5)
+        self.make_stale(stale)
+        self.assertEqual(jobs.requeue_stale(), 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual((stale.status, stale.processed, fresh.status), ("queued", 5, "running"))
+
+    def test_resumed_csv_job_does_not_duplicate_predictions(self):
+        emp_ids = [f"E{i}" for i in range(25)]
+        for emp_id in emp_ids:
+            make_employee(emp_id)
+        job = self.enqueue_csv(emp_ids)
+        save_predictions, calls = jobs.save_predictions, []
+
+        def dies_on_third_chunk(rows):
+            calls.append(rows)
+            if len(calls) == 3:
+                raise SystemExit("worker killed")
+            return save_predictions(rows)
+
+        models = {"retention": ConstantModel(0.8), "promotion": ConstantModel(0.2)}
+        with mock.patch.object(jobs, "JOB_CHUNK_SIZE", 10), \
+                mock.patch("hr_app.ml.compiled.get_inference_model", lambda name, **kw: models[name]):
+            with mock.patch.object(jobs, "save_predictions", dies_on_third_chunk), self.assertRaises(SystemExit):
+                jobs.run_job(jobs.claim_next())
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.processed, Prediction.objects.count()), ("running", 20, 40))
+
+            self.make_stale(job)
+            jobs.requeue_stale()
+            self.assertEqual(jobs.run_pending(), 1)
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, job.total), ("done", 25, 25))
+        self.assertEqual(Prediction.objects.count(), 2 * 25)
+        self.assertEqual(LatestPrediction.objects.filter(result="1").count(), 25)  # high retention risk only
+        result = bytes(job.result).decode("utf-8").splitlines()
+        self.assertEqual(len(result), 1 + 25)
+        self.assertTrue(result[-1].startswith("E24,Name E24,High Risk,0.8,Not Eligible,0.2"))
+
+
+@override_settings(API_MAX_BATCH_RECORDS=3, API_SCORE_CHUNK_SIZE=2)
+class ScoreApiTests(TestCase):
+    RECORDS = [{"id": i, "Age": 30 + i, "Department": "Sales"} for i in range(3)]
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user("client"))
+        self.url = reverse("api_score", args=["retention"])
+        patcher = mock.patch("hr_app.ml.compiled.get_inference_model", lambda name, **kw: ConstantModel(0.75))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, body, content_type="application/json", **headers):
+        return self.client.post(self.url, body, content_type=content_type, headers=headers)
+
+    def test_json_and_ndjson_output(self):
+        expected = [{"id": i, "label": "High Risk", "probability": 0.75} for i in range(3)]
+        response = self.post(json.dumps(self.RECORDS))
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(json.loads(b"".join(response.streaming_content)), expected)
+
+        ndjson = "\n".join(json.dumps(r) for r in self.RECORDS) + "\n\n"
+        response = self.post(ndjson, content_type=api.NDJSON, accept=api.NDJSON)
+        self.assertEqual(response["Content-Type"], api.NDJSON)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], expected)
+
+    def test_malformed_records_are_rejected_before_scoring(self):
+        response = self.post(json.dumps([self.RECORDS[0], {"id": 1, "Age": "old"}]))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["detail"], "Record 1, field 'Age': expected a number, got 'old'.")
+        self.assertEqual(self.post(json.dumps([1, 2])).status_code, 400)
+
+        response = self.post('{"id": 0}\n{"id": \n', content_type=api.NDJSON, accept=api.NDJSON)
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(json.loads(response.content)["detail"].startswith("Line 2:"))
+
+    def test_oversized_batches_get_413(self):
+        records = self.RECORDS + [{"id": 3}]
+        self.assertEqual(self.post(json.dumps(records)).status_code, 413)
+        ndjson = "\n".join(json.dumps(r) for r in records)
+        response = self.post(ndjson, content_type=api.NDJSON, accept=api.NDJSON)
+        self.assertEqual(response.status_code, 413)
+
+
+class ServerTimingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        make_employee()
+        cls.user = User.objects.create_user("viewer")
+        Profile.objects.filter(user=cls.user).update(role="hr")
+
+    def metrics(self, response):
+        return {metric.split(";")[0]: metric for metric in response["Server-Timing"].split(", ")}
+
+    @override_settings(SERVER_TIMING=True)
+    def test_header_breaks_down_the_request(self):
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("employee_directory"))
+        metrics = self.metrics(response)
+        self.assertEqual(set(metrics), {"db", "template", "total"})
+        self.assertRegex(metrics["db"], r'^db;dur=\d+\.\d;desc="\d+ queries"$')
+        self.assertIn(f'desc="{len(ctx.captured_queries)} queries"', metrics["db"])
+        self.assertRegex(metrics["total"], r"^total;dur=\d+\.\d$")
+
+    @override_settings(SERVER_TIMING=True)
+    async def test_header_on_async_views(self):
+        client = AsyncClient()
+        await client.aforce_login(self.user)
+        response = await client.get(reverse("hr_dashboard"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue({"template", "total"} <= set(self.metrics(response)))
+
+    @override_settings(SERVER_TIMING=False, SLOW_REQUEST_MS=0)
+    def test_off_by_setting_and_slow_requests_are_logged(self):
+        self.client.force_login(self.user)
+        with self.assertLogs("hr_app.profiling", "WARNING") as logs:
+            response = self.client.get(reverse("employee_directory"))
+        self.assertNotIn("Server-Timing", response)
+        self.assertIn("Slow request: GET /", logs.output[0])
+
+
+class BroadcastTests(TestCase):
+    def setUp(self):
+        self.hr = User.objects.create_user("hr")
+        Profile.objects.filter(user=self.hr).update(role="hr")
+        make_employee("HR", department="Sales", user=self.hr)
+        self.recipients = [User.objects.create_user(f"sales{i}") for i in range(4)]
+        for i, user in enumerate(self.recipients):
+            make_employee(f"S{i}", department="Sales", user=user)
+        make_employee("R1", department="R&D", user=User.objects.create_user("rnd"))
+        self.client.force_login(self.hr)
+
+    def unread(self):
+        return dict(Profile.objects.values_list("user__username", "unread_messages"))
+
+    def post(self):
+        return self.client.post(reverse("broadcast_message"), {"department": "Sales", "subject": "Hi", "body": "All hands"})
+
+    def assertEveryRecipientHasOne(self):
+        expected = {**{u.username: 1 for u in self.recipients}, "hr": 0, "rnd": 0}
+        self.assertEqual(self.unread(), expected)
+        self.assertEqual(Message.objects.filter(is_read=False).count(), len(self.recipients))
+
+    def test_sync_broadcast_counts_every_recipient_but_the_sender(self):
+        self.assertRedirects(self.post(), reverse("inbox"), fetch_redirect_response=False)
+        self.assertEveryRecipientHasOne()
+
+    def test_large_broadcast_runs_as_a_resumable_job(self):
+        with mock.patch("hr_app.views.BROADCAST_SYNC_LIMIT", 2):
+            self.post()
+        self.assertEqual(Message.objects.count(), 0)
+        job = Job.objects.get(kind="broadcast")
+
+        # A worker died after delivering the first two recipients
+        with mock.patch.object(messaging, "DELIVERY_BATCH_SIZE", 2):
+            messaging.broadcast(self.hr, [u.pk for u in self.recipients[:2]], "Hi", "All hands")
+            Job.objects.filter(pk=job.pk).update(processed=2)
+            self.assertEqual(jobs.run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, job.total), ("done", 4, 4))
+        self.assertEveryRecipientHasOne()
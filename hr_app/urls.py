@@ -1,5 +1,9 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, async_views, views
+
+# The ASGI web process serves dashboards and single predictions with their async views
+served = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
     # Auth
@@ -11,8 +15,8 @@ urlpatterns = [
     path("redirect/", views.role_redirect, name="role_redirect"),
 
      # Dashboards
-    path("hr/dashboard/", views.hr_dashboard, name="hr_dashboard"),
-    path("employee/dashboard/", views.employee_dashboard, name="employee_dashboard"),
+    path("hr/dashboard/", served.hr_dashboard, name="hr_dashboard"),
+    path("employee/dashboard/", served.employee_dashboard, name="employee_dashboard"),
 
 
     # Employee
@@ -26,6 +30,7 @@ urlpatterns = [
     # Feedback
     path("feedback/<int:emp_id>/", views.feedback_submit, name="feedback_submit"),
     path("feedback/history/<int:emp_id>/", views.feedback_history, name="feedback_history"),
+    path("feedback/feed/", views.feedback_feed, name="feedback_feed"),
 
     # CSV Upload
     path("csv-upload/", views.csv_upload, name="csv_upload"),
@@ -37,19 +42,31 @@ urlpatterns = [
 
     # Messaging
     path("inbox/", views.inbox, name="inbox"),
+    path("inbox/mark-read/", views.inbox_mark_read, name="inbox_mark_read"),
     path("send-message/", views.send_message, name="send_message"),
+    path("hr/broadcast/", views.broadcast_message, name="broadcast_message"),
 
     # Leave Management
     path("leave/apply/", views.leave_apply, name="leave_apply"),
     path("hr/leave/manage/", views.leave_manage, name="leave_manage"),
+    path("hr/leave/decide/", views.leave_decide, name="leave_decide"),
       
 
 
     # Predictions
-    path("predict/retention/", views.predict_retention_single, name="predict_retention"),
-    path("predict/promotion/", views.predict_promotion, name="predict_promotion"),
+    path("predict/retention/", served.predict_retention_single, name="predict_retention"),
+    path("predict/promotion/", served.predict_promotion, name="predict_promotion"),
+    path("ml/status/", views.model_status, name="model_status"),
 
     # CSV directory import & bulk predict
     path("hr/csv/upload/", views.csv_upload, name="csv_upload"),
     path("hr/csv/predict/", views.csv_predict_upload, name="csv_predict_upload"),
+
+    # REST API
+    path("api/score/<str:model>/", api.ScoreView.as_view(), name="api_score"),
+
+    # Background jobs
+    path("jobs/<int:job_id>/", views.job_detail, name="job_detail"),
+    path("jobs/<int:job_id>/progress/", views.job_progress, name="job_progress"),
+    path("jobs/<int:job_id>/result/", views.job_result, name="job_result"),
 ]
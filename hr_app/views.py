@@ -1,122 +1,109 @@
 import json
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, logout
-from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Count, Avg
-from django.http import HttpResponse
-import pandas as pd
-import joblib, os
-from django.core.paginator import Paginator
-from django.conf import settings
-from django.contrib.auth.models import User
-from textblob import TextBlob
+from django.http import Http404, HttpResponse, JsonResponse
+from django.urls import reverse
 
+from .auth import is_hr_user
 from .forms import (
-    UserRegisterForm, UserLoginForm, EmployeeForm, FeedbackForm,
-    LeaveRequestForm, MessageForm, CSVUploadForm
+    UserRegisterForm, UserLoginForm, EmployeeForm, EmployeeCreateForm, EmployeeUpdateForm,
+    FeedbackForm, LeaveRequestForm, MessageForm, BroadcastForm, CSVUploadForm
 )
-from .models import Employee, Feedback, LeaveRequest, Message, Prediction
-import joblib, pandas as pd
-from pathlib import Path
-from .forms import EmployeeCreateForm, EmployeeUpdateForm
-
+from .models import Employee, Feedback, LeaveRequest, Job
+from .ml.cache import prediction_cache
+from .ml.registry import registry
+from .importers import import_employees_csv
+from .predictions import latest_prediction
+from .kpis import get_kpis
+from .profiling import phase
+from .leave import decide, parse_ids
+from .messaging import (
+    BROADCAST_SYNC_LIMIT, broadcast, deliver, department_recipients, mark_read, unread_count,
+)
+from .pagination import KeysetPaginator, ListPaginator, carried_query, page_size
+from .exports import stream_csv, employee_rows, message_rows, feedback_rows
+from .search import search_employees
+from .feedback import enqueue_scoring
+from .jobs import enqueue
 
-def create_admin():
-    """
-    This function will create a default superuser if it does not exist.
-    """
-    if not User.objects.filter(username="admin").exists():
-        User.objects.create_superuser(
-            username="admin",
-            email="admin@example.com",
-            password="admin123"
-        )
-        print("✅ Superuser created: admin / admin123")
-    else:
-        print("⚠️ Superuser already exists")
 
 @login_required
 def role_redirect(request):
-    if hasattr(request.user, "profile") and request.user.profile.is_hr:
+    if is_hr_user(request.user):
         return redirect("hr_dashboard")
     return redirect("employee_dashboard")
 
-PROMOTION_MODEL_PATH = os.path.join(os.path.dirname(__file__), "ml","models", "promotion.pkl")
-promotion_model = joblib.load(PROMOTION_MODEL_PATH)
-
 def promotion_predict(data: dict):
     """
     Run promotion prediction using trained model.
     """
-    df = pd.DataFrame([data])
-    yhat = promotion_model.predict(df)[0]
-    prob = promotion_model.predict_proba(df)[0][1]
-    return ("Eligible" if yhat == 1 else "Not Eligible", round(prob * 100, 2))
+    def compute():
+        from .ml.compiled import predict_one  # NumPy/pandas load on the first prediction, not at startup
 
+        with phase("inference"):
+            label, prob = predict_one("promotion", data)
+        return ("Eligible" if label == 1 else "Not Eligible", round(prob * 100, 2))
 
-BASE = Path(__file__).resolve().parent
-_promotion = None
-_retention = None
+    return prediction_cache.get_or_compute("promotion", data, compute)
 
-def load_models():
-    global _promotion, _retention
-    if _promotion is None:
-        _promotion = joblib.load(BASE / "ml" / "models" / "promotion.pkl")
-    if _retention is None:
-        _retention = joblib.load(BASE / "ml" / "models" / "retention.pkl")
 
 @login_required
 def csv_predict_upload(request):
-    predictions = []
-
     if request.method == "POST":
         if "csv_file" not in request.FILES:
             messages.error(request, "Please upload a CSV file.")
             return redirect("csv_predict_upload")
 
-        df = pd.read_csv(request.FILES["csv_file"])
-        load_models()
+        # Scoring runs in `manage.py run_worker`; the request only queues the file
+        upload = request.FILES["csv_file"]
+        payload = upload.read()
+        job = enqueue(
+            "csv_predict", payload, user=request.user, filename=upload.name,
+            total=max(payload.count(b"\n") - 1, 0),
+        )
+        return redirect("job_detail", job_id=job.id)
 
-        for _, row in df.iterrows():
-            # Retention
-            r_pred, r_prob = _retention.predict_proba(
-                [[row.get("Age", 0), row.get("MonthlyIncome", 0), row.get("YearsAtCompany", 0)]]
-            )[0]
-            retention = "High Risk" if r_prob >= 0.5 else "Stable"
+    return render(request, "hr_app/upload_csv.html")
 
-            # Promotion
-            p_pred = _promotion.predict([[row.get("Age", 0), row.get("Department", ""), row.get("Education", ""), row.get("YearsAtCompany", 0)]])[0]
-            promotion = "Eligible" if p_pred == 1 else "Not Eligible"
 
-            # Sentiment
-            feedback = row.get("Feedback", "")
-            sentiment = "Neutral"
-            if feedback:
-                pol = TextBlob(feedback).sentiment.polarity
-                sentiment = "Positive" if pol > 0.1 else ("Negative" if pol < -0.1 else "Neutral")
+def _job_for(request, job_id):
+    job = get_object_or_404(Job.objects.defer("payload", "result"), pk=job_id)
+    if job.created_by_id != request.user.id and not is_hr_user(request.user):
+        raise Http404("Job not found")
+    return job
 
-            predictions.append({
-                "employee": row.get("EmployeeName", "Unknown"),
-                "retention": retention,
-                "promotion": promotion,
-                "sentiment": sentiment,
-            })
 
-        return render(request, "hr_app/prediction.html", {"predictions": predictions})
+@login_required
+def job_detail(request, job_id):
+    return render(request, "hr_app/job_detail.html", {"job": _job_for(request, job_id)})
+
 
-    return render(request, "hr_app/csv_upload.html")
+@login_required
+def job_progress(request, job_id):
+    job = _job_for(request, job_id)
+    return JsonResponse({
+        "id": job.id,
+        "status": job.status,
+        "processed": job.processed,
+        "total": job.total,
+        "percent": job.percent,
+        "error": job.error,
+    })
 
 
-# load promotion model once
-PROMOTION_MODEL = None
-def load_promotion_model():
-    global PROMOTION_MODEL
-    if PROMOTION_MODEL is None:
-        model_path = Path(__file__).resolve().parent / "ml" / "models" / "promotion.pkl"
-        PROMOTION_MODEL = joblib.load(model_path)
-    return PROMOTION_MODEL
+@login_required
+def job_result(request, job_id):
+    job = _job_for(request, job_id)
+    if job.kind != "csv_predict":
+        raise Http404("This job has no downloadable results")
+    if job.status != "done":
+        raise Http404("Results are not ready yet")
+    result = Job.objects.filter(pk=job.pk).values_list("result", flat=True).get()
+    response = HttpResponse(bytes(result), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="predictions_{job.id}.csv"'
+    return response
 
 
 @login_required
@@ -162,7 +149,8 @@ def register_view(request):
         form = UserRegisterForm(request.POST)
         if form.is_valid():
             user = form.save()
-            login(request, user)
+            # Not from authenticate(), so name the backend (several are configured)
+            login(request, user, backend="hr_app.auth.ProfileBackend")
             messages.success(request, "Registration successful! Welcome.")
             return redirect("role_redirect")
     else:
@@ -191,7 +179,7 @@ def logout_view(request):
 
 def hr_required(view_func):
     def wrapper(request, *args, **kwargs):
-        if not hasattr(request.user, "profile") or not request.user.profile.is_hr:
+        if not is_hr_user(request.user):
             messages.error(request, "❌ Access denied: HR only.")
             return redirect("role_redirect")
         return view_func(request, *args, **kwargs)
@@ -203,82 +191,13 @@ def hr_required(view_func):
 
 @login_required
 def dashboard(request):
-    total_employees = Employee.objects.count()
-    retention_risks = Prediction.objects.filter(kind="retention", result="1").count()
-    promotions = Prediction.objects.filter(kind="promotion", result="1").count()
-
-    # Department distribution
-    dept_distribution = Employee.objects.values("department").annotate(count=Count("id"))
-    dept_labels = [d["department"] for d in dept_distribution]
-    dept_counts = [d["count"] for d in dept_distribution]
-
-    # Leave stats
-    leave_stats = LeaveRequest.objects.values("status").annotate(count=Count("id"))
-    leave_labels = [l["status"] for l in leave_stats]
-    leave_counts = [l["count"] for l in leave_stats]
-
-    # Sentiment stats
-    feedbacks = Feedback.objects.all()
-    sentiment_labels = ["Positive", "Neutral", "Negative"]
-    sentiment_counts = [
-        feedbacks.filter(sentiment="Positive").count(),
-        feedbacks.filter(sentiment="Neutral").count(),
-        feedbacks.filter(sentiment="Negative").count(),
-    ]
-    # Group feedback messages by sentiment
-    sentiment_messages = {
-        "Positive": list(feedbacks.filter(sentiment="Positive").values_list("text", flat=True)),
-        "Neutral": list(feedbacks.filter(sentiment="Neutral").values_list("text", flat=True)),
-        "Negative": list(feedbacks.filter(sentiment="Negative").values_list("text", flat=True)),
-    }
-
-    return render(request, "hr_app/dashboard.html", {
-        "total_employees": total_employees,
-        "retention_risks": retention_risks,
-        "promotions": promotions,
-        "dept_labels": dept_labels,
-        "dept_counts": dept_counts,
-        "leave_labels": leave_labels,
-        "leave_counts": leave_counts,
-        "sentiment_labels": sentiment_labels,
-        "sentiment_counts": sentiment_counts,
-        "sentiment_messages": sentiment_messages,
-    })
+    # Feedback messages are fetched lazily from feedback_feed when a slice is clicked
+    return render(request, "hr_app/dashboard.html", get_kpis())
 
 @login_required
 @hr_required
 def hr_dashboard(request):
-    total_employees = Employee.objects.count()
-    retention_risks = Prediction.objects.filter(kind="retention", result="1").count()
-    promotions = Prediction.objects.filter(kind="promotion", result="1").count()
-
-    dept_distribution = Employee.objects.values("department").annotate(count=Count("id"))
-    dept_labels = [d["department"] for d in dept_distribution]
-    dept_counts = [d["count"] for d in dept_distribution]
-
-    leave_stats = LeaveRequest.objects.values("status").annotate(count=Count("id"))
-    leave_labels = [l["status"] for l in leave_stats]
-    leave_counts = [l["count"] for l in leave_stats]
-
-    feedbacks = Feedback.objects.all()
-    sentiment_labels = ["Positive", "Neutral", "Negative"]
-    sentiment_counts = [
-        feedbacks.filter(sentiment="Positive").count(),
-        feedbacks.filter(sentiment="Neutral").count(),
-        feedbacks.filter(sentiment="Negative").count(),
-    ]
-
-    return render(request, "hr_app/hr_dashboard.html", {
-        "total_employees": total_employees,
-        "retention_risks": retention_risks,
-        "promotions": promotions,
-        "dept_labels": dept_labels,
-        "dept_counts": dept_counts,
-        "leave_labels": leave_labels,
-        "leave_counts": leave_counts,
-        "sentiment_labels": sentiment_labels,
-        "sentiment_counts": sentiment_counts,
-    })
+    return render(request, "hr_app/hr_dashboard.html", get_kpis())
 
 
 
@@ -288,16 +207,12 @@ def hr_dashboard(request):
 # ——————————————————————————
 @login_required
 def export_employees_csv(request):
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = 'attachment; filename="employees.csv"'
-
-    writer = csv.writer(response)
-    writer.writerow(["Emp ID", "Name", "Department", "Age", "Salary", "Years at Company", "Job Title", "Location"])
-
-    for e in Employee.objects.all():
-        writer.writerow([e.emp_id, e.name, e.department, e.age, e.salary, e.years_at_company, e.job_title, e.location])
-
-    return response
+    return stream_csv(
+        request,
+        "employees.csv",
+        ["Emp ID", "Name", "Department", "Age", "Salary", "Years at Company", "Job Title", "Location"],
+        employee_rows(),
+    )
 
 @login_required
 def employee_dashboard(request):
@@ -306,8 +221,8 @@ def employee_dashboard(request):
     my_feedbacks = Feedback.objects.filter(employee=employee) if employee else []
 
     # If you want to show last predictions (optional)
-    my_retention = Prediction.objects.filter(employee=employee, kind="retention").first() if employee else None
-    my_promotion = Prediction.objects.filter(employee=employee, kind="promotion").first() if employee else None
+    my_retention = latest_prediction(employee, "retention")
+    my_promotion = latest_prediction(employee, "promotion")
 
     return render(request, "hr_app/employee_dashboard.html", {
         "employee": employee,
@@ -324,16 +239,19 @@ def employee_dashboard(request):
 def employee_directory(request):
     query = request.GET.get("q")
     if query:
-        employees = Employee.objects.filter(name__icontains=query)
+        # Ranked hits are already bounded by search.SEARCH_LIMIT
+        paginator = ListPaginator(search_employees(query), per_page=10)
     else:
-        employees = Employee.objects.all()
-    
-    # ✅ Pagination
-    paginator = Paginator(employees, 10)  # 10 employees per page
-    page_number = request.GET.get("page")
-    employees_page = paginator.get_page(page_number)
-    
-    return render(request, "hr_app/employee_directory.html", {"employees": employees_page})
+        sort = "emp_id" if request.GET.get("sort") == "emp_id" else "name"
+        paginator = KeysetPaginator(Employee.objects.all(), ordering=(sort, "id"), per_page=10)
+
+    # ✅ Keyset pagination: every page is an indexed range scan
+    employees_page = paginator.page(after=request.GET.get("after"), before=request.GET.get("before"))
+
+    return render(request, "hr_app/employee_directory.html", {
+        "employees": employees_page,
+        "carried_query": carried_query(request),
+    })
 
 
 @login_required
@@ -424,8 +342,6 @@ def employee_delete(request, emp_id):
 # ——————————————————————————————————————
 # Feedback + Sentiment
 # ——————————————————————————————————————
-from textblob import TextBlob
-
 @login_required
 def feedback_submit(request, emp_id):
     employee = get_object_or_404(Employee, pk=emp_id)
@@ -434,15 +350,10 @@ def feedback_submit(request, emp_id):
         if form.is_valid():
             feedback = form.save(commit=False)
             feedback.employee = employee
-            # Sentiment analysis
-            sentiment_score = TextBlob(feedback.text).sentiment.polarity
-            if sentiment_score > 0.1:
-                feedback.sentiment = "Positive"
-            elif sentiment_score < -0.1:
-                feedback.sentiment = "Negative"
-            else:
-                feedback.sentiment = "Neutral"
+            # Sentiment analysis runs in a background job (see feedback.py)
+            feedback.sentiment = "Pending"
             feedback.save()
+            enqueue_scoring([feedback.pk])
             messages.success(request, "Feedback submitted!")
             return redirect("employee_directory")
     else:
@@ -453,8 +364,33 @@ def feedback_submit(request, emp_id):
 @login_required
 def feedback_history(request, emp_id):
     employee = get_object_or_404(Employee, pk=emp_id)
-    feedbacks = employee.feedbacks.all()
-    return render(request, "hr_app/feedback_history.html", {"employee": employee, "feedbacks": feedbacks})
+    feedbacks = KeysetPaginator(employee.feedbacks.all()).page(
+        after=request.GET.get("after"), before=request.GET.get("before")
+    )
+    return render(request, "hr_app/feedback_history.html", {
+        "employee": employee,
+        "feedbacks": feedbacks,
+        "carried_query": carried_query(request),
+    })
+
+
+@login_required
+def feedback_feed(request):
+    """
+    JSON feed of feedback texts for one sentiment, newest first, with cursor pagination.
+    """
+    sentiment = request.GET.get("sentiment")
+    if sentiment not in ("Positive", "Neutral", "Negative"):
+        return JsonResponse({"error": "Unknown sentiment."}, status=400)
+
+    page = KeysetPaginator(
+        Feedback.objects.filter(sentiment=sentiment).only("id", "text", "created_at"),
+        per_page=page_size(request.GET.get("limit")),
+    ).page(after=request.GET.get("cursor"))
+    return JsonResponse({
+        "results": [{"id": f.id, "text": f.text, "created_at": f.created_at.isoformat()} for f in page],
+        "next_cursor": page.next_cursor,
+    })
 
 
 # ——————————————————————————————————————
@@ -471,21 +407,13 @@ def csv_upload(request):
                 messages.error(request, "Please upload a valid CSV file.")
                 return redirect("csv_upload")
 
-            df = pd.read_csv(csv_file)
-
-            for _, row in df.iterrows():
-                Employee.objects.update_or_create(
-                    emp_id=row.get("EmployeeNumber"),
-                    defaults={
-                        "name": row.get("EmployeeName", f"Emp {row.get('EmployeeNumber')}"),
-                        "department": row.get("Department", "Unknown"),
-                        "age": row.get("Age", 0),
-                        "salary": row.get("MonthlyIncome", 0),
-                        "years_at_company": row.get("YearsAtCompany", 0),
-                    },
-                )
-
-            messages.success(request, "CSV uploaded successfully!")
+            try:
+                created, updated = import_employees_csv(csv_file)
+            except ValueError as e:
+                messages.error(request, str(e))
+                return redirect("csv_upload")
+
+            messages.success(request, f"CSV uploaded successfully! {created} added, {updated} updated.")
             return redirect("employee_directory")
     else:
         form = CSVUploadForm()
@@ -498,8 +426,49 @@ def csv_upload(request):
 # ——————————————————————————————————————
 @login_required
 def inbox(request):
-    msgs = request.user.received_messages.all()
-    return render(request, "hr_app/inbox.html", {"messages": msgs})
+    unread_only = request.GET.get("unread") == "1"
+    received = request.user.received_messages.select_related("sender")
+    if unread_only:
+        received = received.filter(is_read=False)
+    msgs = KeysetPaginator(received).page(after=request.GET.get("after"), before=request.GET.get("before"))
+    return render(request, "hr_app/inbox.html", {
+        "messages": msgs, "unread_only": unread_only, "carried_query": carried_query(request),
+    })
+
+
+@login_required
+def inbox_mark_read(request):
+    """
+    Mark the posted message ``ids`` (or everything, with ``all``) as read in one UPDATE.
+    JSON bodies get a JSON response; form posts redirect back to the inbox.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required."}, status=405)
+
+    is_json = request.content_type == "application/json"
+    try:
+        if is_json:
+            body = json.loads(request.body or b"{}")
+            if not isinstance(body, dict):
+                raise ValueError("Expected a JSON object.")
+            if body.get("all"):
+                ids = None
+            elif isinstance(body.get("ids"), list):
+                ids = parse_ids(body["ids"])
+            else:
+                raise ValueError("Expected an \"ids\" list.")
+        else:
+            ids = None if request.POST.get("all") else parse_ids(request.POST.getlist("ids"))
+    except (TypeError, ValueError):
+        if is_json:
+            return JsonResponse({"error": "Invalid message ids."}, status=400)
+        messages.error(request, "Invalid message ids.")
+        return redirect("inbox")
+
+    marked = mark_read(request.user, ids)
+    if is_json:
+        return JsonResponse({"marked": marked, "unread": unread_count(request.user)})
+    return redirect(f"{reverse('inbox')}?{request.POST.get('return_query', '')}")
 
 
 @login_required
@@ -509,28 +478,51 @@ def send_message(request):
         if form.is_valid():
             msg = form.save(commit=False)
             msg.sender = request.user
-            msg.save()
+            deliver([msg])
             messages.success(request, "Message sent")
             return redirect("inbox")
     else:
         form = MessageForm()
     return render(request, "hr_app/message_form.html", {"form": form})
 
+
+@login_required
+@hr_required
+def broadcast_message(request):
+    if request.method == "POST":
+        form = BroadcastForm(request.POST)
+        if form.is_valid():
+            department = form.cleaned_data["department"]
+            subject, body = form.cleaned_data["subject"], form.cleaned_data["body"]
+            recipients = department_recipients(department, exclude_user=request.user)
+            if not recipients:
+                messages.warning(request, f"No one in {department} has an account to message.")
+                return redirect("broadcast_message")
+            if len(recipients) > BROADCAST_SYNC_LIMIT:
+                payload = json.dumps({
+                    "sender_id": request.user.id, "recipients": recipients, "subject": subject, "body": body,
+                }).encode()
+                job = enqueue("broadcast", payload, user=request.user, filename=department, total=len(recipients))
+                messages.info(request, f"Sending to {len(recipients)} people in {department} in the background.")
+                return redirect("job_detail", job_id=job.id)
+            sent = broadcast(request.user, recipients, subject, body)
+            messages.success(request, f"Message sent to {sent} people in {department}")
+            return redirect("inbox")
+    else:
+        form = BroadcastForm()
+    return render(request, "hr_app/broadcast_form.html", {"form": form})
+
 # ——————————————————————————
 # Messages
 # ——————————————————————————
 @login_required
 def export_messages_csv(request):
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = 'attachment; filename="messages.csv"'
-
-    writer = csv.writer(response)
-    writer.writerow(["Sender", "Receiver", "Subject", "Body", "Is Read", "Created At"])
-
-    for m in Message.objects.all():
-        writer.writerow([m.sender.username, m.receiver.username, m.subject, m.body, m.is_read, m.created_at])
-
-    return response
+    return stream_csv(
+        request,
+        "messages.csv",
+        ["Sender", "Receiver", "Subject", "Body", "Is Read", "Created At"],
+        message_rows(),
+    )
 
 
 # ——————————————————————————————————————
@@ -558,58 +550,92 @@ def leave_apply(request):
 
 @login_required
 def leave_manage(request):
-    if not request.user.profile.is_hr:
+    if not is_hr_user(request.user):
         messages.error(request, "Only HR can manage leave requests")
-        return redirect("role_reedirect")
+        return redirect("role_redirect")
 
     if request.method == "POST":
-        leave_id = request.POST.get("leave_id")
         action = request.POST.get("action")
-        hr_comment = request.POST.get("hr_comment", "")
-
         try:
-            leave = LeaveRequest.objects.get(id=leave_id)
-            if leave.status == "Pending":  # only update pending ones
-                leave.status = action
-                leave.hr_comment = hr_comment
-                leave.save()
-                messages.success(request, f"Leave request {action.lower()} successfully.")
-            else:
-                messages.warning(request, "This request has already been processed.")
-        except LeaveRequest.DoesNotExist:
+            [result] = decide(parse_ids([request.POST.get("leave_id")]), action, request.POST.get("hr_comment", ""))
+        except (TypeError, ValueError):
+            messages.error(request, "Invalid leave decision.")
+            return redirect("leave_manage")
+
+        if result["outcome"] == "updated":
+            messages.success(request, f"Leave request {action.lower()} successfully.")
+        elif result["outcome"] == "skipped":
+            messages.warning(request, "This request has already been processed.")
+        else:
             messages.error(request, "Leave request not found.")
-
         return redirect("leave_manage")  # reload page after action
 
-    requests = LeaveRequest.objects.all()
-    return render(request, "hr_app/leave_manage.html", {"requests": requests})
+    status = request.GET.get("status")
+    leaves = LeaveRequest.objects.select_related("employee")
+    if status in dict(LeaveRequest.STATUS):
+        leaves = leaves.filter(status=status)
+    requests = KeysetPaginator(leaves).page(after=request.GET.get("after"), before=request.GET.get("before"))
+    return render(request, "hr_app/leave_manage.html", {
+        "requests": requests,
+        "status": status,
+        "statuses": [s for s, _ in LeaveRequest.STATUS],
+        "carried_query": carried_query(request),
+    })
+
+
+@login_required
+@hr_required
+def leave_decide(request):
+    """
+    Approve or reject many leave requests at once.
+
+    JSON bodies (``{"ids": [...], "action": "Approved", "hr_comment": ""}``) get a JSON
+    response with per-ID outcomes; form posts from the manage page redirect back to it.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required."}, status=405)
+
+    is_json = request.content_type == "application/json"
+    try:
+        if is_json:
+            body = json.loads(request.body or b"{}")
+            if not isinstance(body, dict) or not isinstance(body.get("ids"), list):
+                raise ValueError("Expected a JSON object with an \"ids\" list.")
+            ids, action, comment = body["ids"], body.get("action"), body.get("hr_comment") or ""
+        else:
+            ids, action, comment = request.POST.getlist("ids"), request.POST.get("action"), request.POST.get("hr_comment", "")
+        results = decide(parse_ids(ids), action, str(comment))
+    except (TypeError, ValueError) as e:
+        if is_json:
+            return JsonResponse({"error": str(e)}, status=400)
+        messages.error(request, str(e))
+        return redirect("leave_manage")
+
+    updated = sum(r["outcome"] == "updated" for r in results)
+    if is_json:
+        return JsonResponse({"updated": updated, "results": results})
+
+    skipped = len(results) - updated
+    messages.success(request, f"{updated} leave request(s) {action.lower()}.")
+    if skipped:
+        messages.warning(request, f"{skipped} request(s) were already processed or no longer exist.")
+    return redirect(f"{reverse('leave_manage')}?{request.POST.get('return_query', '')}")
 
 # ——————————————————————————
 # Feedback
 # ——————————————————————————
 @login_required
 def export_feedback_csv(request):
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = 'attachment; filename="feedback.csv"'
-
-    writer = csv.writer(response)
-    writer.writerow(["Employee", "Feedback Text", "Sentiment", "Created At"])
+    return stream_csv(
+        request,
+        "feedback.csv",
+        ["Employee", "Feedback Text", "Sentiment", "Created At"],
+        feedback_rows(),
+    )
 
-    for f in Feedback.objects.all():
-        writer.writerow([f.employee.name, f.text, f.sentiment, f.created_at])
-
-    return response
-
-
-BASE = Path(__file__).resolve().parent
-_retention = None   # cache the model in memory
 
 def retention_predict(feature_map: dict):
-    global _retention
-    if _retention is None:
-        _retention = joblib.load(BASE / "ml" / "models" / "retention.pkl")
-
-    df = pd.DataFrame([{
+    row = {
         "Age": feature_map.get("Age", 0),
         "MonthlyIncome": feature_map.get("MonthlyIncome", 0),
         "YearsAtCompany": feature_map.get("YearsAtCompany", 0),
@@ -617,10 +643,16 @@ def retention_predict(feature_map: dict):
         "Department": feature_map.get("Department", ""),
         "EducationField": feature_map.get("EducationField", ""),
         "MaritalStatus": feature_map.get("MaritalStatus", ""),
-    }])
+    }
+
+    def compute():
+        from .ml.compiled import predict_one
+
+        with phase("inference"):
+            _, proba = predict_one("retention", row)
+        return int(proba >= 0.5), proba
 
-    proba = _retention.predict_proba(df)[0][1]
-    return int(proba >= 0.5), float(proba)
+    return prediction_cache.get_or_compute("retention", row, compute)
 
 
 
@@ -644,3 +676,18 @@ def predict_retention_single(request):
         "prob": prob
     })
 
+
+@login_required
+@hr_required
+def model_status(request):
+    """
+    Load time, version and memory footprint of the models loaded in this worker,
+    the training metadata of each artifact, and the prediction cache hit/miss counters.
+    """
+    from .ml.training import SPECS as TRAINING_SPECS, read_metadata
+
+    return JsonResponse({
+        "models": registry.stats(),
+        "training": {name: read_metadata(name) for name in TRAINING_SPECS},
+        "prediction_cache": prediction_cache.stats(),
+    })
@@ -44,8 +44,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'hr_app.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'hr_app.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -60,7 +61,7 @@ ROOT_URLCONF = 'hr_project.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'hr_app.profiling.ProfiledDjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -85,6 +86,16 @@ DATABASES = {
     )
 }
 
+# Shared by the web workers and the job worker, so a write handled by one
+# process invalidates cached snapshots (dashboard KPIs) for all of them.
+# The table is created by `manage.py createcachetable` (build.sh).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'hr_app_cache',
+    }
+}
+
 
 
 # Password validation
@@ -128,6 +139,33 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_DIRS = [BASE_DIR / "static"]
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
+# Processes used by background jobs to score large prediction files (1 = in-process)
+SCORING_WORKERS = int(os.environ.get("SCORING_WORKERS", "1"))
+
+# "auto" (compiled forest for small batches, sklearn for large), "compiled" or "sklearn"
+ML_INFERENCE_BACKEND = os.environ.get("ML_INFERENCE_BACKEND", "auto")
+
+# Serve the dashboards and single predictions with their async views (hr_app.async_views);
+# set for the ASGI web process. CPU_WORKERS bounds the threads those views run inference on.
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS", "False") == "True"
+CPU_WORKERS = int(os.environ.get("CPU_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Bulk scoring API (hr_app.api): records accepted per request, and records per predict_proba call
+API_MAX_BATCH_RECORDS = int(os.environ.get("API_MAX_BATCH_RECORDS", "10000"))
+API_SCORE_CHUNK_SIZE = int(os.environ.get("API_SCORE_CHUNK_SIZE", "1000"))
+
+# Per-request phase timings (hr_app.profiling): Server-Timing header and slow-request log budget.
+# The header exposes query counts and timings to any client, so production has to opt in.
+SERVER_TIMING = os.environ.get("SERVER_TIMING", str(DEBUG)) == "True"
+SLOW_REQUEST_MS = int(os.environ.get("SLOW_REQUEST_MS", "500"))
+
+# Loads User + Profile in one query. ModelBackend stays listed so sessions created
+# before ProfileBackend existed remain valid.
+AUTHENTICATION_BACKENDS = [
+    "hr_app.auth.ProfileBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+
 LOGIN_URL = "login"
 LOGIN_REDIRECT_URL = "role_redirect"
 